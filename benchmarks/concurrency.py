@@ -0,0 +1,82 @@
+"""
+in-flight 요청 수에 따른 그래프 처리량 벤치마크.
+
+    python -m benchmarks.concurrency --levels 1 2 4 8 16 32 --requests 64
+
+가짜 LLM(FakeChatModel)과 가짜 벡터스토어(FakeVectorStore)로 graph.ainvoke를 동시에 실행한다.
+노드가 이벤트 루프를 막지 않으면 처리량은 동시 요청 수에 비례해 늘어나야 한다.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from langgraph.checkpoint.memory import InMemorySaver
+from loguru import logger
+
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings, FakeVectorStore
+
+
+def _build_graph(args):
+    from src.agent.components import components
+    from src.agent.graph import build_graph
+
+    embeddings = FakeEmbeddings(encode_time=args.encode_time)
+    components.override(
+        model=FakeChatModel(latency=args.llm_latency, tokens_per_second=args.token_rate),
+        encoder=embeddings,
+        store=FakeVectorStore(embeddings),
+    )
+    return build_graph(InMemorySaver())
+
+
+async def _run_level(graph, concurrency: int, total: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            # 답변/임베딩 캐시에 걸리지 않도록 요청마다 다른 질문 사용
+            config = {"configurable": {"thread_id": str(uuid.uuid4()), "bypass_cache": True}}
+            question = f"수강신청 기간 알려줘 ({concurrency}-{i})"
+            start = time.perf_counter()
+            await graph.ainvoke({"messages": [{"role": "user", "content": question}]}, config=config)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "elapsed": elapsed,
+        "throughput": total / elapsed,
+        "mean_latency": statistics.mean(latencies),
+    }
+
+
+async def main(args):
+    logger.disable("src")  # 노드 로그가 결과 표를 덮지 않도록
+    graph = _build_graph(args)
+
+    print(f"{'in-flight':>9} | {'req/s':>8} | {'mean latency(s)':>15} | {'speedup':>7}")
+    baseline = None
+    for level in args.levels:
+        result = await _run_level(graph, level, max(args.requests, level))
+        baseline = baseline or result["throughput"]
+        print(
+            f"{result['concurrency']:>9} | {result['throughput']:>8.2f} | "
+            f"{result['mean_latency']:>15.3f} | {result['throughput'] / baseline:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="그래프 동시 처리량 벤치마크")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--requests", type=int, default=32, help="단계별 총 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="LLM 첫 토큰까지 지연(초)")
+    parser.add_argument("--token-rate", type=float, default=100.0, help="LLM 초당 토큰 수")
+    parser.add_argument("--encode-time", type=float, default=0.02, help="쿼리 임베딩 1회 blocking 시간(초)")
+    asyncio.run(main(parser.parse_args()))
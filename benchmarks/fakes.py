@@ -0,0 +1,180 @@
+"""
+OpenAI / bge-m3 없이 그래프를 돌리기 위한 가짜 컴포넌트.
+지연 시간과 토큰 생성 속도를 설정할 수 있어 벤치마크에서 실제 서비스와 비슷한 부하를 흉내낸다.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+import numpy as np
+
+
+class FakeChatModel(BaseChatModel):
+    """첫 토큰까지 latency초, 이후 tokens_per_second 속도로 response를 생성하는 가짜 LLM"""
+
+    response: str = "공주대학교 안내 답변입니다. 자세한 내용은 학과 공지사항을 확인하세요."
+    latency: float = 0.3
+    tokens_per_second: float = 50.0
+    structured_response: dict = {
+        "is_follow_up": False,
+        "search_query": "",
+        "question_appropriate": True,
+        "reason": "검색 가능한 질문입니다.",
+        "department": "공주대학교",
+    }
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _tokens(self) -> List[str]:
+        words = self.response.split(" ")
+        return [w if i == len(words) - 1 else w + " " for i, w in enumerate(words)]
+
+    def _generation_time(self) -> float:
+        return self.latency + len(self._tokens()) / self.tokens_per_second
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._generation_time())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._generation_time())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for token in self._tokens():
+            time.sleep(1 / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for token in self._tokens():
+            await asyncio.sleep(1 / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    def with_structured_output(self, schema, **kwargs):
+        async def _respond(_):
+            await asyncio.sleep(self.latency)
+            return schema(**self.structured_response)
+
+        return RunnableLambda(lambda _: schema(**self.structured_response), afunc=_respond)
+
+
+class FakeEmbeddings(Embeddings):
+    """문자 bigram 해시 기반의 결정적 임베딩. encode_time초 동안 blocking (bge-m3 encode 흉내)"""
+
+    def __init__(self, dim: int = 256, encode_time: float = 0.02):
+        self.dim = dim
+        self.encode_time = encode_time
+
+    def _vector(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        compact = "".join(text.split())
+        for i in range(max(len(compact) - 1, 1)):
+            digest = hashlib.md5(compact[i:i + 2].encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.encode_time)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _matches(metadata: dict, filter: Optional[dict]) -> bool:
+    """Chroma metadata 필터 중 이 프로젝트에서 쓰는 {"key": {"$in": [...]}} / {"key": value} 형태만 지원"""
+    for key, condition in (filter or {}).items():
+        if isinstance(condition, dict) and "$in" in condition:
+            if metadata.get(key) not in condition["$in"]:
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class _FakeCollection:
+    def __init__(self, store: "FakeVectorStore"):
+        self._store = store
+
+    def count(self) -> int:
+        return len(self._store.documents)
+
+    def get(self, include=None, limit=None, offset=0, **kwargs) -> dict:
+        end = None if limit is None else offset + limit
+        documents = self._store.documents[offset:end]
+        return {
+            "ids": [str(i) for i in range(offset, offset + len(documents))],
+            "documents": [d.page_content for d in documents],
+            "metadatas": [d.metadata for d in documents],
+            "embeddings": np.asarray(self._store.vectors[offset:end]),
+        }
+
+
+class FakeVectorStore:
+    """메모리 위의 brute-force 벡터 검색. Chroma 대신 그래프/서버 벤치마크에 사용"""
+
+    def __init__(self, embeddings: Optional[FakeEmbeddings] = None, documents: Optional[List[Document]] = None):
+        self.embeddings = embeddings or FakeEmbeddings()
+        self.documents = documents or [
+            Document(
+                page_content=f"{department} 안내 문서 {i}",
+                metadata={"file_name": f"doc-{department}-{i}", "department": department, "url": None, "date": None},
+            )
+            for department in ("공주대학교", "컴퓨터공학과", "소프트웨어학과")
+            for i in range(3)
+        ]
+        self.vectors = [self.embeddings._vector(d.page_content) for d in self.documents]
+        self._collection = _FakeCollection(self)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, filter: Optional[dict] = None, **kwargs) -> List[Document]:
+        query = np.asarray(embedding, dtype=np.float32)
+        scored = [
+            (float(np.dot(query, vector)), document)
+            for vector, document in zip(self.vectors, self.documents)
+            if _matches(document.metadata, filter)
+        ]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [document for _, document in scored[:k]]
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs) -> List[Document]:
+        return self.similarity_search_by_vector(self.embeddings.embed_query(query), k=k, filter=filter)
@@ -0,0 +1,129 @@
+"""
+LLM 없이 판단하는 규칙(src.agent.heuristics)의 속도와 LLM 판단과의 일치도.
+
+    python -m benchmarks.heuristics speed [--repeat 2000]
+    python -m benchmarks.heuristics agreement
+
+speed는 질문 언어 감지를 예전 방식(매번 encoding_for_model + 토큰별 decode)과
+새 방식(한글/라틴 문자 수 numpy 계산, 섞인 경우만 캐시된 encoding 사용)으로 비교한다.
+agreement는 evaluation/data/scenario_*.jsonl을 시나리오별 대화로 보고 차례로 질문하면서,
+follow-up 규칙이 결정을 내린 경우 실제 라우터 LLM의 is_follow_up과 얼마나 일치하는지,
+언어 감지가 데이터셋의 language와 얼마나 일치하는지 출력한다. (OpenAI API, bge-m3 필요)
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from itertools import groupby
+from pathlib import Path
+
+import tiktoken
+from langchain_core.messages import SystemMessage
+from loguru import logger
+
+from src.core.config import settings
+from src.agent import heuristics
+from src.agent.departments import DEPARTMENTS
+from src.agent.prompts import ROUTER_PROMPT
+
+SCENARIO_GLOB = "evaluation/data/scenario_*.jsonl"
+SAMPLES = [
+    "수강신청 기간이 언제인가요?",
+    "그럼 정정 기간은요?",
+    "When does course registration start?",
+    "TOPCIT 시험은 언제 실시되나요?",
+    "Communication in English 과목은 몇 학점이야?",
+]
+
+
+def _detect_language_uncached(text: str, threshold: float = 0.6) -> str:
+    """캐시 적용 전 utils.detect_language와 같은 구현 (비교 기준)"""
+    encoding = tiktoken.encoding_for_model(settings["llm"]["model"])
+    tokens = encoding.encode(text)
+    korean = 0
+    for token in tokens:
+        piece = encoding.decode_single_token_bytes(token).decode("utf-8", errors="ignore")
+        if any("가" <= char <= "힣" for char in piece):
+            korean += 1
+    return "ko" if tokens and korean / len(tokens) >= threshold else "en"
+
+
+def _time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(SAMPLES[i % len(SAMPLES)])
+    return 1e6 * (time.perf_counter() - start) / repeat
+
+
+def speed(repeat: int):
+    heuristics.detect_language(SAMPLES[0])  # encoding 로드는 측정에서 제외
+    before = _time_per_call(_detect_language_uncached, repeat)
+    after = _time_per_call(heuristics.detect_language, repeat)
+    print(f"{'detect_language':<24} {'us/call':>10}")
+    print(f"{'tiktoken (uncached)':<24} {before:>10.1f}")
+    print(f"{'heuristics':<24} {after:>10.1f}")
+    print(f"speedup: {before / after:.1f}x")
+
+
+def load_scenarios(pattern: str = SCENARIO_GLOB) -> list:
+    items = []
+    for path in sorted(Path(".").glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            items.extend(json.loads(line) for line in f if line.strip())
+    return [list(group) for _, group in groupby(items, key=lambda item: item["scenario"])]
+
+
+async def agreement():
+    from src.agent.components import components
+
+    decisions = Counter()
+    language_hits = 0
+    total = 0
+    for conversation in load_scenarios():
+        previous = []
+        for item in conversation:
+            total += 1
+            question = item["question"]
+            language_hits += heuristics.detect_language(question) == item.get("language", "ko")
+
+            hint = await heuristics.follow_up_hint(question, previous, components.embeddings)
+            prompt = ROUTER_PROMPT.format(
+                question=question,
+                previous_questions=" / ".join(previous) or "없음",
+                department="없음",
+                departments=", ".join(DEPARTMENTS),
+            )
+            decision = await components.router.ainvoke([SystemMessage(content=prompt)])
+            llm = bool(previous) and decision.is_follow_up
+            if hint.is_follow_up is None:
+                decisions["llm_only"] += 1
+            else:
+                decisions[f"{hint.rule}:{'agree' if hint.is_follow_up == llm else 'disagree'}"] += 1
+                if hint.is_follow_up != llm:
+                    print(f"[disagree] {item['id']} rule={hint.rule} sim={hint.similarity} llm={llm}: {question}")
+            # 실제 노드와 같게 follow-up이면 체인 유지, 아니면 초기화
+            previous = previous + [decision.search_query or question] if llm else [question]
+
+    decided = total - decisions["llm_only"]
+    agreed = sum(count for key, count in decisions.items() if key.endswith(":agree"))
+    print(f"questions: {total}, decided by rules: {decided} ({decided / total:.0%}), LLM only: {decisions['llm_only']}")
+    print(f"rule/LLM agreement: {agreed / max(decided, 1):.1%}")
+    for key, count in sorted(decisions.items()):
+        print(f"  {key:<22} {count}")
+    print(f"language agreement: {language_hits / total:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 없는 언어 감지 / follow-up 규칙 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    speed_parser = subparsers.add_parser("speed", help="언어 감지 호출당 시간 비교")
+    speed_parser.add_argument("--repeat", type=int, default=2000)
+    subparsers.add_parser("agreement", help="시나리오 데이터에서 규칙과 라우터 LLM 판단 비교")
+
+    args = parser.parse_args()
+    logger.disable("src")
+    if args.command == "speed":
+        speed(args.repeat)
+    else:
+        asyncio.run(agreement())
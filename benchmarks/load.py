@@ -0,0 +1,229 @@
+"""
+OpenAI / bge-m3 없이 API 서버 전체를 띄워서 하는 부하 테스트.
+
+    python -m benchmarks.load --endpoints chat stream stream_sse --concurrency 1 4 16 --requests 64
+    python -m benchmarks.load --output benchmarks/results/new.json --baseline benchmarks/results/old.json
+
+src.api.main:app을 가짜 LLM(FakeChatModel: 첫 토큰 지연, 초당 토큰 수 설정, 스트리밍 지원)과
+가짜 임베딩/벡터스토어로 uvicorn에 띄우고, 실제 HTTP로 /chat, /chat/stream, /chat/stream_sse 를
+동시 요청 수별로 호출한다. 처리량, 지연 p50/p95/p99, 첫 청크까지 시간(TTFC), 서버 프로세스 RSS를
+출력하고 JSON 파일로 저장한다 (git commit 포함, --baseline 파일과 비교 가능).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+import uvicorn
+from loguru import logger
+
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings, FakeVectorStore
+
+ENDPOINTS = {
+    "chat": "/chat",
+    "stream": "/chat/stream",
+    "stream_sse": "/chat/stream_sse",
+}
+
+
+def _configure(args):
+    """서버 import 전에 컴포넌트를 가짜로 바꾸고 checkpointer를 메모리로 설정"""
+    from src.core.config import settings
+    from src.agent.components import components
+
+    embeddings = FakeEmbeddings(encode_time=args.encode_time)
+    components.override(
+        model=FakeChatModel(latency=args.llm_latency, tokens_per_second=args.token_rate),
+        encoder=embeddings,
+        store=FakeVectorStore(embeddings),
+        lexical_index=None,
+        corpus_version="load-test",
+    )
+    settings["checkpointer"]["backend"] = args.checkpointer
+    settings["checkpointer"]["sqlite_path"] = str(Path(args.workdir) / "checkpoints.sqlite")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _percentiles(values) -> dict:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+async def _request(client: httpx.AsyncClient, endpoint: str, question: str, bypass_cache: bool) -> dict:
+    """요청 1건. 반환: 전체 지연, 첫 청크까지 시간(스트리밍만), 성공 여부"""
+    payload = {"question": question, "bypass_cache": bypass_cache}
+    start = time.perf_counter()
+    first_chunk = None
+
+    if endpoint == "chat":
+        response = await client.post(ENDPOINTS[endpoint], json=payload)
+        ok = response.status_code == 200
+    else:
+        ok = False
+        async with client.stream("POST", ENDPOINTS[endpoint], json=payload) as response:
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[len("data: "):])
+                if event["type"] == "chunk" and first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                elif event["type"] == "end":
+                    ok = response.status_code == 200
+                elif event["type"] == "error":
+                    break
+
+    return {"latency": time.perf_counter() - start, "ttfc": first_chunk, "ok": ok}
+
+
+async def _sample_rss(samples: list, interval: float = 0.05):
+    from src.agent.utils import current_rss_bytes
+
+    while True:
+        samples.append(current_rss_bytes())
+        await asyncio.sleep(interval)
+
+
+async def _run_level(client, endpoint: str, concurrency: int, total: int, bypass_cache: bool, burst: bool) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one(i: int):
+        async with semaphore:
+            # 답변 캐시에 걸리지 않도록 요청마다 다른 질문 (--burst면 단계마다 같은 질문: 공지 직후 몰리는 상황)
+            suffix = f"{endpoint}-{concurrency}" if burst else f"{endpoint}-{concurrency}-{i}-{uuid.uuid4().hex[:6]}"
+            question = f"수강신청 기간 알려줘 ({suffix})"
+            try:
+                results.append(await _request(client, endpoint, question, bypass_cache))
+            except httpx.HTTPError:
+                results.append({"latency": None, "ttfc": None, "ok": False})
+
+    rss = []
+    sampler = asyncio.create_task(_sample_rss(rss))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    succeeded = [r for r in results if r["ok"]]
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": total - len(succeeded),
+        "elapsed": elapsed,
+        "throughput": len(succeeded) / elapsed,
+        "latency": _percentiles([r["latency"] for r in succeeded]),
+        "ttfc": _percentiles([r["ttfc"] for r in succeeded if r["ttfc"] is not None]),
+        "rss_peak_mb": max(rss) / 2**20 if rss else None,
+    }
+
+
+def _ms(value) -> str:
+    return f"{value * 1000:8.0f}" if value is not None else f"{'-':>8}"
+
+
+def _print_result(result: dict, baseline: dict = None):
+    line = (
+        f"{result['endpoint']:<11} {result['concurrency']:>5} | {result['throughput']:>7.2f} | "
+        f"{_ms(result['latency']['p50'])} {_ms(result['latency']['p95'])} {_ms(result['latency']['p99'])} | "
+        f"{_ms(result['ttfc']['p50'])} {_ms(result['ttfc']['p95'])} | "
+        f"{result['rss_peak_mb']:>7.0f} | {result['errors']:>4}"
+    )
+    if baseline:
+        change = result["throughput"] / baseline["throughput"] - 1 if baseline["throughput"] else 0.0
+        p95 = baseline["latency"]["p95"]
+        p95_change = result["latency"]["p95"] / p95 - 1 if p95 and result["latency"]["p95"] else 0.0
+        line += f" | req/s {change:+.0%}, p95 {p95_change:+.0%}"
+    print(line)
+
+
+def _load_baseline(path: str) -> dict:
+    if not path:
+        return {}
+    runs = json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+    return {(run["endpoint"], run["concurrency"]): run for run in runs}
+
+
+async def main(args):
+    logger.disable("src")  # 노드 로그가 결과 표를 덮지 않도록
+    Path(args.workdir).mkdir(parents=True, exist_ok=True)
+    _configure(args)
+    from src.api.main import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    baseline = _load_baseline(args.baseline)
+    results = []
+    print(
+        f"{'endpoint':<11} {'conc':>5} | {'req/s':>7} | {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} | "
+        f"{'ttfc p50':>8} {'ttfc p95':>8} | {'RSS MB':>7} | {'err':>4}"
+    )
+    try:
+        limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout, limits=limits) as client:
+            for endpoint in args.endpoints:
+                for level in args.concurrency:
+                    result = await _run_level(
+                        client, endpoint, level, max(args.requests, level), not args.cache, args.burst
+                    )
+                    results.append(result)
+                    _print_result(result, baseline.get((endpoint, level)))
+    finally:
+        server.should_exit = True
+        await serving
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"saved: {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 LLM/임베딩으로 API 서버 부하 테스트")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="단계별 총 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="LLM 첫 토큰까지 지연(초)")
+    parser.add_argument("--token-rate", type=float, default=100.0, help="LLM 초당 토큰 수")
+    parser.add_argument("--encode-time", type=float, default=0.02, help="쿼리 임베딩 1회 blocking 시간(초)")
+    parser.add_argument("--checkpointer", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--cache", action="store_true", help="답변 캐시 사용 (기본은 bypass_cache)")
+    parser.add_argument("--burst", action="store_true", help="단계마다 모든 요청이 같은 질문 (coalescing 확인용)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--workdir", default="/tmp/chatbot-load", help="sqlite checkpointer 파일 위치")
+    parser.add_argument("--output", default="benchmarks/results/load.json")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""
+학과 필터 검색: 전체 collection + metadata 필터 vs 학과별 collection (vectorstore.layout: partitioned).
+
+    python -m benchmarks.partitions [--department-chunks 300] [--others 1000 5000 20000] [--queries 50]
+
+작은 학과 하나의 청크 수는 고정하고 다른 학과 청크만 늘려 가면서, 같은 질의 벡터로 두 방식의
+Chroma 검색 지연(p50/p95)을 비교한다. 임베딩은 정규화한 난수 벡터 (bge-m3 불필요).
+"""
+import argparse
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+from src.agent.departments import department_filter, partition_collection
+
+DEPARTMENT = "스마트정보기술공학과"
+OTHERS = ("공주대학교", "컴퓨터공학과", "소프트웨어학과", "인공지능학부")
+
+
+def _vectors(rng, n: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _add(collection, ids, vectors, metadatas, batch_size: int = 5000):
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        collection.add(ids=ids[start:end], embeddings=vectors[start:end], metadatas=metadatas[start:end])
+
+
+def _time(search, queries) -> np.ndarray:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        timings.append(time.perf_counter() - start)
+    return np.asarray(timings) * 1000
+
+
+def run(args):
+    rng = np.random.default_rng(0)
+    client = chromadb.PersistentClient(path=tempfile.mkdtemp(prefix="chatbot-partitions-"))
+    everything = client.create_collection("langchain")
+    partition = client.create_collection(partition_collection("langchain", DEPARTMENT))
+
+    ids = [f"{DEPARTMENT}-{i}" for i in range(args.department_chunks)]
+    vectors = _vectors(rng, len(ids), args.dim)
+    metadatas = [{"department": DEPARTMENT}] * len(ids)
+    _add(everything, ids, vectors, metadatas)
+    _add(partition, ids, vectors, metadatas)
+
+    queries = _vectors(rng, args.queries, args.dim).tolist()
+    where = department_filter(DEPARTMENT)
+    added = 0
+    print(f"{'other chunks':>12} | {'filtered p50':>12} {'p95':>8} | {'partition p50':>13} {'p95':>8}  (ms)")
+    for total in args.others:
+        n = total - added
+        other_ids = [f"other-{added + i}" for i in range(n)]
+        other_metadatas = [{"department": OTHERS[(added + i) % len(OTHERS)]} for i in range(n)]
+        _add(everything, other_ids, _vectors(rng, n, args.dim), other_metadatas)
+        added = total
+
+        filtered = _time(lambda q: everything.query(query_embeddings=[q], n_results=args.k, where=where), queries)
+        routed = _time(lambda q: partition.query(query_embeddings=[q], n_results=args.k), queries)
+        print(
+            f"{total:>12} | {np.percentile(filtered, 50):>12.2f} {np.percentile(filtered, 95):>8.2f} | "
+            f"{np.percentile(routed, 50):>13.2f} {np.percentile(routed, 95):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학과 metadata 필터 검색 vs 학과별 collection 검색 지연")
+    parser.add_argument("--department-chunks", type=int, default=300, help="검색 대상 학과의 청크 수 (고정)")
+    parser.add_argument("--others", type=int, nargs="+", default=[1000, 5000, 20000], help="다른 학과 청크 수 단계")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    run(parser.parse_args())
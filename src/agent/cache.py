@@ -0,0 +1,167 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 질문 끝에 붙는 요청 표현 (의미에 영향이 없어서 캐시 키에서 제거)
+_TRAILING_PHRASES = (
+    "알려주실수있나요", "알려주시겠어요", "알려주세요", "알려줘요", "알려줘",
+    "궁금합니다", "궁금해요", "궁금해",
+    "부탁드립니다", "부탁해요",
+    "좀",
+)
+_NON_WORD = re.compile(r"[^\w가-힣]+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    캐시 키용 한국어 질문 정규화.
+    유니코드 정규화(NFKC), 소문자화, 문장부호/띄어쓰기 제거, 끝의 요청 표현 제거.
+    ('수강 신청 기간 알려주세요?' 와 '수강신청기간 알려줘' 가 같은 키가 된다)
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _NON_WORD.sub("", text)
+
+    stripped = True
+    while stripped and text:
+        stripped = False
+        for phrase in _TRAILING_PHRASES:
+            if text.endswith(phrase) and len(text) > len(phrase):
+                text = text[: -len(phrase)]
+                stripped = True
+    return text
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    scope: Tuple[str, ...]     # (학과, 언어, 코퍼스 버전)
+    vector: np.ndarray
+    answer: str
+    documents: List[Dict] = field(default_factory=list)
+    created_at: float = 0.0
+
+
+class AnswerCache:
+    """
+    generation_node 앞단의 의미 기반 답변 캐시.
+    정규화된 질문이 같거나 쿼리 임베딩 cosine 유사도가 threshold 이상이고,
+    학과/언어/코퍼스 버전(scope)이 같으면 저장된 답변을 재사용한다. LRU + TTL로 제거.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 6 * 60 * 60,
+        threshold: float = 0.95,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        # lookup에서 miss된 질문의 벡터. 답변 생성 후 put에서 다시 encode하지 않도록 잠시 보관
+        self._pending: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize_vector(vector: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return self._clock() - entry.created_at > self.ttl_seconds
+
+    def lookup(
+        self, query: str, vector: Sequence[float], scope: Tuple[str, ...], count: bool = True
+    ) -> Optional[CacheEntry]:
+        """count=False면 hit/miss 통계에 넣지 않음 (선행 검색: 채택 여부가 정해진 뒤 record로 반영)"""
+        key = normalize_query(query)
+        vector = self._normalize_vector(vector)
+
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None and self._expired(entry):
+                del self._entries[(scope, key)]
+                entry = None
+
+            if entry is None:
+                entry = self._nearest(vector, scope)
+
+            if entry is None:
+                self.misses += count
+                self._pending[(scope, key)] = vector
+                while len(self._pending) > self.max_entries:
+                    self._pending.popitem(last=False)
+                return None
+
+            self._entries.move_to_end((entry.scope, entry.key))
+            self.hits += count
+            return entry
+
+    def record(self, hit: bool):
+        """count=False로 조회한 결과를 실제로 사용했을 때 통계에 반영"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def discard_pending(self, query: str, scope: Tuple[str, ...]):
+        """답변을 저장하지 않을 조회(버려진 선행 검색)의 벡터 삭제"""
+        with self._lock:
+            self._pending.pop((scope, normalize_query(query)), None)
+
+    def _nearest(self, vector: np.ndarray, scope: Tuple[str, ...]) -> Optional[CacheEntry]:
+        candidates = [
+            entry for entry in self._entries.values()
+            if entry.scope == scope and not self._expired(entry)
+        ]
+        if not candidates:
+            return None
+
+        scores = np.stack([entry.vector for entry in candidates]) @ vector
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= self.threshold else None
+
+    def put(
+        self,
+        query: str,
+        scope: Tuple[str, ...],
+        answer: str,
+        documents: Optional[List[Dict]] = None,
+        vector: Optional[Sequence[float]] = None,
+    ) -> bool:
+        """답변 저장. vector가 없으면 직전 lookup의 벡터를 사용하고, 그것도 없으면 저장하지 않는다"""
+        key = normalize_query(query)
+
+        with self._lock:
+            pending = self._pending.pop((scope, key), None)
+            if vector is not None:
+                pending = self._normalize_vector(vector)
+            if pending is None:
+                return False
+
+            self._entries[(scope, key)] = CacheEntry(
+                key=key,
+                scope=scope,
+                vector=pending,
+                answer=answer,
+                documents=list(documents or []),
+                created_at=self._clock(),
+            )
+            self._entries.move_to_end((scope, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,299 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from ..core.config import settings
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+EvictCallback = Callable[[str], None]
+
+
+class BoundedInMemorySaver(InMemorySaver):
+    """
+    thread 수(LRU)와 미사용 기간(TTL)에 상한이 있는 InMemorySaver.
+    thread마다 최신 keep_last개의 checkpoint만 남기고, 더 이상 참조되지 않는 channel 값(blob)과
+    pending write도 함께 지운다.
+    """
+
+    def __init__(
+        self,
+        keep_last: int = 5,
+        max_threads: int = 5000,
+        ttl_seconds: float = 0,
+        clock: Callable[[], float] = time.time,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.keep_last = max(keep_last, 1)
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.evicted = 0
+        self.on_evict: List[EvictCallback] = []
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+        # (thread_id, checkpoint_ns, checkpoint_id) -> channel_versions. blob 정리 시 역직렬화 없이 참조 여부 확인
+        self._versions: Dict[tuple, Dict[str, str]] = {}
+        # (thread_id, checkpoint_ns) -> blob key 목록. 전체 blob을 훑지 않고 thread 단위로 정리
+        self._blob_keys: Dict[tuple, set] = {}
+
+    def _touch(self, thread_id: str):
+        self._last_used[thread_id] = self.clock()
+        self._last_used.move_to_end(thread_id)
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self._last_used:
+            self._touch(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        self._versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(checkpoint["channel_versions"])
+        self._blob_keys.setdefault((thread_id, checkpoint_ns), set()).update(
+            (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()
+        )
+        self._touch(thread_id)
+        self._prune(thread_id, checkpoint_ns)
+        self._evict_overflow(exclude=thread_id)
+        return result
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_last:
+            return
+
+        # checkpoint id(uuid6)는 시간순으로 정렬됨
+        ordered = sorted(checkpoints)
+        for checkpoint_id in ordered[:-self.keep_last]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        referenced = {
+            (channel, version)
+            for checkpoint_id in ordered[-self.keep_last:]
+            for channel, version in self._versions.get((thread_id, checkpoint_ns, checkpoint_id), {}).items()
+        }
+        blob_keys = self._blob_keys.get((thread_id, checkpoint_ns), set())
+        for key in [key for key in blob_keys if (key[2], key[3]) not in referenced]:
+            blob_keys.discard(key)
+            self.blobs.pop(key, None)
+
+    def _evict_overflow(self, exclude: Optional[str] = None):
+        while len(self._last_used) > self.max_threads:
+            thread_id = next(iter(self._last_used))
+            if thread_id == exclude:
+                break
+            self.evict(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            for key in self._blob_keys.pop((thread_id, checkpoint_ns), ()):
+                self.blobs.pop(key, None)
+        self._last_used.pop(thread_id, None)
+
+    def evict(self, thread_id: str):
+        self.delete_thread(thread_id)
+        self.evicted += 1
+        for callback in self.on_evict:
+            callback(thread_id)
+
+    def evict_expired(self) -> int:
+        """ttl_seconds 동안 읽기/쓰기가 없던 thread 삭제. 삭제한 thread 수 반환"""
+        if not self.ttl_seconds:
+            return 0
+        deadline = self.clock() - self.ttl_seconds
+        expired = [thread_id for thread_id, last_used in self._last_used.items() if last_used < deadline]
+        for thread_id in expired:
+            self.evict(thread_id)
+        return len(expired)
+
+    async def aevict_expired(self) -> int:
+        return self.evict_expired()
+
+    async def alist_threads(self) -> List[str]:
+        return list(self.storage.keys())
+
+    def footprint(self) -> Dict[str, int]:
+        """직렬화된 checkpoint / blob / write 크기 합계 (프로세스 메모리 사용량의 근사치)"""
+        checkpoint_bytes = sum(
+            len(checkpoint[1]) + len(metadata[1])
+            for namespaces in self.storage.values()
+            for checkpoints in namespaces.values()
+            for checkpoint, metadata, _ in checkpoints.values()
+        )
+        blob_bytes = sum(len(value[1]) for value in self.blobs.values())
+        write_bytes = sum(len(write[2][1]) for writes in self.writes.values() for write in writes.values())
+        return {
+            "threads": len(self.storage),
+            "checkpoints": sum(len(c) for namespaces in self.storage.values() for c in namespaces.values()),
+            "blobs": len(self.blobs),
+            "memory_bytes": checkpoint_bytes + blob_bytes + write_bytes,
+            "evicted": self.evicted,
+        }
+
+    async def afootprint(self) -> Dict[str, int]:
+        return self.footprint()
+
+
+def _sqlite_saver_class():
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    class BoundedAsyncSqliteSaver(AsyncSqliteSaver):
+        """
+        thread마다 최신 keep_last개의 checkpoint만 남기는 AsyncSqliteSaver.
+        thread별 마지막 사용 시각을 따로 기록해 두고 TTL이 지난 thread를 삭제한다.
+        """
+
+        def __init__(self, conn, path: str, keep_last: int = 5, ttl_seconds: float = 0, clock=time.time, **kwargs):
+            super().__init__(conn, **kwargs)
+            self.path = path
+            self.keep_last = max(keep_last, 1)
+            self.ttl_seconds = ttl_seconds
+            self.clock = clock
+            self.evicted = 0
+            self.on_evict: List[EvictCallback] = []
+
+        async def setup(self) -> None:
+            if self.is_setup:
+                return
+            await super().setup()
+            async with self.lock:
+                await self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+                )
+                await self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS thread_activity_updated_at ON thread_activity (updated_at)"
+                )
+                await self.conn.commit()
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            result = await super().aput(config, checkpoint, metadata, new_versions)
+            thread_id = str(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            async with self.lock:
+                await self.conn.execute(
+                    "INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)",
+                    (thread_id, self.clock()),
+                )
+                async with self.conn.execute(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+                    (thread_id, checkpoint_ns, self.keep_last - 1),
+                ) as cursor:
+                    row = await cursor.fetchone()
+                if row is not None:
+                    for table in ("checkpoints", "writes"):
+                        await self.conn.execute(
+                            f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                            (thread_id, checkpoint_ns, row[0]),
+                        )
+                await self.conn.commit()
+            return result
+
+        async def adelete_thread(self, thread_id: str) -> None:
+            await super().adelete_thread(thread_id)
+            async with self.lock:
+                await self.conn.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+                await self.conn.commit()
+
+        async def aevict_expired(self) -> int:
+            if not self.ttl_seconds:
+                return 0
+            await self.setup()
+            async with self.lock:
+                async with self.conn.execute(
+                    "SELECT thread_id FROM thread_activity WHERE updated_at < ?",
+                    (self.clock() - self.ttl_seconds,),
+                ) as cursor:
+                    expired = [row[0] for row in await cursor.fetchall()]
+            for thread_id in expired:
+                await self.adelete_thread(thread_id)
+                self.evicted += 1
+                for callback in self.on_evict:
+                    callback(thread_id)
+            return len(expired)
+
+        async def alist_threads(self) -> List[str]:
+            await self.setup()
+            async with self.lock, self.conn.execute("SELECT DISTINCT thread_id FROM checkpoints") as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+
+        async def afootprint(self) -> Dict[str, int]:
+            await self.setup()
+            async with self.lock:
+                async with self.conn.execute(
+                    "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+                ) as cursor:
+                    threads, checkpoints = await cursor.fetchone()
+            disk_bytes = sum(
+                os.path.getsize(path)
+                for path in (self.path, f"{self.path}-wal", f"{self.path}-shm")
+                if os.path.exists(path)
+            )
+            return {
+                "threads": threads,
+                "checkpoints": checkpoints,
+                "disk_bytes": disk_bytes,
+                "evicted": self.evicted,
+            }
+
+    return BoundedAsyncSqliteSaver
+
+
+@asynccontextmanager
+async def create_checkpointer(config: Optional[dict] = None) -> AsyncIterator:
+    """checkpointer.backend 설정(memory | sqlite)에 맞는 checkpointer 생성"""
+    config = config or settings["checkpointer"]
+    backend = config.get("backend", "memory")
+
+    if backend == "memory":
+        yield BoundedInMemorySaver(
+            keep_last=config["keep_last"],
+            max_threads=config["max_threads"],
+            ttl_seconds=config["ttl_seconds"],
+        )
+        return
+
+    if backend == "sqlite":
+        import aiosqlite
+
+        path = config["sqlite_path"]
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        async with aiosqlite.connect(path) as conn:
+            saver = _sqlite_saver_class()(
+                conn,
+                path=path,
+                keep_last=config["keep_last"],
+                ttl_seconds=config["ttl_seconds"],
+            )
+            await saver.setup()
+            yield saver
+        return
+
+    raise ValueError(f"지원하지 않는 checkpointer.backend 입니다: {backend}")
+
+
+async def sweep_checkpointer(checkpointer, interval_seconds: float):
+    """TTL이 지난 thread를 주기적으로 삭제하고 checkpointer 크기를 로그로 남김 (lifespan의 백그라운드 task)"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            evicted = await checkpointer.aevict_expired()
+            footprint = await checkpointer.afootprint()
+            logger.info(f"[checkpointer] evicted {evicted} expired threads; footprint {footprint}")
+        except Exception as e:
+            logger.error(f"[checkpointer] sweep failed: {e}")
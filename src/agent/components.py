@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from ..core.config import settings
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _create_model():
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=settings["llm"]["model"],
+        api_key=settings["openai_api_key"],
+        temperature=settings["llm"]["temperature"],
+        max_retries=settings["llm"]["retry"],
+        # 스트리밍 응답에도 토큰 사용량을 받아 /metrics에 기록
+        stream_usage=True,
+    )
+
+
+def _create_embeddings():
+    """embedding.backend 설정에 따라 임베딩 모델 생성 (torch fp32 / ONNX Runtime fp32 / ONNX int8)"""
+    config = settings["embedding"]
+    backend = config.get("backend", "torch")
+
+    if backend == "torch":
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        return HuggingFaceEmbeddings(
+            model_name=config["model"]
+        )
+
+    if backend in ("onnx", "onnx-int8"):
+        from .embeddings import OnnxEmbeddings
+
+        return OnnxEmbeddings(
+            config["onnx_dir"],
+            quantized=backend == "onnx-int8",
+            num_threads=config.get("onnx_threads"),
+        )
+
+    raise ValueError(f"지원하지 않는 embedding.backend 입니다: {backend}")
+
+
+def read_corpus_version(collection) -> str:
+    """벡터DB 내용이 바뀌면 달라지는 버전 값 (manifest.json이 있으면 그 version, 없으면 문서 수)"""
+    manifest = Path(settings["vectorstore"]["persist_directory"]) / "manifest.json"
+    if manifest.exists():
+        return str(json.loads(manifest.read_text(encoding="utf-8"))["version"])
+    return f"count-{collection.count()}"
+
+
+def lexical_index_path() -> Path:
+    config = settings["vectorstore"]
+    return Path(config["persist_directory"]) / config["lexical_index"]
+
+
+def create_partition_stores(embeddings) -> Dict[str, Any]:
+    """학과(alias 그룹은 대표 학과)별 Chroma store. vectorstore.layout이 partitioned가 아니면 빈 dict"""
+    config = settings["vectorstore"]
+    if config.get("layout", "single") != "partitioned":
+        return {}
+
+    from langchain_chroma import Chroma
+    from .departments import PARTITION_SLUGS, partition_collection
+
+    return {
+        department: Chroma(
+            collection_name=partition_collection(config["collection"], department),
+            persist_directory=config["persist_directory"],
+            embedding_function=embeddings,
+        )
+        for department in PARTITION_SLUGS
+    }
+
+
+# override 시 함께 다시 만들어야 하는 파생 컴포넌트
+_DERIVED = {
+    "model": ["router"],
+    "encoder": ["embeddings"],
+}
+
+
+class Components:
+    """
+    프로세스 전역 컴포넌트 레지스트리.
+    LLM, 임베딩 모델(bge-m3), Chroma 클라이언트를 처음 접근할 때 한 번만 생성해서 공유한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._instances: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            # 다른 스레드가 먼저 만들었을 수 있으므로 한 번 더 확인
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = factory()
+                self.timings[name] = time.perf_counter() - start
+                logger.info(f"[components] {name} initialized in {self.timings[name]:.2f}s")
+            return self._instances[name]
+
+    @property
+    def model(self):
+        return self._get("model", _create_model)
+
+    @property
+    def router(self):
+        from .state import RouteDecision
+        return self._get("router", lambda: self.model.with_structured_output(RouteDecision))
+
+    @property
+    def encoder(self):
+        """임베딩 모델 자체 (bge-m3)"""
+        return self._get("encoder", _create_embeddings)
+
+    @property
+    def embeddings(self):
+        """쿼리 캐시 + micro-batching이 적용된 임베딩 (검색/벡터DB는 이것을 사용)"""
+        def create():
+            from .embeddings import CachedEmbeddings
+
+            config = settings["embedding"]
+            return CachedEmbeddings(
+                self.encoder,
+                cache_size=config["cache_size"],
+                batch_window_ms=config["batch_window_ms"],
+                max_batch_size=config["max_batch_size"],
+            )
+        return self._get("embeddings", create)
+
+    @property
+    def store(self):
+        def create():
+            from langchain_chroma import Chroma
+
+            return Chroma(
+                collection_name=settings["vectorstore"]["collection"],
+                persist_directory=settings["vectorstore"]["persist_directory"],
+                embedding_function=self.embeddings,
+            )
+        return self._get("store", create)
+
+    @property
+    def partitions(self):
+        """
+        학과 필터 검색용 학과별 store (vectorstore.layout: partitioned). 대표 학과명 -> Chroma.
+        아직 채워지지 않은 학과는 빼서 전체 collection + metadata 필터 검색으로 대신한다.
+        """
+        def create():
+            stores = create_partition_stores(self.embeddings)
+            empty = [department for department, store in stores.items() if store._collection.count() == 0]
+            if empty:
+                logger.warning(
+                    f"[components] empty partitions {empty}; using the filtered global collection for them. "
+                    "Run `python -m src.cli.ingest` to fill them."
+                )
+            return {department: store for department, store in stores.items() if department not in empty}
+        return self._get("partitions", create)
+
+    @property
+    def department_classifier(self):
+        def create():
+            from .departments import DepartmentClassifier
+
+            config = settings["department_classifier"]
+            return DepartmentClassifier.from_collection(
+                self.store._collection,
+                min_score=config["min_score"],
+                min_margin=config["min_margin"],
+            )
+        return self._get("department_classifier", create)
+
+    @property
+    def lexical_index(self):
+        """오프라인에서 만든 BM25 인덱스 (python -m src.cli.build_lexical_index). 없으면 None"""
+        def create():
+            from .lexical import LexicalIndex
+
+            path = lexical_index_path()
+            if not path.exists():
+                logger.warning(f"[components] BM25 index not found at {path}. Using dense retrieval only.")
+                return None
+            index = LexicalIndex.load(path)
+            if index.version != self.corpus_version:
+                logger.warning(
+                    f"[components] BM25 index version {index.version} != corpus version {self.corpus_version}. "
+                    "Rebuild it with `python -m src.cli.build_lexical_index`."
+                )
+            return index
+        return self._get("lexical_index", create)
+
+    @property
+    def answer_cache(self):
+        def create():
+            from .cache import AnswerCache
+
+            config = settings["answer_cache"]
+            return AnswerCache(
+                max_entries=config["max_entries"],
+                ttl_seconds=config["ttl_seconds"],
+                threshold=config["similarity_threshold"],
+            )
+        return self._get("answer_cache", create)
+
+    @property
+    def corpus_version(self) -> str:
+        return self._get("corpus_version", lambda: read_corpus_version(self.store._collection))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """이미 생성된 캐시 컴포넌트의 hit/miss 통계 (없는 컴포넌트는 만들지 않음)"""
+        stats = {}
+        for name, key in (("answer_cache", "answer_cache"), ("embedding_cache", "embeddings")):
+            instance = self._instances.get(key)
+            if instance is not None and hasattr(instance, "stats"):
+                stats[name] = instance.stats()
+        return stats
+
+    def warmup(self):
+        """모든 컴포넌트를 생성하고 임베딩 모델을 더미 encode로 예열 (서버 준비 완료 전에 호출)"""
+        start = time.perf_counter()
+        self.model
+        self.router
+        self.store
+        self.partitions
+        self.department_classifier
+        self.lexical_index
+        self.answer_cache
+        logger.info(f"[components] corpus version: {self.corpus_version}")
+
+        encode_start = time.perf_counter()
+        self.encoder.embed_query("warmup")
+        self.timings["embedding_warmup"] = time.perf_counter() - encode_start
+        logger.info(f"[components] embedding warmup encode in {self.timings['embedding_warmup']:.2f}s")
+        logger.info(f"[components] ready in {time.perf_counter() - start:.2f}s")
+
+    def override(self, **instances):
+        """테스트/벤치마크용: 지정한 컴포넌트를 주어진 객체로 교체"""
+        with self._lock:
+            self._instances.update(instances)
+            # 파생 컴포넌트는 새 의존성으로 다시 만들어지도록 제거
+            for source, derived in _DERIVED.items():
+                if source in instances:
+                    for name in derived:
+                        if name not in instances:
+                            self._instances.pop(name, None)
+
+    def reset(self):
+        with self._lock:
+            self._instances.clear()
+            self.timings.clear()
+
+
+components = Components()
@@ -0,0 +1,147 @@
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+from ..core.config import settings
+from ..core.logger import get_logger
+from .utils import count_tokens as default_count_tokens
+
+logger = get_logger(__name__)
+
+
+def format_document(index: int, document: Dict) -> str:
+    """프롬프트에 넣는 문서 블록 (줄바꿈 유지)"""
+    metadata = document.get("metadata", {})
+    return (
+        f"[검색된 문서 {index}]\n\n"
+        f"본문 내용:\n{document['content']}\n\n"
+        f"제목:\n{metadata.get('file_name', '')}\n\n"
+        f"부서:\n{metadata.get('department', '')}\n\n"
+        f"작성일:\n{metadata.get('date', '')}\n\n"
+        f"출처:\n{metadata.get('url', '')}\n"
+    )
+
+
+DOCUMENT_SEPARATOR = "\n\n---\n\n"
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """공백을 정규화한 문자 n-gram 집합 (재수집된 공지처럼 거의 같은 본문 비교용)"""
+    compact = re.sub(r"\s+", " ", text).strip().lower()
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class ContextResult:
+    documents: List[Dict]           # 실제로 프롬프트에 들어간 문서 (잘린 본문 포함)
+    text: str
+    tokens: int
+    original_tokens: int            # 예산/중복 제거 없이 모두 넣었을 때의 토큰 수
+    duplicates: int = 0
+    truncated: int = 0
+    dropped: int = 0
+    skipped: List[int] = field(default_factory=list)
+    sources: List[Dict] = field(default_factory=list)   # documents와 같은 순서의 원본 문서 (출처/답변 캐시용, 본문 안 자름)
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(self.original_tokens - self.tokens, 0)
+
+
+class ContextBuilder:
+    """
+    관련도 순으로 정렬된 문서를 토큰 예산 안에 채워 넣는 프롬프트 컨텍스트 생성기.
+    이미 넣은 문서와 shingle Jaccard 유사도가 높은 문서는 제외하고, 예산이 모자라면 마지막 문서는 잘라서 넣는다.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        min_document_tokens: int = 200,
+        duplicate_threshold: float = 0.8,
+        shingle_size: int = 5,
+        count_tokens: Callable[[str], int] = default_count_tokens,
+    ):
+        self.max_tokens = max_tokens
+        self.min_document_tokens = min_document_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.shingle_size = shingle_size
+        self.count_tokens = count_tokens
+
+    @classmethod
+    def from_settings(cls, **kwargs) -> "ContextBuilder":
+        config = settings["context"]
+        return cls(
+            max_tokens=config["max_tokens"],
+            min_document_tokens=config["min_document_tokens"],
+            duplicate_threshold=config["duplicate_threshold"],
+            shingle_size=config["shingle_size"],
+            **kwargs,
+        )
+
+    def _truncate(self, document: Dict, index: int, budget: int) -> Optional[Dict]:
+        """블록 전체가 budget 토큰 이하가 되도록 본문 뒷부분을 잘라냄"""
+        content = document["content"]
+        overhead = self.count_tokens(format_document(index, {**document, "content": ""}))
+        if budget - overhead < self.min_document_tokens:
+            return None
+
+        # 토큰 수는 글자 수에 대략 비례하므로 비율로 자르고, 넘치면 조금씩 더 줄임
+        ratio = (budget - overhead) / max(self.count_tokens(content), 1)
+        length = int(len(content) * ratio)
+        while length > 0:
+            candidate = {**document, "content": content[:length].rstrip() + " …"}
+            if self.count_tokens(format_document(index, candidate)) <= budget:
+                return candidate
+            length = int(length * 0.9)
+        return None
+
+    def build(self, documents: List[Dict]) -> ContextResult:
+        blocks = [format_document(i + 1, d) for i, d in enumerate(documents)]
+        original_tokens = self.count_tokens(DOCUMENT_SEPARATOR.join(blocks)) if blocks else 0
+        separator_tokens = self.count_tokens(DOCUMENT_SEPARATOR)
+
+        selected: List[Dict] = []
+        selected_shingles: List[Set[str]] = []
+        parts: List[str] = []
+        used = 0
+        result = ContextResult(documents=selected, text="", tokens=0, original_tokens=original_tokens)
+
+        for position, document in enumerate(documents):
+            document_shingles = shingles(document["content"], self.shingle_size)
+            if any(jaccard(document_shingles, other) >= self.duplicate_threshold for other in selected_shingles):
+                result.duplicates += 1
+                result.skipped.append(position)
+                continue
+
+            index = len(selected) + 1
+            block = format_document(index, document)
+            cost = self.count_tokens(block) + (separator_tokens if parts else 0)
+            remaining = self.max_tokens - used
+            if cost > remaining:
+                document = self._truncate(document, index, remaining - (separator_tokens if parts else 0))
+                if document is None:
+                    result.dropped += 1
+                    result.skipped.append(position)
+                    continue
+                block = format_document(index, document)
+                cost = self.count_tokens(block) + (separator_tokens if parts else 0)
+                result.truncated += 1
+
+            selected.append(document)
+            result.sources.append(documents[position])
+            selected_shingles.append(document_shingles)
+            parts.append(block)
+            used += cost
+
+        result.text = DOCUMENT_SEPARATOR.join(parts)
+        result.tokens = self.count_tokens(result.text) if parts else 0
+        return result
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Sequence, get_args
+
+import numpy as np
+
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 학과/부서 후보 (벡터DB metadata의 department 값)
+Department = Literal[
+    "소프트웨어학과",
+    "컴퓨터공학과",
+    "공주대학교",
+    "공주대학교 SW중심대학사업단",
+    "SW중심대학사업단",
+    "스마트정보기술공학과",
+    "인공지능학부",
+    # "공주대학교 현장실습지원센터"
+]
+
+DEPARTMENTS: List[str] = list(get_args(Department))
+
+# alias 매핑 (검색 시 OR 조건 처리)
+ALIAS_MAP: Dict[str, List[str]] = {
+    "공주대학교 SW중심대학사업단": ["공주대학교 SW중심대학사업단", "SW중심대학사업단"],
+    "SW중심대학사업단": ["공주대학교 SW중심대학사업단", "SW중심대학사업단"],
+}
+
+
+def department_filter(department: Optional[str]) -> Optional[dict]:
+    """학과명을 Chroma metadata 필터로 변환. 목록에 없는 학과면 None(필터 없음)"""
+    if department not in DEPARTMENTS:
+        return None
+    aliases = ALIAS_MAP.get(department, [department])
+    return {"department": {"$in": aliases}}
+
+
+def canonical_department(department: Optional[str]) -> Optional[str]:
+    """alias 그룹은 대표 학과명 하나로 통일 (목록에 없는 학과면 None)"""
+    if department not in DEPARTMENTS:
+        return None
+    return ALIAS_MAP.get(department, [department])[0]
+
+
+# vectorstore.layout=partitioned 에서 학과(alias 그룹은 대표 학과)별 collection 이름에 붙이는 값
+# (Chroma collection 이름은 영문/숫자/-/_ 만 허용)
+PARTITION_SLUGS: Dict[str, str] = {
+    "소프트웨어학과": "software",
+    "컴퓨터공학과": "computer-engineering",
+    "공주대학교": "university",
+    "공주대학교 SW중심대학사업단": "sw-center",
+    "스마트정보기술공학과": "smart-it",
+    "인공지능학부": "ai",
+}
+
+
+def partition_collection(base: str, department: Optional[str]) -> Optional[str]:
+    """학과 전용 collection 이름 (목록에 없는 학과면 None: 전체 collection에만 저장/검색)"""
+    canonical = canonical_department(department)
+    return f"{base}-{PARTITION_SLUGS[canonical]}" if canonical else None
+
+
+@dataclass
+class DepartmentPrediction:
+    department: Optional[str]
+    score: float       # 1순위 centroid와의 cosine 유사도
+    margin: float      # 1순위와 2순위 유사도 차이
+    confident: bool    # threshold를 넘으면 True, 아니면 LLM 판단으로 escalate
+
+
+class DepartmentClassifier:
+    """
+    Chroma에 저장된 문서 임베딩의 department metadata로 학과별 centroid를 만들고,
+    검색용 쿼리 임베딩을 가장 가까운 centroid로 분류하는 nearest-centroid 분류기.
+    """
+
+    def __init__(
+        self,
+        centroids: Dict[str, Sequence[float]],
+        min_score: float = 0.5,
+        min_margin: float = 0.02,
+        dim: int = 0,
+    ):
+        self.labels = list(centroids)
+        if not self.labels:
+            # 빈 collection이나 department metadata가 없는 코퍼스: 항상 not confident (라우터 LLM 판단 사용)
+            self.centroids = np.zeros((0, dim), dtype=np.float32)
+        else:
+            matrix = np.asarray([centroids[label] for label in self.labels], dtype=np.float32)
+            self.centroids = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.min_score = min_score
+        self.min_margin = min_margin
+
+    @classmethod
+    def from_collection(cls, collection, batch_size: int = 5000, **kwargs) -> "DepartmentClassifier":
+        """Chroma collection의 임베딩을 학과별로 평균내어 centroid 계산"""
+        sums: Dict[str, np.ndarray] = {}
+        counts: Dict[str, int] = {}
+        dim = 0
+
+        offset = 0
+        while True:
+            batch = collection.get(include=["embeddings", "metadatas"], limit=batch_size, offset=offset)
+            embeddings = batch.get("embeddings")
+            metadatas = batch.get("metadatas") or []
+            if embeddings is None or len(embeddings) == 0:
+                break
+
+            dim = len(embeddings[0])
+            for vector, metadata in zip(embeddings, metadatas):
+                department = canonical_department((metadata or {}).get("department"))
+                if department is None:
+                    continue
+                vector = np.asarray(vector, dtype=np.float32)
+                vector = vector / (np.linalg.norm(vector) or 1.0)
+                sums[department] = sums.get(department, 0) + vector
+                counts[department] = counts.get(department, 0) + 1
+
+            offset += len(embeddings)
+
+        centroids = {department: sums[department] / counts[department] for department in sums}
+        if not centroids:
+            logger.warning("[departments] no chunks with department metadata; classifier will always escalate")
+        return cls(centroids, dim=dim, **kwargs)
+
+    def predict(self, vector: Sequence[float]) -> DepartmentPrediction:
+        if not self.labels:
+            return DepartmentPrediction(department=None, score=0.0, margin=0.0, confident=False)
+
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = self.centroids @ query
+
+        order = np.argsort(scores)[::-1]
+        best = float(scores[order[0]])
+        margin = best - float(scores[order[1]]) if len(order) > 1 else best
+
+        return DepartmentPrediction(
+            department=self.labels[order[0]],
+            score=best,
+            margin=margin,
+            confident=best >= self.min_score and margin >= self.min_margin,
+        )
@@ -0,0 +1,223 @@
+import asyncio
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..core.logger import get_logger
+from ..core.metrics import EMBEDDING_SECONDS
+from .utils import run_in_executor
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """임베딩 캐시 키: 유니코드 정규화(NFKC) + 공백 정리 (벡터 의미가 바뀌지 않는 범위만)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 encode 요청을 window_ms 동안 모아 한 번의 batch encode로 처리.
+    bge-m3 forward를 요청마다 따로 돌리지 않고 sentence-transformers batch 한 번으로 묶는다.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], List[List[float]]],
+        window_ms: float = 5.0,
+        max_batch_size: int = 32,
+    ):
+        self.encode_batch = encode_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()  # 실행 중인 batch encode task (참조를 잡아 두지 않으면 GC로 사라질 수 있음)
+        self.batches = 0
+        self.encoded = 0
+
+    async def submit(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        # 같은 질문이 동시에 들어오면 한 번만 encode
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            with EMBEDDING_SECONDS.labels("batch").time():
+                vectors = await run_in_executor(self.encode_batch, texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.encoded += len(texts)
+        by_text = dict(zip(texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 모델 래퍼.
+    - embed_query/aembed_query: 정규화된 쿼리 → 벡터 LRU 캐시 (follow-up, 반복 질문은 encoder 생략)
+    - aembed_query의 cache miss는 MicroBatcher로 모아 batch encode
+    - embed_documents(수집/인덱싱)는 그대로 모델에 위임
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_size: int = 2048,
+        batch_window_ms: float = 5.0,
+        max_batch_size: int = 32,
+    ):
+        self.embeddings = embeddings
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.batcher = MicroBatcher(embeddings.embed_documents, batch_window_ms, max_batch_size)
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def _remember(self, key: str, vector: List[float]):
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_text(text)
+        vector = self._cached(key)
+        if vector is None:
+            with EMBEDDING_SECONDS.labels("query").time():
+                vector = self.embeddings.embed_query(key)
+            self._remember(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = normalize_text(text)
+        vector = self._cached(key)
+        if vector is None:
+            vector = await self.batcher.submit(key)
+            self._remember(key, vector)
+        return vector
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "batches": self.batcher.batches,
+            "batched_encodes": self.batcher.encoded,
+        }
+
+
+# src.cli.onnx_embeddings export 가 onnx_dir에 만드는 파일 이름
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    ONNX Runtime CPU 임베딩 백엔드 (fp32 또는 dynamic int8 양자화 모델).
+    bge-m3의 sentence-transformers 설정과 같게 CLS pooling 후 L2 정규화한다.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = False,
+        batch_size: int = 16,
+        max_length: int = 8192,
+        num_threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        model_file = Path(model_dir) / (ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        self.session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        logger.info(f"Loaded ONNX embedding model: {model_file}")
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        # 길이가 비슷한 문장끼리 묶어 padding 낭비를 줄이고, 결과는 원래 순서로 되돌림
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in indices],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            inputs = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, inputs)[0]
+
+            cls = hidden[:, 0]
+            cls = cls / np.linalg.norm(cls, axis=1, keepdims=True)
+            for i, vector in zip(indices, cls):
+                vectors[i] = vector.tolist()
+
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0]
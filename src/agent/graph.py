@@ -1,53 +1,73 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
-from langgraph.prebuilt import ToolNode
 
+from ..core.config import settings
 from ..core.logger import get_logger
 from .state import CustomState
-from .utils import initialize_components
 from .nodes import (
-    generate_query_or_response_node,
+    route_question_node,
     language_detection_node,
     route_before_retrieval_node,
     rewrite_question_node,
     generation_node,
-    summarization_node,
     retrieve_documents_node,
+    speculative_retrieve_node,
+    adopt_speculation_node,
+    route_after_speculation_node,
 )
 
 logger = get_logger(__name__)
 
 
-def build_graph(checkpointer, store=None) -> CompiledStateGraph:
+def build_graph(checkpointer, store=None, speculative: bool = None) -> CompiledStateGraph:
+    """
+    speculative(기본값 retrieval.speculative)이면 route_question(LLM)과 검색을 동시에 실행하고
+    adopt_speculation에서 라우터 판단에 맞으면 검색 결과를 채택, 아니면 다시 검색하거나 버린다.
+    """
+    if speculative is None:
+        speculative = settings["retrieval"].get("speculative", False)
     builder = StateGraph(CustomState)
-    _, _, retriever_tool = initialize_components()
 
     logger.info("Generating Nodes...")
     builder.add_node("detect_language", language_detection_node)
-    builder.add_node("generate_query_or_respond", generate_query_or_response_node)
-    #builder.add_node("retrieve", ToolNode([retriever_tool]))
+    builder.add_node("route_question", route_question_node)
     builder.add_node("retrieve", retrieve_documents_node)
     #builder.add_node("collect_documents", collect_documents_node)
     builder.add_node("rewrite_question", rewrite_question_node)
     builder.add_node("generate", generation_node)
-    builder.add_node("summarize", summarization_node)
     logger.info("Nodes generated.")
 
     logger.info("Adding Edges...")
     builder.add_edge(START, "detect_language")
-    builder.add_edge("detect_language", "generate_query_or_respond")
-    builder.add_conditional_edges(
-        "generate_query_or_respond",
-        route_before_retrieval_node,
-        {
-            "retrieve": "retrieve",
-            "rewrite_question": "rewrite_question"
-        }
-    )
+    builder.add_edge("detect_language", "route_question")
+    if speculative:
+        builder.add_node("speculative_retrieve", speculative_retrieve_node)
+        builder.add_node("adopt_speculation", adopt_speculation_node)
+        builder.add_edge("detect_language", "speculative_retrieve")
+        # 두 노드가 모두 끝난 뒤 합류
+        builder.add_edge(["route_question", "speculative_retrieve"], "adopt_speculation")
+        builder.add_conditional_edges(
+            "adopt_speculation",
+            route_after_speculation_node,
+            {
+                "generate": "generate",
+                "retrieve": "retrieve",
+                "rewrite_question": "rewrite_question"
+            }
+        )
+    else:
+        builder.add_conditional_edges(
+            "route_question",
+            route_before_retrieval_node,
+            {
+                "retrieve": "retrieve",
+                "rewrite_question": "rewrite_question"
+            }
+        )
     builder.add_edge("retrieve", "generate")
-    builder.add_edge("generate", "summarize")
+    # 대화 요약은 응답 이후 백그라운드에서 실행 (src.agent.summary)
+    builder.add_edge("generate", END)
     builder.add_edge("rewrite_question", END)
-    builder.add_edge("summarize", END)
     logger.info("Edges added.")
 
     graph = builder.compile(checkpointer=checkpointer, store=store)
@@ -0,0 +1,95 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Literal, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.logger import get_logger
+from . import utils
+
+logger = get_logger(__name__)
+
+# 질문 맨 앞에 오면 이전 질문을 가리키는 표현 (ROUTER_PROMPT의 follow-up 기준과 같음)
+FOLLOW_UP_MARKERS = (
+    "그럼", "그러면", "그렇다면", "그거", "그건", "그것", "그게", "거기", "그곳",
+    "그때", "그중", "그 중", "그 외", "그밖에", "그 밖에", "아까", "방금",
+)
+FOLLOW_UP_MARKERS_EN = ("what about", "how about", "and what", "and how", "and when", "then ", "what else")
+
+_LEADING_PUNCT = re.compile(r"^[\s\"'“”‘’(\[]+")
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def script_counts(text: str) -> tuple:
+    """(한글 음절/자모 수, 라틴 문자 수)를 numpy로 한 번에 계산"""
+    points = _code_points(text)
+    hangul = ((points >= 0xAC00) & (points <= 0xD7A3)) | ((points >= 0x3131) & (points <= 0x318E))
+    latin = ((points >= 0x41) & (points <= 0x5A)) | ((points >= 0x61) & (points <= 0x7A))
+    return int(hangul.sum()), int(latin.sum())
+
+
+def detect_language(text: str, threshold: float = 0.6) -> Literal["ko", "en"]:
+    """
+    한글만 있으면 ko, 라틴 문자만 있으면 en으로 바로 판단하고 (tiktoken 사용 안 함),
+    두 문자가 섞인 경우에만 캐시된 tiktoken encoding으로 토큰 비율을 계산 (utils.detect_language).
+    """
+    if not text or not text.strip():
+        return "ko"
+    hangul, latin = script_counts(text)
+    if hangul and not latin:
+        return "ko"
+    if not hangul:
+        return "en"  # 라틴 문자만 있거나 숫자/기호뿐인 경우 (utils.detect_language와 같은 기본값)
+    return utils.detect_language(text, threshold)
+
+
+def lexical_follow_up(question: str) -> bool:
+    """질문이 '그럼', '그거' 처럼 이전 질문을 가리키는 표현으로 시작하는지"""
+    head = _LEADING_PUNCT.sub("", question)
+    lowered = head.lower()
+    return head.startswith(FOLLOW_UP_MARKERS) or lowered.startswith(FOLLOW_UP_MARKERS_EN)
+
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    denominator = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b) / denominator) if denominator else 0.0
+
+
+@dataclass
+class FollowUpHint:
+    is_follow_up: Optional[bool]   # None이면 애매함 -> 라우터 LLM이 판단
+    rule: str
+    similarity: Optional[float] = None
+
+
+async def follow_up_hint(question: str, previous_questions: Sequence[str], embeddings=None) -> FollowUpHint:
+    """
+    분명한 follow-up / 분명한 새 주제를 규칙으로 판단.
+    1) 이전 질문이 없으면 새 주제  2) 지시 표현으로 시작하면 follow-up
+    3) 직전 질문과의 임베딩 cosine 유사도가 follow_up_similarity 이상이면 follow-up, new_topic_similarity 이하면 새 주제
+    """
+    config = settings["heuristics"]
+    if not previous_questions:
+        return FollowUpHint(False, "no_history")
+    if lexical_follow_up(question):
+        return FollowUpHint(True, "marker")
+    if embeddings is None:
+        return FollowUpHint(None, "no_embeddings")
+
+    # aembed_query는 캐시/micro-batch를 거치므로 retrieve 노드의 쿼리 임베딩과 중복 계산되지 않음
+    current, previous = await asyncio.gather(
+        embeddings.aembed_query(question),
+        embeddings.aembed_query(previous_questions[-1]),
+    )
+    similarity = cosine(current, previous)
+    if similarity >= config["follow_up_similarity"]:
+        return FollowUpHint(True, "similar", similarity)
+    if similarity <= config["new_topic_similarity"]:
+        return FollowUpHint(False, "dissimilar", similarity)
+    return FollowUpHint(None, "ambiguous", similarity)
@@ -0,0 +1,239 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.logger import get_logger
+from .departments import canonical_department
+
+logger = get_logger(__name__)
+
+# 청크 metadata에 함께 저장하는 증분 색인용 키
+DOC_KEY_FIELD = "doc_key"
+HASH_FIELD = "content_hash"
+
+
+def iter_records(path: Path) -> Iterator[Dict]:
+    """JSONL을 한 줄씩 읽음 (코퍼스 전체를 메모리에 올리지 않음)"""
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping invalid JSON at line {line_no}: {e}")
+
+
+def record_to_document(item: Dict) -> Tuple[str, str, Dict]:
+    """
+    크롤링 결과(file_name/department/url/date)와 평가 코퍼스(doc_id/url/captured_at) 두 형식을
+    서비스가 쓰는 metadata(file_name, department, url, date)로 맞춤.
+    반환: (문서 고유 키, 본문, metadata)
+    """
+    text = item.get("text") or item.get("content") or item.get("page_content") or ""
+    doc_key = str(item.get("doc_id") or item.get("file_name") or item.get("url") or "")
+    metadata = {
+        "file_name": item.get("file_name") or item.get("title"),
+        "department": item.get("department"),
+        "url": item.get("url"),
+        "date": item.get("date") or item.get("captured_at"),
+        "source_type": item.get("source_type"),
+        "doc_id": item.get("doc_id"),
+    }
+    # Chroma metadata는 None 값을 저장할 수 없음
+    return doc_key, text, {k: v for k, v in metadata.items() if v is not None}
+
+
+def content_hash(text: str, metadata: Dict) -> str:
+    """본문 + metadata가 같으면 같은 값. 바뀐 문서만 다시 임베딩하는 기준"""
+    payload = json.dumps({"text": text, "metadata": metadata}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def corpus_version(hashes: Dict[str, str]) -> str:
+    """문서 키별 해시 전체로 만든 코퍼스 버전 (답변 캐시/BM25 인덱스 무효화에 사용)"""
+    digest = hashlib.sha256()
+    for doc_key in sorted(hashes):
+        digest.update(f"{doc_key}\0{hashes[doc_key]}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def iter_chunk_metadata(collection, batch_size: int = 5000) -> Iterator[Tuple[str, Dict]]:
+    """collection의 (청크 id, metadata)를 batch_size씩 나눠 읽음"""
+    offset = 0
+    while True:
+        batch = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+        if not batch["ids"]:
+            break
+        yield from zip(batch["ids"], (metadata or {} for metadata in batch["metadatas"]))
+        offset += len(batch["ids"])
+
+
+def existing_documents(collection, batch_size: int = 5000) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    collection에 이미 있는 문서의 (문서 키 -> content hash), (문서 키 -> 청크 id 목록).
+    예전 방식으로 넣어서 문서 키가 없는 청크는 "" 키로 모음 (이번 코퍼스에 없으므로 삭제 대상)
+    """
+    hashes: Dict[str, str] = {}
+    chunk_ids: Dict[str, List[str]] = {}
+    for chunk_id, metadata in iter_chunk_metadata(collection, batch_size):
+        doc_key = metadata.get(DOC_KEY_FIELD, "")
+        chunk_ids.setdefault(doc_key, []).append(chunk_id)
+        if doc_key and HASH_FIELD in metadata:
+            hashes[doc_key] = metadata[HASH_FIELD]
+    return hashes, chunk_ids
+
+
+@dataclass
+class IngestReport:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    chunks_embedded: int = 0
+    chunks_deleted: int = 0
+    version: Optional[str] = None
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.deleted)
+
+
+class Ingestor:
+    """
+    content hash 기반 증분 색인.
+    새 문서/바뀐 문서만 청크로 나눠 batch_size 단위로 임베딩해서 upsert하고,
+    코퍼스에서 사라진 문서의 청크는 삭제한다. 비용은 코퍼스 크기가 아니라 변경분에 비례.
+    """
+
+    def __init__(self, collection, embeddings, splitter, batch_size: int = 64, dry_run: bool = False):
+        self.collection = collection
+        self.embeddings = embeddings
+        self.splitter = splitter
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self._pending: List[Tuple[str, str, Dict]] = []
+
+    def run(self, records: Iterable[Dict]) -> IngestReport:
+        report = IngestReport()
+        old_hashes, old_chunk_ids = existing_documents(self.collection)
+        seen: Dict[str, str] = {}
+
+        for item in records:
+            doc_key, text, metadata = record_to_document(item)
+            if not doc_key or not text.strip():
+                report.skipped += 1
+                continue
+            if doc_key in seen:
+                logger.warning(f"Duplicate document key {doc_key!r}; keeping the first occurrence")
+                report.skipped += 1
+                continue
+
+            digest = content_hash(text, metadata)
+            seen[doc_key] = digest
+            if old_hashes.get(doc_key) == digest:
+                report.unchanged += 1
+                continue
+
+            if doc_key in old_chunk_ids:
+                # 청크 수가 달라질 수 있으므로 예전 청크를 지우고 새로 넣음
+                report.updated += 1
+                report.chunks_deleted += self._delete(old_chunk_ids[doc_key])
+            else:
+                report.added += 1
+
+            metadata = {**metadata, DOC_KEY_FIELD: doc_key, HASH_FIELD: digest}
+            for index, chunk in enumerate(self.splitter.split_text(text)):
+                self._pending.append((f"{doc_key}:{index}", chunk, metadata))
+                if len(self._pending) >= self.batch_size:
+                    report.chunks_embedded += self._flush()
+
+        report.chunks_embedded += self._flush()
+
+        for doc_key, ids in old_chunk_ids.items():
+            if doc_key not in seen:
+                report.deleted += 1
+                report.chunks_deleted += self._delete(ids)
+
+        report.version = corpus_version(seen)
+        return report
+
+    def _flush(self) -> int:
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        if not self.dry_run:
+            ids, texts, metadatas = (list(column) for column in zip(*batch))
+            self.collection.upsert(
+                ids=ids,
+                documents=texts,
+                metadatas=metadatas,
+                embeddings=self.embeddings.embed_documents(texts),
+            )
+        return len(batch)
+
+    def _delete(self, ids: List[str]) -> int:
+        if ids and not self.dry_run:
+            self.collection.delete(ids=ids)
+        return len(ids)
+
+
+def sync_partitions(collection, partitions: Dict[str, Any], batch_size: int = 5000, dry_run: bool = False) -> Dict[str, int]:
+    """
+    전체 collection 기준으로 학과별 collection(partitions: 대표 학과명 -> collection)을 맞춤.
+    없거나 content hash가 다른 청크는 전체 collection의 임베딩을 그대로 복사하고(다시 임베딩하지 않음),
+    학과가 바뀌었거나 삭제된 청크는 지운다. 기존 단일 collection을 partitioned로 처음 바꿀 때도 이것으로 채움.
+    반환: {"copied": n, "deleted": n}
+    """
+    expected: Dict[str, Dict[str, str]] = {department: {} for department in partitions}
+    for chunk_id, metadata in iter_chunk_metadata(collection, batch_size):
+        department = canonical_department(metadata.get("department"))
+        if department in expected:
+            expected[department][chunk_id] = metadata.get(HASH_FIELD, "")
+
+    copied = deleted = 0
+    for department, partition in partitions.items():
+        present = {chunk_id: metadata.get(HASH_FIELD, "") for chunk_id, metadata in iter_chunk_metadata(partition, batch_size)}
+        wanted = expected[department]
+        stale = [chunk_id for chunk_id in present if chunk_id not in wanted]
+        missing = [chunk_id for chunk_id, digest in wanted.items() if present.get(chunk_id) != digest]
+        copied += len(missing)
+        deleted += len(stale)
+        if dry_run:
+            continue
+        if stale:
+            partition.delete(ids=stale)
+        for start in range(0, len(missing), batch_size):
+            batch = collection.get(
+                ids=missing[start:start + batch_size], include=["embeddings", "documents", "metadatas"]
+            )
+            partition.upsert(
+                ids=batch["ids"],
+                embeddings=batch["embeddings"],
+                documents=batch["documents"],
+                metadatas=batch["metadatas"],
+            )
+        if missing or stale:
+            logger.info(f"[partitions] {department}: copied {len(missing)}, deleted {len(stale)} chunks")
+    return {"copied": copied, "deleted": deleted}
+
+
+def write_manifest(path: Path, report: IngestReport, source: str, **extra) -> Dict:
+    """벡터DB 폴더의 manifest.json (components.read_corpus_version이 version을 읽음)"""
+    manifest = {
+        "version": report.version,
+        "source": source,
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "documents": report.added + report.updated + report.unchanged,
+        "last_run": asdict(report),
+        **extra,
+    }
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return manifest
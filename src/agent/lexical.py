@@ -0,0 +1,126 @@
+import pickle
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from rank_bm25 import BM25Okapi
+
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"[가-힣]+|[a-z0-9]+(?:[-_.@][a-z0-9]+)*")
+_SEPARATOR = re.compile(r"[-_.@]")
+
+# 명사 뒤에 붙는 조사 (긴 것부터 매칭)
+_JOSA = sorted(
+    [
+        "에서는", "으로는", "에게서", "까지는", "부터는",
+        "에서", "으로", "에게", "한테", "까지", "부터", "께서", "이나", "이랑", "처럼", "보다", "마다",
+        "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "나", "랑",
+    ],
+    key=len,
+    reverse=True,
+)
+
+
+def _strip_josa(token: str) -> str:
+    for josa in _JOSA:
+        if token.endswith(josa) and len(token) - len(josa) >= 2:
+            return token[: -len(josa)]
+    return token
+
+
+def tokenize_korean(text: str) -> List[str]:
+    """
+    형태소 분석기 없이 쓰는 BM25용 한국어 토크나이저.
+    - 한글 어절: 조사 제거한 어간 + 글자 bigram (띄어쓰기가 달라도 '수강신청'/'수강 신청'이 매칭되도록)
+    - 영문/숫자: 과목코드, TOPCIT, 전화번호, 이메일은 통째로 + 구분자로 나눈 조각
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    tokens: List[str] = []
+
+    for token in _TOKEN.findall(text):
+        if "가" <= token[0] <= "힣":
+            stem = _strip_josa(token)
+            tokens.append(stem)
+            if len(stem) > 2:
+                tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+        else:
+            tokens.append(token)
+            parts = _SEPARATOR.split(token)
+            if len(parts) > 1:
+                tokens.extend(part for part in parts if part)
+
+    return tokens
+
+
+class LexicalIndex:
+    """Chroma collection과 같은 문서(id/본문/metadata)로 만든 BM25 인덱스. pickle로 저장/로드"""
+
+    def __init__(self, ids: List[str], contents: List[str], metadatas: List[Dict], version: Optional[str] = None):
+        self.ids = ids
+        self.contents = contents
+        self.metadatas = metadatas
+        self.version = version
+        self.departments = np.asarray([(m or {}).get("department") or "" for m in metadatas], dtype=object)
+        self.bm25 = BM25Okapi([tokenize_korean(content) for content in contents]) if contents else None
+
+    @classmethod
+    def from_collection(cls, collection, batch_size: int = 5000, version: Optional[str] = None) -> "LexicalIndex":
+        ids, contents, metadatas = [], [], []
+        offset = 0
+        while True:
+            batch = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+            if not batch["ids"]:
+                break
+            ids.extend(batch["ids"])
+            contents.extend(batch["documents"])
+            metadatas.extend(m or {} for m in batch["metadatas"])
+            offset += len(batch["ids"])
+
+        logger.info(f"Building BM25 index over {len(ids)} documents")
+        return cls(ids, contents, metadatas, version=version)
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "LexicalIndex":
+        with Path(path).open("rb") as f:
+            return pickle.load(f)
+
+    def search(self, query: str, k: int = 10, filter: Optional[dict] = None) -> List[Document]:
+        """BM25 점수 상위 k개 문서. filter는 Chroma와 같은 {"department": {"$in": [...]}} 형식"""
+        tokens = tokenize_korean(query)
+        if self.bm25 is None or not tokens:
+            return []
+
+        scores = self.bm25.get_scores(tokens)
+        allowed = self._allowed_departments(filter)
+        if allowed is not None:
+            scores = np.where(np.isin(self.departments, allowed), scores, -np.inf)
+
+        top = np.argsort(scores)[::-1][:k]
+        return [
+            Document(id=self.ids[i], page_content=self.contents[i], metadata=self.metadatas[i])
+            for i in top
+            if scores[i] > 0
+        ]
+
+    @staticmethod
+    def _allowed_departments(filter: Optional[dict]) -> Optional[Sequence[str]]:
+        if not filter:
+            return None
+        condition = filter.get("department")
+        if isinstance(condition, dict):
+            return list(condition.get("$in", []))
+        return [condition]
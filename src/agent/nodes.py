@@ -1,16 +1,31 @@
-import re
 from typing import Literal
-from langchain_core.messages import SystemMessage, HumanMessage, RemoveMessage
+from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from src.agent.state import CustomState
-from src.agent.utils import initialize_components, detect_language
-from src.agent.prompts import HITL_PROMPT, SYSTEM_PROMPT
+from src.agent.components import components
+from src.agent.context import ContextBuilder
+from src.agent.heuristics import detect_language, follow_up_hint
+from src.agent.departments import DEPARTMENTS
+from src.agent.retrieval import search_documents, speculation_stats
+from src.agent.prompts import HITL_PROMPT, SYSTEM_PROMPT, ROUTER_PROMPT
+from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.metrics import CONTEXT_SAVED_TOKENS
 
 logger = get_logger(__name__)
-model, store, retriever_tool = initialize_components()
 
 
-def language_detection_node(state: CustomState):
+def _answer_cache_enabled(config: RunnableConfig) -> bool:
+    """설정에서 켜져 있고, 요청에서 bypass_cache를 지정하지 않았을 때만 답변 캐시 사용"""
+    bypass = (config or {}).get("configurable", {}).get("bypass_cache", False)
+    return settings["answer_cache"]["enabled"] and not bypass
+
+
+def _answer_cache_scope(state: CustomState, department) -> tuple:
+    return (department or "", state.get("language", "ko"), components.corpus_version)
+
+
+async def language_detection_node(state: CustomState):
     logger.info(">>> [NODE] language_detection_node START")
     last_msg = state.get("messages")[-1]
     text = str(last_msg.content)
@@ -19,120 +34,81 @@ def language_detection_node(state: CustomState):
     return {"language": state["language"]}
 
 
-def generate_query_or_response_node(state: CustomState):
-    logger.info(">>> [NODE] generate_query_or_response_node START")
+async def route_question_node(state: CustomState):
+    """follow-up 여부, 검색 질의 재작성, 질문 적절성, 관련 학과를 한 번의 구조화 출력 호출로 판단"""
+    logger.info(">>> [NODE] route_question_node START")
     messages = state.get("messages")
     current_question = messages[-1].content  # 현재 사용자 질문
     prev_department = state.get("current_department")
+    previous_questions = list(state.get("follow_up_chain") or [])
+
+    hint = None
+    if settings["heuristics"]["enabled"]:
+        hint = await follow_up_hint(current_question, previous_questions, components.embeddings)
+        logger.info(f"follow-up heuristic: {hint}")
+
+    # 직전 턴이 적절한 질문이었을 때만 적절성을 이어받음 (부적절한 질문의 follow-up은 라우터 LLM이 다시 판단)
+    if hint is not None and hint.is_follow_up and state.get("question_appropriate"):
+        # 🔹 분명한 follow-up은 라우터 LLM 호출 없이 처리 (학과 유지)
+        # 검색 질의는 체인의 첫 질문(마지막 독립 질문)과 결합해서 follow-up이 이어져도 길어지지 않음
+        rewritten = current_question if hint.rule == "similar" else f"{previous_questions[0]} {current_question}"
+        follow_up_chain = previous_questions + [rewritten]
+        logger.info(f"Follow-up 판단(규칙: {hint.rule}): YES, 검색 질의: {rewritten}")
+        return {
+            "follow_up": True,
+            "question_appropriate": True,
+            "question_reason": None,
+            "follow_up_chain": follow_up_chain,
+            "current_department": prev_department,
+        }
 
-    if state.get("follow_up_chain") is None:
-        state["follow_up_chain"] = []
-    
-    # 🔹 현재 질문을 체인에 append    
-    state["follow_up_chain"].append(current_question)
-    logger.info(f"현재 질문 append 후 follow_up_chain: {state['follow_up_chain']}")
-    
-    is_follow_up = False
-    # 🔹 체인이 2개 이상일 때만 follow-up 판단
-    if len(state["follow_up_chain"]) > 1:
-        previous_questions = " / ".join(state["follow_up_chain"][:-1])
-    
-        followup_prompt = (
-            "너는 공주대학교 정보를 안내하는 챗봇이다.\n"
-            f"현재 질문: {current_question}\n"
-            f"이전 질문들: {previous_questions}\n"
-            f"관련 학과: {prev_department}\n"
-            
-            "현재 질문이 follow-up인지 판단하여 반드시 영문 yes/no 둘중에 하나로만 답하세요.\n"
-            
-            "판단 기준:\n"
-            "- 동일한 대상/행사/문서 등에 대한 추가 질문이면 follow-up\n"
-            "- '그럼, 그거, 그러면'처럼 이전 질문을 지시하면 follow-up\n"
-            "- 질문 대상이나 주제가 바뀌면 follow-up 아님\n"
-        )
-        followup_response = model.invoke([SystemMessage(content=followup_prompt)])
-        followup_text = followup_response.content.strip().lower()
-        is_follow_up = followup_text.startswith("yes")
-        
-        if is_follow_up:
-            # 🔹 FOLLOW-UP 처리: 체인 유지, question_appropriate True
-            state["follow_up"] = True
-            logger.info(f"Follow-up 판단: YES, follow_up_chain 유지: {state['follow_up_chain']}")
-
-            # 🔹 FOLLOW-UP 질문 재작성 (체인 기반)
-            combined_question = " / ".join(state["follow_up_chain"])
-            rewrite_prompt = (
-                f"이전 질문들을 참고하여, 마지막 질문을 자연스럽게 검색하기 적합한 한 문장으로 바꾸세요.\n"
-                f"{combined_question}"
-            )
-            rewritten = model.invoke([SystemMessage(content=rewrite_prompt)]).content.strip()
-            state["follow_up_chain"][-1] = rewritten  # 마지막 질문을 재작성
-            logger.info(f"Follow-up 질문 재작성: {rewritten}")
-
-            state["question_appropriate"] = True
-            state["question_reason"] = None
-            return {
-                "follow_up": state["follow_up"],
-                "question_appropriate": state["question_appropriate"],
-                "follow_up_chain": list(state.get("follow_up_chain", []))
-            }
-        else:
-            # 연관 없는 새 질문이면 follow-up False, 체인 초기화 후 현재 질문만 남김
-            state["follow_up"] = False
-            state["follow_up_chain"] = [current_question]
-            logger.info(f"Follow-up 판단: NO, follow_up_chain 초기화 후 상태: {state['follow_up_chain']}")
-
-        logger.info(f"Follow-up 판단 결과: {is_follow_up}, 체인 상태: {state['follow_up_chain']}")
-   
-
-    # 🔹 질문 적절성 판단 (follow-up이 아니면)
-    appropriateness_prompt = (
-        "너는 공주대학교 정보를 알려주는 챗봇입니다.\n"
-        f"사용자 질문: {current_question}\n"
-        "아래 기준을 바탕으로 현재 사용자 질문이 검색 가능한 문서로 답변 가능한지 판단하세요.\n\n"
-
-        "### 판단 기준\n" 
-        "1) 검색 가능한 문서 범위 내에서 답변 가능한 질문이면 'yes'입니다.\n"
-        "   단, 부서가 명시적으로 적혀있지 않으면 'no'입니다.\n"
-
-        "2) 검색 가능한 문서 범위는 다음과 같습니다.\n"
-        "   - 공주대학교 통합 수강신청/장학/비자/논문/순환버스\n"
-        "   - 학과별 교수님(연락처, 이메일 등)/교과과정표/공지사항/자료/서식/규정\n"
-        "   - SW사업단 소개/공지사항/소식/대회일정(TOPCIT, SW알고리즘 경진대회 등)\n"
-
-        "3) 개인정보 포함 여부는 적절성 판단 기준이 아닙니다.\n"
-        "   위 판단 기준으로 답이 가능한지 여부만 고려하세요.\n\n"
-
-        "### 출력 형식\n"
-        "- 첫 줄: 반드시 영어 'yes' 또는 'no'로 시작 (대소문자 혼용 금지)\n"
-        "- 둘째 줄: 판단 이유 1~2문장\n"
-        "  - yes일 때: 사용자 질문에 대하여 왜 검색이 가능한지 설명합니다.\n"
-        "  - no일 때: 사용자 질문에 대하여 왜 검색을 진행 못하는지 설명합니다. (질문이 불명확한 이유)\n"
+    # 분명한 새 주제면 이전 질문을 넘기지 않음 (라우터는 적절성/학과만 판단)
+    new_topic = hint is not None and hint.is_follow_up is False
+    router_prompt = ROUTER_PROMPT.format(
+        question=current_question,
+        previous_questions="없음" if new_topic else " / ".join(previous_questions) or "없음",
+        department=prev_department or "없음",
+        departments=", ".join(DEPARTMENTS),
     )
-    response = model.invoke([SystemMessage(content=appropriateness_prompt)])
-    raw_text = response.content.strip()
-    
-    # 🔹 Regex로 yes/no 체크
-    match = re.match(r"^(yes|no)", raw_text.lower())
-    if match:
-        if match.group(1) == "no":
-            state["question_appropriate"] = False
-            state["question_reason"] = raw_text[len(match.group(1)):].strip()
-        else:
-            state["question_appropriate"] = True
-            state["question_reason"] = None
-    else:
-        logger.warning("LLM 출력이 예상 형식과 다릅니다. 기본값 no 처리")
-        state["question_appropriate"] = False
-        state["question_reason"] = "LLM 출력 형식 오류"
+    try:
+        decision = await components.router.ainvoke([SystemMessage(content=router_prompt)])
+    except Exception as e:
+        logger.warning(f"라우터 출력이 예상 형식과 다릅니다. 기본값 no 처리: {e}")
+        return {
+            "follow_up": False,
+            "question_appropriate": False,
+            "question_reason": "LLM 출력 형식 오류",
+            "follow_up_chain": [current_question],
+        }
 
-    logger.info(f"follow_up_chain: {state['follow_up_chain']}")
-    logger.info(f"question_appropriate: {state['question_appropriate']}, reason: {state.get('question_reason')}")
+    # 🔹 이전 질문이 있을 때만 follow-up 인정
+    is_follow_up = bool(previous_questions) and not new_topic and decision.is_follow_up
+
+    if is_follow_up:
+        # 🔹 FOLLOW-UP 처리: 체인 유지, 마지막 질문을 재작성, question_appropriate True
+        rewritten = decision.search_query.strip() or current_question
+        follow_up_chain = previous_questions + [rewritten]
+        # FOLLOW-UP이면 이전 학과 유지, 재예측 금지
+        department = prev_department or decision.department
+        question_appropriate = True
+        question_reason = None
+        logger.info(f"Follow-up 판단: YES, 질문 재작성: {rewritten}")
+    else:
+        # 연관 없는 새 질문이면 체인 초기화 후 현재 질문만 남김
+        follow_up_chain = [current_question]
+        question_appropriate = decision.question_appropriate
+        question_reason = None if question_appropriate else decision.reason.strip()
+        department = decision.department if question_appropriate else prev_department
+        logger.info("Follow-up 판단: NO, follow_up_chain 초기화")
+
+    logger.info(f"follow_up_chain: {follow_up_chain}, department: {department}")
+    logger.info(f"question_appropriate: {question_appropriate}, reason: {question_reason}")
     return {
-        "follow_up": state.get("follow_up", False),
-        "question_appropriate": state["question_appropriate"],
-        "question_reason": state.get("question_reason", None),
-        "follow_up_chain": list(state.get("follow_up_chain", []))
+        "follow_up": is_follow_up,
+        "question_appropriate": question_appropriate,
+        "question_reason": question_reason,
+        "follow_up_chain": follow_up_chain,
+        "current_department": department,
     }
 
 
@@ -147,66 +123,50 @@ def route_before_retrieval_node(state: CustomState) -> Literal["retrieve", "rewr
 
 
 
-def retrieve_documents_node(state: CustomState, max_docs: int = 3):
-    logger.info(">>> [NODE] retrieve_documents_node START")
-    messages = state.get("messages")
-    #query = messages[-1].content
-    query = state['follow_up_chain'][-1].strip()
-    follow_up = state.get("follow_up", False)
-    logger.info(f"retrieve_documents_node: follow_up={follow_up}, current_department={state.get('current_department')}")
-
-    # 학과 후보 리스트
-    departments = [
-        "소프트웨어학과",
-        "컴퓨터공학과",
-        "공주대학교",
-        "공주대학교 SW중심대학사업단",
-        "SW중심대학사업단",
-        "스마트정보기술공학과",
-        "인공지능학부",
-        # "공주대학교 현장실습지원센터"
-    ]
-    
-    # 2) alias 매핑 (여기서 OR 조건 처리)
-    alias_map = {
-        "공주대학교 SW중심대학사업단": ["공주대학교 SW중심대학사업단", "SW중심대학사업단"],
-        "SW중심대학사업단": ["공주대학교 SW중심대학사업단", "SW중심대학사업단"],
-    }
-
+def _resolve_department(query_vector, follow_up: bool, routed_department):
+    """검색에 쓸 학과: follow-up이면 이전 학과 유지, 아니면 임베딩 분류 결과 (애매하면 라우터 LLM이 고른 학과)"""
+    if follow_up and routed_department:
+        # FOLLOW-UP이면 이전 학과 유지, 재예측 금지
+        logger.info(f"Follow-up이므로 이전 학과 유지: {routed_department}")
+        return routed_department, None
 
-    # FOLLOW-UP이면 이전 학과 유지, 재예측 금지
-    if follow_up and state.get("current_department"):
-        predicted_department = state["current_department"]
-        logger.info(f"Follow-up이므로 이전 학과 유지: {predicted_department}")
-    else:
-        dept_prompt = (
-            f"사용자 질문: {query}\n"
-            f"질문을 보고 아래 목록 중에서 관련 학과/부서를 하나 선택하세요:\n"
-            f"반드시 목록 중 하나를 그대로 출력하세요.\n"
-            f"목록: {', '.join(departments)}"
-        )
-        dept_response = model.invoke([SystemMessage(content=dept_prompt)])
-        predicted_department = dept_response.content.strip()
-        logger.info(f"Predicted department: {predicted_department}")
-
-    state["current_department"] = predicted_department
-    
-    # 🔹 쿼리 확장
-    last_question = state['follow_up_chain'][-1]
-    extended_query = last_question.strip()
-    logger.info(f"검색용 extended_query (마지막 질문 기준): {extended_query}")
-    
-    # store에서 검색
-    if predicted_department in departments:
-        aliases = alias_map.get(predicted_department, [predicted_department])
-        filter_expr = {"department": {"$in": aliases}}
-        logger.info(f"Using filter: {filter_expr}")
-        docs = store.similarity_search(extended_query, k=max_docs, filter=filter_expr)
-    else:
-        logger.info("Predicted department not recognized. Running search without filter.")
-        docs = store.similarity_search(extended_query, k=max_docs)
+    prediction = components.department_classifier.predict(query_vector)
+    logger.info(
+        f"Embedding department prediction: {prediction.department} "
+        f"(score={prediction.score:.3f}, margin={prediction.margin:.3f}, confident={prediction.confident})"
+    )
+    if prediction.confident:
+        return prediction.department, prediction.department
+    # 애매하면 라우터 LLM이 고른 학과 사용
+    logger.info(f"Ambiguous prediction. Using routed department: {routed_department}")
+    return routed_department, None
+
+
+async def _retrieve(
+    state: CustomState,
+    config: RunnableConfig,
+    query: str,
+    query_vector,
+    department,
+    max_docs: int,
+    speculative: bool = False,
+):
+    # 🔹 답변 캐시 조회 (hit이면 검색과 답변 생성 LLM 호출을 모두 생략)
+    # 선행 검색의 조회는 채택될 때만 통계에 반영 (adopt_speculation), 턴마다 hit/miss는 한 번만 집계
+    if _answer_cache_enabled(config):
+        scope = _answer_cache_scope(state, department)
+        entry = components.answer_cache.lookup(query, query_vector, scope, count=not speculative)
+        if entry is not None:
+            logger.info(f"Answer cache hit: {entry.key} ({components.answer_cache.stats()})")
+            return {
+                "documents": entry.documents,
+                "current_department": department,
+                "cached_answer": entry.answer,
+            }
 
-    state["documents"] = [
+    # store에서 검색 (dense + BM25 hybrid)
+    docs = await search_documents(query, query_vector, department, k=max_docs)
+    documents = [
         {
             "content": d.page_content,
             "metadata": {
@@ -218,13 +178,87 @@ def retrieve_documents_node(state: CustomState, max_docs: int = 3):
         }
         for d in docs
     ]
-    
-    logger.info(f"Retrieved {len(docs)} documents for query: {extended_query}")
-    return {"documents": state["documents"], "current_department": state.get("current_department")}
+    logger.info(f"Retrieved {len(docs)} documents for query: {query}")
+    return {"documents": documents, "current_department": department, "cached_answer": None}
+
+
+async def retrieve_documents_node(state: CustomState, config: RunnableConfig, max_docs: int = 3):
+    logger.info(">>> [NODE] retrieve_documents_node START")
+    follow_up = state.get("follow_up", False)
+    logger.info(f"retrieve_documents_node: follow_up={follow_up}, current_department={state.get('current_department')}")
+
+    # 🔹 쿼리 확장
+    last_question = state['follow_up_chain'][-1]
+    extended_query = last_question.strip()
+    logger.info(f"검색용 extended_query (마지막 질문 기준): {extended_query}")
+
+    # 쿼리 임베딩은 한 번만 계산해서 학과 분류와 검색에 같이 사용
+    query_vector = await components.embeddings.aembed_query(extended_query)
+    department, _ = _resolve_department(query_vector, follow_up, state.get("current_department"))
+    return await _retrieve(state, config, extended_query, query_vector, department, max_docs)
+
+
+async def speculative_retrieve_node(state: CustomState, config: RunnableConfig, max_docs: int = 3):
+    """
+    route_question(LLM)과 동시에 현재 질문 그대로 검색해 둠.
+    새 주제로 판단되면 검색 질의가 같으므로 결과를 그대로 쓰고, 재작성/부적절 판정이면 버림 (adopt_speculation)
+    """
+    logger.info(">>> [NODE] speculative_retrieve_node START")
+    query = str(state["messages"][-1].content).strip()
+    query_vector = await components.embeddings.aembed_query(query)
+    # 라우터 결과를 모르므로 학과가 애매하면 이전 학과로 추측
+    department, classified = _resolve_department(query_vector, False, state.get("current_department"))
+    result = await _retrieve(state, config, query, query_vector, department, max_docs, speculative=True)
+    cache_scope = _answer_cache_scope(state, department) if _answer_cache_enabled(config) else None
+    return {"speculation": {"query": query, "classified_department": classified, "cache_scope": cache_scope, **result}}
+
+
+def adopt_speculation_node(state: CustomState):
+    """라우터 판단 결과와 비교해 선행 검색 결과를 채택(hit)하거나 버림(miss / discarded)"""
+    logger.info(">>> [NODE] adopt_speculation_node START")
+    speculation = state.get("speculation") or {}
+    follow_up = state.get("follow_up")
+
+    if not follow_up and not state.get("question_appropriate"):
+        outcome = "discarded"
+    else:
+        # retrieve_documents_node가 골랐을 학과와 검색 질의가 같아야 결과가 같음
+        routed_department = state.get("current_department")
+        if follow_up and routed_department:
+            expected_department = routed_department
+        else:
+            expected_department = speculation.get("classified_department") or routed_department
+        same_query = speculation.get("query") == state["follow_up_chain"][-1].strip()
+        same_department = speculation.get("current_department") == expected_department
+        outcome = "hit" if same_query and same_department else "miss"
+
+    speculation_stats.record(outcome)
+    logger.info(f"Speculative retrieval {outcome} ({speculation_stats.stats()})")
+    if speculation.get("cache_scope") is not None:
+        # 선행 검색의 답변 캐시 조회는 채택될 때만 hit/miss로 집계
+        if outcome == "hit":
+            components.answer_cache.record(speculation["cached_answer"] is not None)
+        else:
+            # 버려진 조회의 벡터는 답변 저장에 쓰이지 않음 (다시 검색하면 retrieve에서 새로 조회)
+            components.answer_cache.discard_pending(speculation["query"], tuple(speculation["cache_scope"]))
+    if outcome != "hit":
+        return {"speculation": {"outcome": outcome}}
+    return {
+        "documents": speculation["documents"],
+        "current_department": speculation["current_department"],
+        "cached_answer": speculation["cached_answer"],
+        "speculation": {"outcome": outcome},
+    }
 
 
+def route_after_speculation_node(state: CustomState) -> Literal["generate", "retrieve", "rewrite_question"]:
+    outcome = (state.get("speculation") or {}).get("outcome")
+    if outcome == "hit":
+        return "generate"
+    return "retrieve" if outcome == "miss" else "rewrite_question"
 
-def rewrite_question_node(state: CustomState):
+
+async def rewrite_question_node(state: CustomState):
     logger.info(">>> [NODE] rewrite_question_node START")
     if state.get("question_appropriate"):
         return {"messages": state.get("messages")}
@@ -244,15 +278,24 @@ def rewrite_question_node(state: CustomState):
     )
     
     # AI메세지 추가
-    response = model.invoke([SystemMessage(content=prompt)])
+    response = await components.model.ainvoke([SystemMessage(content=prompt)])
     state.get("messages").append(response)
     logger.info("Rewritten question/feedback added.")
 
-    return {"messages": state.get("messages")}
+    # 검색하지 않은 턴이므로 이전 턴의 문서(출처)는 비움
+    return {"messages": state.get("messages"), "documents": []}
 
 
-def generation_node(state: CustomState):
+async def generation_node(state: CustomState, config: RunnableConfig):
     logger.info(">>> [NODE] generation_node START")
+
+    # 캐시 hit이면 LLM 호출 없이 저장된 답변 사용
+    cached_answer = state.get("cached_answer")
+    if cached_answer:
+        logger.info("Answer cache hit. Skipping LLM generation.")
+        state.get("messages").append(AIMessage(content=cached_answer))
+        return {"messages": state.get("messages")}
+
     language = state.get("language", "ko")
     documents = state.get("documents", [])
     summarization = state.get("summarization", "")
@@ -260,16 +303,16 @@ def generation_node(state: CustomState):
     #last_msg = state.get("messages")[-1]
     last_question = state['follow_up_chain'][-1]
     
-    # 문서 내용 그대로 전달 + 개행 유지 + 문서 사이 빈 줄 추가
-    docs_text = "\n\n---\n\n".join([
-        f"[검색된 문서 {i+1}]\n\n"
-        f"본문 내용:\n{d['content']}\n\n"
-        f"제목:\n{d.get('metadata', {}).get('file_name', '')}\n\n"
-        f"부서:\n{d.get('metadata', {}).get('department', '')}\n\n"
-        f"작성일:\n{d.get('metadata', {}).get('date', '')}\n\n"
-        f"출처:\n{d.get('metadata', {}).get('url', '')}\n"
-        for i, d in enumerate(documents)
-    ])
+    # 관련도 순으로 토큰 예산 안에 문서를 채우고 중복 문서는 제외 (개행 유지 + 문서 사이 구분선)
+    context = ContextBuilder.from_settings().build(documents)
+    # 프롬프트에는 잘린 본문(context.text)을 넣고, 출처와 답변 캐시에는 같은 문서의 원본을 사용
+    documents = context.sources
+    docs_text = context.text
+    CONTEXT_SAVED_TOKENS.inc(context.saved_tokens)
+    logger.info(
+        f"Context: {context.tokens}/{context.original_tokens} tokens (saved {context.saved_tokens}), "
+        f"duplicates={context.duplicates}, truncated={context.truncated}, dropped={context.dropped}"
+    )
     
     # 시스템 메시지 생성
     system_message = SYSTEM_PROMPT.format(
@@ -280,20 +323,16 @@ def generation_node(state: CustomState):
     )
 
     # LLM 호출
-    response = model.invoke([SystemMessage(content=system_message)])
+    response = await components.model.ainvoke([SystemMessage(content=system_message)])
     state.get("messages").append(response)
-    
-    return {"messages": state.get("messages")}
-
-
 
-def summarization_node(state: CustomState):
-    logger.info(">>> [NODE] summarization_node START")
-    messages = state.get("messages")
-    summary_prompt = "대화를 요약하세요:\n" + "\n".join([msg.content for msg in messages])
-    response = model.invoke([SystemMessage(content=summary_prompt)])
-
-    delete_msgs = [RemoveMessage(id=msg.id) for msg in messages[:-8]]
-    state["summarization"] = str(response.content).strip()
-    logger.info("Conversation summarized.")
-    return {"summarization": state["summarization"], "messages": delete_msgs}
\ No newline at end of file
+    if _answer_cache_enabled(config):
+        scope = _answer_cache_scope(state, state.get("current_department"))
+        # 답변 캐시는 모든 thread가 공유하므로, 이전 대화(요약, follow-up 재작성 질의)가 반영된 답변은 저장하지 않음
+        if summarization or state.get("follow_up"):
+            components.answer_cache.discard_pending(last_question, scope)
+        else:
+            components.answer_cache.put(last_question, scope, str(response.content), documents)
+    
+    # 출처는 실제로 프롬프트에 들어간 문서만 표시
+    return {"messages": state.get("messages"), "documents": documents}
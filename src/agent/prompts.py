@@ -5,22 +5,15 @@ SYSTEM_PROMPT = (
     "{documents}\n\n"
 
     "중요: 아래 규칙을 반드시 지키세요.\n"
-    "- {documents} 내부의 줄바꿈, 문단 구조, 리스트, 공백, 문서 번호는 절대 수정하지 말 것\n"
-    "- 문서 본문의 텍스트를 요약하거나 압축하거나 한 줄로 합치지 말 것\n"
-    "- 문서 내용은 원본 포맷 그대로 출력할 것\n\n"
+    "- 답변 본문만 작성할 것\n"
+    "- 검색된 문서 목록이나 문서 본문을 다시 출력하지 말 것 (출처는 답변 아래에 따로 표시됩니다)\n\n"
 
     # 첫 번째 문단
     "'{input}에 대한 답변은 다음과 같습니다.'\n\n"
 
     # 두 번째 문단
     "질문과 가장 연관된 문서를 참고하여 명확하게 답변을 작성하세요.\n"
-    "작성일을 고려하고, 반복되는 교과과정 같은 정보도 답변에 포함시키세요.\n\n"
-
-    # 세 번째 문단
-    "'검색된 문서는 다음과 같습니다.'\n\n"
-
-    # 네 번째 문단
-    "위에서 제공한 문서 목록을 원본 그대로 다시 출력하세요.\n"
+    "작성일을 고려하고, 반복되는 교과과정 같은 정보도 답변에 포함시키세요.\n"
 )
 
 
@@ -49,3 +42,48 @@ HITL_PROMPT = (
     "Answer in {language}. If 'ko', use Korean. If 'en', use English."
     "Do not answer anything else."
 )
+
+ROUTER_PROMPT = (
+    "너는 공주대학교 정보를 안내하는 챗봇이다.\n"
+    "현재 질문: {question}\n"
+    "이전 질문들: {previous_questions}\n"
+    "관련 학과: {department}\n\n"
+
+    "아래 기준에 따라 현재 질문을 한 번에 판단하세요.\n\n"
+
+    "### 1. follow-up 판단 (is_follow_up)\n"
+    "- 이전 질문이 없으면 항상 false\n"
+    "- 동일한 대상/행사/문서 등에 대한 추가 질문이면 follow-up\n"
+    "- '그럼, 그거, 그러면'처럼 이전 질문을 지시하면 follow-up\n"
+    "- 질문 대상이나 주제가 바뀌면 follow-up 아님\n\n"
+
+    "### 2. 검색 질의 (search_query)\n"
+    "- follow-up이면 이전 질문들을 참고하여, 현재 질문을 자연스럽게 검색하기 적합한 한 문장으로 바꾸세요.\n"
+    "- follow-up이 아니면 현재 질문을 그대로 쓰세요.\n\n"
+
+    "### 3. 질문 적절성 판단 (question_appropriate, reason)\n"
+    "1) 검색 가능한 문서 범위 내에서 답변 가능한 질문이면 true입니다.\n"
+    "   단, 부서가 명시적으로 적혀있지 않으면 false입니다. (follow-up이면 이전 질문의 부서를 따릅니다.)\n"
+    "2) 검색 가능한 문서 범위는 다음과 같습니다.\n"
+    "   - 공주대학교 통합 수강신청/장학/비자/논문/순환버스\n"
+    "   - 학과별 교수님(연락처, 이메일 등)/교과과정표/공지사항/자료/서식/규정\n"
+    "   - SW사업단 소개/공지사항/소식/대회일정(TOPCIT, SW알고리즘 경진대회 등)\n"
+    "3) 개인정보 포함 여부는 적절성 판단 기준이 아닙니다.\n"
+    "   위 판단 기준으로 답이 가능한지 여부만 고려하세요.\n"
+    "- reason: 판단 이유 1~2문장\n"
+    "  - true일 때: 사용자 질문에 대하여 왜 검색이 가능한지 설명합니다.\n"
+    "  - false일 때: 사용자 질문에 대하여 왜 검색을 진행 못하는지 설명합니다. (질문이 불명확한 이유)\n\n"
+
+    "### 4. 관련 학과/부서 (department)\n"
+    "- 질문을 보고 아래 목록 중에서 관련 학과/부서를 하나 선택하세요.\n"
+    "- 목록: {departments}\n"
+)
+
+SUMMARY_PROMPT = (
+    "너는 공주대학교 안내 챗봇의 대화 요약 담당이다.\n"
+    "아래의 [기존 요약]에 [새 대화] 내용을 반영해서 갱신된 요약만 출력하세요.\n"
+    "- 사용자가 관심을 가진 학과/부서, 질문 대상, 이미 안내한 핵심 정보(일정, 연락처 등)를 유지하세요.\n"
+    "- 더 이상 필요 없는 세부 내용은 줄이고 5문장 이내로 작성하세요.\n\n"
+    "[기존 요약]\n{summary}\n\n"
+    "[새 대화]\n{conversation}\n"
+)
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.metrics import SEARCH_SECONDS
+from .components import components
+from .departments import canonical_department, department_filter
+from .utils import run_in_executor
+
+logger = get_logger(__name__)
+
+
+def _document_key(document: Document) -> str:
+    if document.id:
+        return str(document.id)
+    return hashlib.sha1(document.page_content.encode("utf-8")).hexdigest()
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[Document]], k: int = 60) -> List[Document]:
+    """여러 검색 결과 순위를 RRF(1 / (k + rank))로 합산해 하나의 순위로 합침"""
+    scores = {}
+    documents = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = _document_key(document)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, document)
+
+    ordered = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [documents[key] for key in ordered]
+
+
+async def search_documents(
+    query: str,
+    query_vector: Sequence[float],
+    department: Optional[str],
+    k: int = 3,
+) -> List[Document]:
+    """
+    dense(bge-m3) 검색과 BM25 검색을 같은 학과 필터로 실행하고 RRF로 합친 상위 k개 문서.
+    학과 전용 collection이 있으면 dense 검색은 그 collection에서 실행.
+    BM25 인덱스가 없거나 hybrid가 꺼져 있으면 dense 검색만 사용.
+    """
+    config = settings["retrieval"]
+    filter_expr = department_filter(department)
+    # vectorstore.layout=partitioned면 학과 전용 collection을 필터 없이 검색 (다른 학과 문서 수와 무관한 지연)
+    canonical = canonical_department(department)
+    partition = components.partitions.get(canonical)
+    if partition is not None:
+        store, dense_filter = partition, None
+        logger.info(f"Using partition: {canonical}")
+    elif filter_expr:
+        store, dense_filter = components.store, filter_expr
+        logger.info(f"Using filter: {filter_expr}")
+    else:
+        store, dense_filter = components.store, None
+        logger.info("Predicted department not recognized. Running search without filter.")
+
+    lexical_index = components.lexical_index if config["hybrid"] else None
+    fetch_k = max(config["fetch_k"], k) if lexical_index else k
+
+    with SEARCH_SECONDS.labels("dense").time():
+        dense = await run_in_executor(
+            store.similarity_search_by_vector, query_vector, k=fetch_k, filter=dense_filter
+        )
+    if lexical_index is None:
+        return dense[:k]
+
+    with SEARCH_SECONDS.labels("bm25").time():
+        sparse = await run_in_executor(lexical_index.search, query, k=fetch_k, filter=filter_expr)
+    fused = reciprocal_rank_fusion([dense, sparse], k=config["rrf_k"])
+    logger.info(f"Hybrid search: dense={len(dense)}, bm25={len(sparse)}, fused={len(fused)}")
+    return fused[:k]
+
+
+class SpeculationStats:
+    """
+    선행 검색(retrieval.speculative) 결과 집계.
+    hit: 결과 사용, miss: 검색 질의/학과가 달라 다시 검색, discarded: 부적절 판정으로 버림
+    """
+
+    OUTCOMES = ("hit", "miss", "discarded")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self) -> Dict[str, float]:
+        total = sum(self.counts.values())
+        wasted = self.counts["miss"] + self.counts["discarded"]
+        return {**self.counts, "waste_rate": round(wasted / total, 3) if total else 0.0}
+
+
+speculation_stats = SpeculationStats()
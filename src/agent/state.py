@@ -1,14 +1,29 @@
 from typing import Any, Dict, List, Optional, Literal
 from langgraph.graph import MessagesState
+from pydantic import BaseModel, Field
+
+from src.agent.departments import Department
 
 
 class CustomState(MessagesState):
     profile: Optional[Dict[str, Any]]
     summarization: Optional[str]          # 이전 대화 요약
+    summary_cursor: Optional[str]         # 요약에 반영된 마지막 메시지 id
     documents: List[Dict]                 # 마지막 질문으로 벡터DB에서 검색된 문서만 저장
     language: Literal["ko", "en"]
     question_appropriate: Optional[bool]  # 질문 적절성 판단
     question_reason: Optional[str]        # 질문 판단 이유
     current_department: Optional[str] = None   # 현재 대화 주제와 관련된 학과
     follow_up: Optional[bool] = None           # follow-up 여부
-    follow_up_chain: List[str] = []            # follow-up 질문 누적 체인
\ No newline at end of file
+    follow_up_chain: List[str] = []            # follow-up 질문 누적 체인
+    cached_answer: Optional[str] = None        # 답변 캐시 hit 시 저장된 답변
+    speculation: Optional[Dict] = None         # 선행 검색 결과 / 채택 여부 (retrieval.speculative)
+
+
+class RouteDecision(BaseModel):
+    """라우터 LLM의 구조화 출력 (follow-up/재작성/적절성/학과를 한 번에 판단)"""
+    is_follow_up: bool = Field(description="현재 질문이 이전 질문들의 follow-up이면 true")
+    search_query: str = Field(description="follow-up이면 이전 질문들을 반영해 검색하기 적합한 한 문장으로 재작성한 질문, 아니면 현재 질문 그대로")
+    question_appropriate: bool = Field(description="검색 가능한 문서 범위 내에서 답변 가능한 질문이면 true")
+    reason: str = Field(description="적절성 판단 이유 1~2문장")
+    department: Department = Field(description="질문과 관련된 학과/부서")
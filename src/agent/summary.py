@@ -0,0 +1,132 @@
+import asyncio
+from typing import AsyncContextManager, Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.messages import RemoveMessage, SystemMessage
+
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..core.metrics import NODE_SECONDS, MetricsCallbackHandler
+from .components import components
+from .prompts import SUMMARY_PROMPT
+from .utils import count_tokens as default_count_tokens
+
+logger = get_logger(__name__)
+
+ROLE_NAMES = {"human": "사용자", "ai": "챗봇"}
+
+
+def pending_messages(messages: List, cursor: Optional[str]) -> List:
+    """요약에 아직 반영되지 않은 메시지 (cursor 메시지 이후)"""
+    if cursor:
+        for i, message in enumerate(messages):
+            if message.id == cursor:
+                return messages[i + 1:]
+    return list(messages)
+
+
+def format_conversation(messages: List) -> str:
+    return "\n".join(
+        f"{ROLE_NAMES.get(message.type, message.type)}: {message.content}"
+        for message in messages
+        if message.type in ROLE_NAMES
+    )
+
+
+async def summarize_thread(
+    graph,
+    thread_id: str,
+    trigger_tokens: Optional[int] = None,
+    keep_messages: Optional[int] = None,
+    count_tokens: Callable[[str], int] = default_count_tokens,
+) -> bool:
+    """
+    새로 쌓인 대화가 trigger_tokens를 넘으면 기존 요약에 새 메시지만 합쳐서 요약을 갱신하고,
+    요약된 메시지 중 최근 keep_messages개를 제외한 나머지를 state에서 삭제. 요약했으면 True
+    """
+    config = settings["summary"]
+    trigger_tokens = trigger_tokens or config["trigger_tokens"]
+    keep_messages = keep_messages or config["keep_messages"]
+    graph_config = {"configurable": {"thread_id": thread_id}}
+
+    state = await graph.aget_state(graph_config)
+    messages = state.values.get("messages", [])
+    new_messages = pending_messages(messages, state.values.get("summary_cursor"))
+    conversation = format_conversation(new_messages)
+    if not conversation or count_tokens(conversation) <= trigger_tokens:
+        return False
+
+    logger.info(f"[summary] summarizing {len(new_messages)} new messages of thread {thread_id}")
+    prompt = SUMMARY_PROMPT.format(
+        summary=state.values.get("summarization") or "없음",
+        conversation=conversation,
+    )
+    # 그래프 밖에서 실행되므로 요약 LLM 호출/토큰과 실행 시간을 summarize 노드로 직접 기록
+    llm_config = {"callbacks": [MetricsCallbackHandler()], "metadata": {"langgraph_node": "summarize"}}
+    with NODE_SECONDS.labels("summarize").time():
+        response = await components.model.ainvoke([SystemMessage(content=prompt)], config=llm_config)
+
+        await graph.aupdate_state(
+            graph_config,
+            {
+                "summarization": str(response.content).strip(),
+                "summary_cursor": messages[-1].id,
+                "messages": [RemoveMessage(id=message.id) for message in messages[:-keep_messages]],
+            },
+            as_node="generate",
+        )
+    return True
+
+
+class SummaryScheduler:
+    """
+    응답을 보낸 뒤 백그라운드에서 요약을 실행.
+    같은 thread의 다음 턴은 wait()로 진행 중인 요약이 끝난 뒤 시작해서 state 갱신이 겹치지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        graph,
+        limiter: Optional[Callable[[], AsyncContextManager]] = None,
+        on_summarized: Optional[Callable[[str], Awaitable]] = None,
+        **summary_kwargs,
+    ):
+        self.graph = graph
+        # LLM 모델별 동시 실행 제한 (TurnScheduler.model_slot). 요약도 채팅 턴과 같은 한도를 나눠 씀
+        self.limiter = limiter
+        # 요약으로 메시지가 삭제된 뒤 호출 (thread 목록 인덱스의 메시지 수 갱신)
+        self.on_summarized = on_summarized
+        self.summary_kwargs = summary_kwargs
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, thread_id: str):
+        previous = self._tasks.get(thread_id)
+        task = asyncio.get_running_loop().create_task(self._run(thread_id, previous))
+        self._tasks[thread_id] = task
+        task.add_done_callback(lambda done: self._forget(thread_id, done))
+
+    def _forget(self, thread_id: str, task: asyncio.Task):
+        if self._tasks.get(thread_id) is task:
+            del self._tasks[thread_id]
+
+    async def _run(self, thread_id: str, previous: Optional[asyncio.Task]):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            if self.limiter is None:
+                summarized = await summarize_thread(self.graph, thread_id, **self.summary_kwargs)
+            else:
+                async with self.limiter():
+                    summarized = await summarize_thread(self.graph, thread_id, **self.summary_kwargs)
+            if summarized and self.on_summarized is not None:
+                await self.on_summarized(thread_id)
+        except Exception as e:
+            logger.error(f"[summary] failed to summarize thread {thread_id}: {e}")
+
+    async def wait(self, thread_id: str):
+        task = self._tasks.get(thread_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def drain(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
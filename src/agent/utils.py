@@ -1,58 +1,61 @@
+import asyncio
+import contextvars
+import functools
+import os
+import resource
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 import tiktoken
-from langchain_openai import ChatOpenAI
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
-from langchain_classic.tools.retriever import create_retriever_tool
 
 from ..core.config import settings
 from ..core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 임베딩 인코딩(bge-m3)과 Chroma 검색처럼 CPU를 쓰는 blocking 작업 전용 executor.
+# 이벤트 루프와 FastAPI 기본 threadpool을 막지 않도록 크기를 제한해서 따로 둔다.
+_executor = ThreadPoolExecutor(
+    max_workers=settings["embedding"].get("max_workers", 2),
+    thread_name_prefix="embedding",
+)
 
-def initialize_components():
-    model = ChatOpenAI(
-        model=settings["llm"]["model"],
-        api_key=settings["openai_api_key"],
-        temperature=settings["llm"]["temperature"],
-        max_retries=settings["llm"]["retry"]
-    )
 
-    hf_embeddings = HuggingFaceEmbeddings(
-        model_name=settings["embedding"]["model"]
-    )
+async def run_in_executor(func, *args, **kwargs):
+    """blocking 함수를 bounded executor에서 실행하고 결과를 await (request id 등 contextvar 유지)"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, functools.partial(context.run, func, *args, **kwargs))
 
-    store = Chroma(
-        persist_directory="/app/src/agent/chatbot_db",
-        embedding_function=hf_embeddings,
-    )
 
-    retriever = store.as_retriever(
-        search_type="mmr",
-        search_kwargs={"k": 2, "fetch_k":10, "lambda_mult":0.5}
-    )
+def current_rss_bytes() -> int:
+    """현재 프로세스의 RSS(bytes). /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
 
-    retriever_tool = create_retriever_tool(
-        name="retrieve_kongju_national_university_info",
-        description="Search and return information about 국립공주대학교",
-        retriever=retriever,
-    )
 
-    return model, store, retriever_tool
+@functools.lru_cache(maxsize=None)
+def get_encoding() -> "tiktoken.Encoding":
+    """설정된 LLM의 tiktoken encoding (한 번만 로드)"""
+    return tiktoken.encoding_for_model(settings["llm"]["model"])
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text))
 
 
 def detect_language(text: str, threshold: float = 0.6) -> Literal["ko", "en"]:
     if not text or not text.strip():
         return "ko"
 
-    encoding = tiktoken.encoding_for_model(settings["llm"]["model"])
+    encoding = get_encoding()
     tokens = encoding.encode(text)
     total_len = len(tokens)
 
     korean_count = 0
-    for token in tokens:
-        decoded = encoding.decode_single_token_bytes(token)
+    for decoded in encoding.decode_tokens_bytes(tokens):
         piece = decoded.decode("utf-8", errors="ignore")
         if any("가" <= char <= "힣" for char in piece):
             korean_count += 1
@@ -1,18 +1,29 @@
+import asyncio
+import time
 import uuid
-from typing import List, Optional
+from contextlib import aclosing
+from typing import List, Literal, Optional
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig
 
 from src.api.schema.chat import (
     ChatRequest,
     ChatResponse,
     Message,
-    ThreadSummary,
+    Source,
     ThreadListResponse,
     ThreadDetailResponse
 )
+from src.api.coalesce import write_follower_turn
+from src.api.scheduler import Overloaded, Ticket
+from src.api.streaming import EventStreamResponse
+from src.core.config import settings
+from src.core.logger import get_logger, request_id_var
+from src.core.metrics import FIRST_CHUNK_SECONDS, STREAM_RESUMES, MetricsCallbackHandler
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -26,27 +37,36 @@ def generate_thread_id() -> str:
     return str(uuid.uuid4())
 
 
-def get_config(thread_id: str) -> RunnableConfig:
+def get_config(thread_id: str, bypass_cache: bool = False) -> RunnableConfig:
     """Create a RunnableConfig with the given thread_id"""
     return {
         "configurable": {
-            "thread_id": thread_id
-        }
+            "thread_id": thread_id,
+            "bypass_cache": bypass_cache,
+        },
+        # 노드별 실행 시간 / LLM 토큰 수 계측 (턴마다 새 handler)
+        "callbacks": [MetricsCallbackHandler()],
+        "metadata": {"request_id": request_id_var.get()},
     }
 
 
+def _message_role(msg) -> Optional[str]:
+    """API에 보여 줄 메시지의 role (user / ai). 그 외 메시지는 None"""
+    msg_type = getattr(msg, "type", None) or getattr(msg, "role", None)
+    if msg_type in ("human", "user"):
+        return "user"
+    if msg_type in ("ai", "assistant"):
+        return "ai"
+    return None
+
+
 def format_messages(messages: List) -> List[Message]:
     """Convert LangGraph messages to API Message format"""
     formatted = []
     for msg in messages:
         # Determine role
-        msg_type = getattr(msg, "type", None) or getattr(msg, "role", None)
-
-        if msg_type in ("human", "user"):
-            role = "user"
-        elif msg_type in ("ai", "assistant"):
-            role = "ai"
-        else:
+        role = _message_role(msg)
+        if role is None:
             # Skip system messages or other types
             continue
 
@@ -69,43 +89,83 @@ def format_messages(messages: List) -> List[Message]:
     return formatted
 
 
-def get_thread_metadata(graph, thread_id: str) -> Optional[ThreadSummary]:
-    """Extract metadata for a specific thread"""
+async def _before_turn(app_state, thread_id: str):
+    """같은 thread의 백그라운드 요약이 진행 중이면 끝날 때까지 대기"""
+    summarizer = getattr(app_state, "summarizer", None)
+    if summarizer is not None:
+        await summarizer.wait(thread_id)
+
+
+async def _start_turn(graph, app_state, payload: ChatRequest, thread_id: str):
+    """
+    턴 실행 권한을 받고(같은 thread는 도착 순서대로, 넘치면 429 + Retry-After) 턴 시작 전 작업을 수행.
+    반환: (실행 권한 또는 None, coalescing 키)
+    """
+    ticket = None
+    scheduler = getattr(app_state, "scheduler", None)
+    if scheduler is not None:
+        model = settings["llm"]["model"]
+        coalescer = getattr(app_state, "coalescer", None)
+        if (
+            coalescer is not None
+            and not payload.thread_id
+            and coalescer.attachable(coalescer.key(payload.question, payload.bypass_cache))
+        ):
+            # 같은 질문으로 실행 중인 그래프에 합류할 새 대화는 LLM을 호출하지 않으므로 모델 슬롯 없이 실행 권한만 받음
+            model = None
+        try:
+            ticket = await scheduler.acquire(thread_id, model)
+        except Overloaded as e:
+            raise HTTPException(429, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+
     try:
-        config = get_config(thread_id)
-        state = graph.get_state(config)
+        await _before_turn(app_state, thread_id)
+        # 같은 thread의 이전 턴이 끝난 뒤에 state를 읽어야 새 대화 여부가 정확함
+        coalesce_key = await _coalesce_key(graph, app_state, payload, thread_id)
+    except BaseException:
+        if ticket is not None:
+            await ticket.release()
+        raise
+    return ticket, coalesce_key
 
-        if not state or not state.values:
-            return None
 
-        messages = state.values.get("messages", [])
-        message_count = len(messages)
-
-        # Get last message content
-        last_message = None
-        if messages:
-            last_msg = messages[-1]
-            last_message = getattr(last_msg, "content", None)
-            if last_message and len(last_message) > 100:
-                last_message = last_message[:100] + "..."
-
-        # Get timestamps
-        created_at = None
-        updated_at = None
-        if hasattr(state, "created_at") and state.created_at:
-            created_at = state.created_at.isoformat() if hasattr(state.created_at, "isoformat") else str(state.created_at)
-        if hasattr(state, "updated_at") and state.updated_at:
-            updated_at = state.updated_at.isoformat() if hasattr(state.updated_at, "isoformat") else str(state.updated_at)
-
-        return ThreadSummary(
-            thread_id=thread_id,
-            message_count=message_count,
-            last_message=last_message,
-            created_at=created_at,
-            updated_at=updated_at
-        )
-    except Exception:
-        return None
+async def _index_thread(graph, app_state, thread_id: str):
+    """턴이 끝난(또는 중간에 취소되어 정리된) 뒤의 메시지로 thread 목록 인덱스 갱신 (실패해도 답변에는 영향 없음)"""
+    thread_index = getattr(app_state, "thread_index", None)
+    if thread_index is not None:
+        try:
+            state = await graph.aget_state(get_config(thread_id))
+            if state and state.values:
+                await thread_index.record(thread_id, state.values.get("messages", []))
+        except Exception as e:
+            logger.warning(f"[threads] failed to index thread {thread_id}: {e}")
+
+
+async def _finish_turn(graph, app_state, thread_id: str):
+    """응답을 보낸 뒤 thread 목록 인덱스를 갱신하고 대화 요약을 백그라운드로 예약 (실패해도 답변에는 영향 없음)"""
+    await _index_thread(graph, app_state, thread_id)
+
+    summarizer = getattr(app_state, "summarizer", None)
+    if summarizer is not None:
+        summarizer.schedule(thread_id)
+
+
+async def _record_abandoned_turn(graph, config: RunnableConfig, partial_answer: str):
+    """
+    클라이언트 연결이 끊겨 중간에 취소된 턴의 state 정리.
+    질문만 저장되고 답변이 없으면 보낸 데까지의 답변을 abandoned 표시와 함께 저장한다
+    (다음 턴의 대화 맥락에서 질문/답변 순서가 유지되도록). 대화 요약은 예약하지 않음.
+    """
+    try:
+        state = await graph.aget_state(config)
+        messages = state.values.get("messages", []) if state and state.values else []
+        if not messages or getattr(messages[-1], "type", None) != "human":
+            return
+        answer = AIMessage(content=partial_answer, response_metadata={"abandoned": True})
+        await graph.aupdate_state(config, {"messages": [answer]}, as_node="generate")
+        logger.info(f"[stream] recorded abandoned turn for thread {config['configurable']['thread_id']}")
+    except Exception as e:
+        logger.warning(f"[stream] failed to record abandoned turn: {e}")
 
 
 def _graph_input(question: str) -> dict:
@@ -114,67 +174,188 @@ def _graph_input(question: str) -> dict:
     }
 
 
-async def _generate_streaming_answer(graph, question: str, config, thread_id: str):
-    """
-    stream_mode='values' 를 사용해서 state["messages"][-1].content를 스트리밍.
-    프론트엔드가 기대하는 형식으로 응답.
-    """
-    import json
-    from datetime import datetime
+# 사용자에게 보여지는 답변을 만드는 노드들 (그 외 노드의 내부 LLM 호출은 스트리밍하지 않음)
+ANSWER_NODES = ("generate", "rewrite_question")
 
-    # 1. 시작 이벤트 전송
-    start_event = {
-        "type": "start",
-        "thread_id": thread_id,
-        "timestamp": datetime.now().astimezone().isoformat()
-    }
-    yield f"data: {json.dumps(start_event)}\n\n".encode("utf-8")
 
-    last_text = ""
+def _message_text(message) -> str:
+    """메시지(또는 청크)의 content를 문자열로 변환"""
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    # content block 리스트 형태 대응
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content
+    )
+
 
+def format_sources(documents: List[dict], include_content: bool = False) -> List[Source]:
+    """state["documents"]를 출처 블록으로 변환 (LLM이 문서를 다시 출력하지 않도록 서버에서 직접 렌더링)"""
+    sources = []
+    for document in documents or []:
+        metadata = document.get("metadata", {})
+        sources.append(Source(
+            file_name=metadata.get("file_name"),
+            department=metadata.get("department"),
+            date=metadata.get("date"),
+            url=metadata.get("url"),
+            content=document.get("content") if include_content else None,
+        ))
+    return sources
+
+
+async def _stream_events(graph, question: str, config: RunnableConfig):
+    """
+    ("chunk", 텍스트) 와 ("sources", 문서 목록) 이벤트를 생성.
+    stream_mode='messages' 로 답변 노드의 LLM 토큰을 생성되는 즉시 전달하고 (라우팅 등 다른 노드의 LLM 호출은 걸러냄),
+    'updates' 로 이번 턴에 검색된 문서를 받아 답변이 끝난 뒤 출처로 전달한다.
+    중간에 취소되거나 닫히면 그래프 실행(진행 중인 LLM 요청 포함)을 멈추고 이번 턴의 state를 정리한다.
+    """
+    documents = None
+    answer = []
+    started = time.perf_counter()
     try:
-        astream = graph.astream(
+        async with aclosing(graph.astream(
             _graph_input(question),
             config=config,
-            stream_mode="values",
-        )
+            stream_mode=["messages", "updates"],
+        )) as astream:
+            async for mode, payload in astream:
+                if mode == "updates":
+                    for update in payload.values():
+                        if isinstance(update, dict) and "documents" in update:
+                            documents = update["documents"]
+                    continue
+
+                message, metadata = payload
+                if metadata.get("langgraph_node") not in ANSWER_NODES:
+                    continue
+
+                # 토큰 청크(AIMessageChunk) 또는 스트리밍되지 않은 완성 메시지(AIMessage)만 전달
+                if getattr(message, "type", None) not in ("ai", "AIMessageChunk"):
+                    continue
+
+                text = _message_text(message)
+                if text:
+                    if not answer:
+                        FIRST_CHUNK_SECONDS.observe(time.perf_counter() - started)
+                    answer.append(text)
+                    yield "chunk", text
+    except (asyncio.CancelledError, GeneratorExit):
+        await _record_abandoned_turn(graph, config, "".join(answer))
+        raise
 
-        async for state in astream:
-            # 1) state는 dict 형태의 전체 상태여야 함
-            if not isinstance(state, dict):
-                continue
+    if documents:
+        yield "sources", documents
 
-            messages = state.get("messages") or []
-            if not messages:
-                continue
 
-            last = messages[-1]
+async def _stream_answer(graph, question: str, config: RunnableConfig):
+    """답변 텍스트 청크만 전달"""
+    async for kind, value in _stream_events(graph, question, config):
+        if kind == "chunk":
+            yield value
 
-            # 2) 마지막 메시지가 assistant/ai인지 확인
-            role = getattr(last, "role", None) or getattr(last, "type", None)
-            if role not in ("assistant", "ai"):
-                continue
 
-            # 3) content 꺼내기
-            content = getattr(last, "content", None)
-            if not content:
-                continue
+async def _coalesce_key(graph, app_state, payload: ChatRequest, thread_id: str) -> Optional[str]:
+    """새 대화의 첫 질문이면 coalescing 키, 아니면 None (이전 대화 맥락이 있으면 같은 질문이라도 답이 다름)"""
+    coalescer = getattr(app_state, "coalescer", None)
+    if coalescer is None:
+        return None
+    if payload.thread_id:
+        state = await graph.aget_state(get_config(thread_id))
+        if state and state.values:
+            return None
+    return coalescer.key(payload.question, payload.bypass_cache)
 
-            # 4) 직전까지 보낸 텍스트와 비교해서 새로 추가된 부분만 전송
-            new_part = content[len(last_text):]
-            if not new_part:
-                continue
 
-            last_text = content
+async def _turn_events(
+    graph, question: str, config: RunnableConfig, thread_id: str, app_state=None, coalesce_key=None,
+    ticket: Optional[Ticket] = None,
+):
+    """
+    _stream_events와 같은 이벤트.
+    coalesce_key가 있으면 같은 질문으로 실행 중인 그래프에 합류하고 (없으면 이 요청이 실행),
+    합류한 요청은 끝난 뒤 실행 결과를 자기 thread에 따로 저장한다.
+    합류한 요청은 LLM을 호출하지 않으므로 모델 슬롯을 바로 반납한다 (ticket).
+    """
+    if coalesce_key is None:
+        async with aclosing(_stream_events(graph, question, config)) as events:
+            async for event in events:
+                yield event
+        return
 
-            # 청크 이벤트 전송
-            chunk_event = {
-                "type": "chunk",
-                "content": new_part,
-                "timestamp": datetime.now().astimezone().isoformat()
-            }
-            yield f"data: {json.dumps(chunk_event)}\n\n".encode("utf-8")
+    async def finalize():
+        return (await graph.aget_state(config)).values
+
+    async def produce():
+        if ticket is not None and ticket.model is None:
+            # 합류하려던 flight가 그 사이 끝나서 직접 실행하게 됨: 모델 슬롯을 기다렸다가 실행
+            await ticket.acquire_model(settings["llm"]["model"])
+        async with aclosing(_stream_events(graph, question, config)) as events:
+            async for event in events:
+                yield event
+
+    flight, leader = app_state.coalescer.join(coalesce_key, produce, finalize)
+    if not leader and ticket is not None:
+        await ticket.release_model()
+    # 모든 구독자가 떠나면 flight의 그래프 실행도 취소됨 (한 명이라도 남아 있으면 계속 실행)
+    async with aclosing(flight.subscribe()) as events:
+        async for event in events:
+            yield event
+    if not leader:
+        await write_follower_turn(graph, thread_id, question, flight.values)
+
+
+async def _generate_streaming_answer(
+    graph, question: str, config, thread_id: str, app_state=None, include_source_content: bool = False,
+    coalesce_key: Optional[str] = None, ticket: Optional[Ticket] = None,
+):
+    """
+    답변 노드의 LLM 토큰을 chunk 이벤트로 바로 스트리밍.
+    프론트엔드가 기대하는 형식으로 응답.
+    """
+    import json
+    from datetime import datetime
 
+    # 1. 시작 이벤트 전송
+    start_event = {
+        "type": "start",
+        "thread_id": thread_id,
+        "request_id": request_id_var.get(),
+        "timestamp": datetime.now().astimezone().isoformat()
+    }
+    yield f"data: {json.dumps(start_event)}\n\n".encode("utf-8")
+
+    try:
+        async with aclosing(
+            _turn_events(graph, question, config, thread_id, app_state, coalesce_key, ticket)
+        ) as events:
+            async for kind, value in events:
+                if kind == "sources":
+                    # 출처 이벤트 전송 (문서마다 하나씩)
+                    for index, source in enumerate(format_sources(value, include_source_content)):
+                        source_event = {
+                            "type": "source",
+                            "index": index,
+                            **source.model_dump(exclude_none=True),
+                            "timestamp": datetime.now().astimezone().isoformat()
+                        }
+                        yield f"data: {json.dumps(source_event)}\n\n".encode("utf-8")
+                    continue
+
+                # 청크 이벤트 전송
+                chunk_event = {
+                    "type": "chunk",
+                    "content": value,
+                    "timestamp": datetime.now().astimezone().isoformat()
+                }
+                yield f"data: {json.dumps(chunk_event)}\n\n".encode("utf-8")
+
+    except (asyncio.CancelledError, GeneratorExit):
+        # 연결이 끊겨 취소된 턴도 질문과 abandoned 답변이 저장되므로 인덱스 갱신
+        await _index_thread(graph, app_state, thread_id)
+        raise
     except Exception as e:
         # 에러 이벤트 전송
         error_event = {
@@ -192,13 +373,46 @@ async def _generate_streaming_answer(graph, question: str, config, thread_id: st
     }
     yield f"data: {json.dumps(end_event)}\n\n".encode("utf-8")
 
+    await _finish_turn(graph, app_state, thread_id)
+
+
+# Server-Sent Events (SSE)
+def _resume_stream(replay, last_event_id: str, payload: ChatRequest) -> EventStreamResponse:
+    """Last-Event-ID 재연결: 그래프를 다시 실행하지 않고 진행 중(또는 막 끝난) 턴의 다음 이벤트부터 전송"""
+    buffer, after = replay.find(last_event_id)
+    if buffer is None or (payload.thread_id and payload.thread_id != buffer.thread_id):
+        STREAM_RESUMES.labels("expired").inc()
+        raise HTTPException(404, detail="이어받을 스트림이 없습니다. 질문을 다시 보내 주세요.")
+    if not buffer.can_resume(after):
+        STREAM_RESUMES.labels("expired").inc()
+        raise HTTPException(410, detail="보관 기간이 지난 이벤트라 이어받을 수 없습니다. 질문을 다시 보내 주세요.")
+
+    STREAM_RESUMES.labels("resumed").inc()
+    logger.info(f"[replay] resuming turn {buffer.turn_id} after event {after}")
+    return EventStreamResponse(
+        buffer.subscribe(after),
+        heartbeat_seconds=settings["streaming"]["heartbeat_seconds"],
+        resumable=True,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store"},
+    )
+
 
 # Server-Sent Events (SSE)
 @router.post("/stream")
 async def chat_stream(request: Request, payload: ChatRequest):
+    """
+    이벤트마다 `id: <turn_id>:<seq>` 가 붙는다. 연결이 끊긴 뒤 같은 요청을 Last-Event-ID 헤더와 함께 보내면
+    답변 생성은 그대로 이어지고 마지막으로 받은 이벤트 다음부터 다시 받는다 (질문이 thread에 중복 저장되지 않음).
+    """
     if not payload.question:
         raise HTTPException(422, detail="question 필드가 필요합니다.")
 
+    replay = getattr(request.app.state, "replay", None)
+    last_event_id = request.headers.get("last-event-id")
+    if replay is not None and last_event_id:
+        return _resume_stream(replay, last_event_id, payload)
+
     graph = getattr(request.app.state, "graph", None)
 
     if graph is None:
@@ -206,47 +420,56 @@ async def chat_stream(request: Request, payload: ChatRequest):
 
     # Generate or use existing thread_id
     thread_id = payload.thread_id or generate_thread_id()
-    config = get_config(thread_id)
+    config = get_config(thread_id, payload.bypass_cache)
+    ticket, coalesce_key = await _start_turn(graph, request.app.state, payload, thread_id)
 
-    return StreamingResponse(
-        _generate_streaming_answer(graph, payload.question, config, thread_id),
+    content = _generate_streaming_answer(
+        graph, payload.question, config, thread_id, request.app.state, payload.include_source_content,
+        coalesce_key, ticket,
+    )
+    if replay is not None:
+        # 답변 생성은 연결과 분리해 백그라운드로 실행 (실행 권한은 생성이 끝나면 반납)
+        buffer = replay.start(thread_id, content, ticket)
+        content, ticket = buffer.subscribe(), None
+
+    return EventStreamResponse(
+        content,
+        ticket=ticket,
+        heartbeat_seconds=settings["streaming"]["heartbeat_seconds"],
+        resumable=replay is not None,
         media_type="text/event-stream",
         headers={"Cache-Control": "no-store"},
     )
 
 
-async def _generate_sse_response(graph, question: str, thread_id: str, config: RunnableConfig):
+async def _generate_sse_response(
+    graph, question: str, thread_id: str, config: RunnableConfig, app_state=None, include_source_content: bool = False,
+    coalesce_key: Optional[str] = None, ticket: Optional[Ticket] = None,
+):
     """스트리밍 채팅 API (SSE)"""
     import json
-    from src.agent.prompts import USER_FOCUSED_PROMPT
 
-    last_text = ""
     try:
         # 1. 시작 이벤트
-        yield f"data: {json.dumps({'type': 'start', 'thread_id': thread_id})}\n\n"
+        yield f"data: {json.dumps({'type': 'start', 'thread_id': thread_id, 'request_id': request_id_var.get()})}\n\n"
 
         # 2. 스트리밍
-        async for chunk in graph.astream(
-            {"messages": ("user", question)},
-            config,
-            stream_mode="values",
-        ):
-            messages = chunk.get("messages")
-            if not messages:
-                continue
-
-            last = messages[-1]
-            if last.type != "ai":
-                continue
-
-            new_part = last.content[len(last_text):]
-            if new_part:
-                yield f"data: {json.dumps({'type': 'chunk', 'content': new_part})}\n\n"
-                last_text = last.content
-        
+        async with aclosing(
+            _turn_events(graph, question, config, thread_id, app_state, coalesce_key, ticket)
+        ) as events:
+            async for kind, value in events:
+                if kind == "sources":
+                    for index, source in enumerate(format_sources(value, include_source_content)):
+                        source_event = {"type": "source", "index": index, **source.model_dump(exclude_none=True)}
+                        yield f"data: {json.dumps(source_event)}\n\n"
+                    continue
+                yield f"data: {json.dumps({'type': 'chunk', 'content': value})}\n\n"
+
         # 3. 종료 이벤트
         yield f"data: {json.dumps({'type': 'end'})}\n\n"
 
+        await _finish_turn(graph, app_state, thread_id)
+
     except Exception as e:
         yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
 
@@ -262,10 +485,16 @@ async def chat_stream_sse(request: Request, payload: ChatRequest):
         raise HTTPException(500, detail="그래프가 초기화되지 않았습니다.")
 
     thread_id = payload.thread_id or generate_thread_id()
-    config = get_config(thread_id)
-
-    return StreamingResponse(
-        _generate_sse_response(graph, payload.question, thread_id, config),
+    config = get_config(thread_id, payload.bypass_cache)
+    ticket, coalesce_key = await _start_turn(graph, request.app.state, payload, thread_id)
+
+    return EventStreamResponse(
+        _generate_sse_response(
+            graph, payload.question, thread_id, config, request.app.state, payload.include_source_content,
+            coalesce_key, ticket,
+        ),
+        ticket=ticket,
+        heartbeat_seconds=settings["streaming"]["heartbeat_seconds"],
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -291,16 +520,29 @@ async def chat(request: Request, payload: ChatRequest):
 
     # Generate or use existing thread_id
     thread_id = payload.thread_id or generate_thread_id()
-    config = get_config(thread_id)
+    config = get_config(thread_id, payload.bypass_cache)
+    ticket, coalesce_key = await _start_turn(graph, request.app.state, payload, thread_id)
 
     try:
-        result = await graph.ainvoke(_graph_input(payload.question), config=config)
+        if coalesce_key is None:
+            result = await graph.ainvoke(_graph_input(payload.question), config=config)
+        else:
+            async for _ in _turn_events(
+                graph, payload.question, config, thread_id, request.app.state, coalesce_key, ticket
+            ):
+                pass
+            result = (await graph.aget_state(get_config(thread_id))).values
+        await _finish_turn(graph, request.app.state, thread_id)
     except Exception as e:
         raise HTTPException(500, detail=f"그래프 처리 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        if ticket is not None:
+            await ticket.release()
 
     messages = result.get("messages", [])[-1].content
+    sources = format_sources(result.get("documents"), payload.include_source_content)
 
-    return ChatResponse(answer=messages, thread_id=thread_id)
+    return ChatResponse(answer=messages, thread_id=thread_id, sources=sources)
 
 
 # ============================================================================
@@ -308,54 +550,62 @@ async def chat(request: Request, payload: ChatRequest):
 # ============================================================================
 
 @router.get("/threads", response_model=ThreadListResponse)
-async def get_all_threads(request: Request):
-    """Get all thread IDs and their metadata"""
-    checkpointer = getattr(request.app.state, "checkpointer", None)
-    graph = getattr(request.app.state, "graph", None)
-
-    if checkpointer is None or graph is None:
-        raise HTTPException(500, detail="Checkpointer 또는 그래프가 초기화되지 않았습니다.")
+async def get_all_threads(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: Literal["updated_at", "created_at", "message_count"] = "updated_at",
+    order: Literal["asc", "desc"] = "desc",
+):
+    """Thread 목록 조회 (thread 인덱스 기반 cursor pagination)"""
+    thread_index = getattr(request.app.state, "thread_index", None)
+
+    if thread_index is None:
+        raise HTTPException(500, detail="Thread 인덱스가 초기화되지 않았습니다.")
 
-    threads = []
-
-    # Try to access InMemorySaver's internal storage
-    if hasattr(checkpointer, "storage"):
-        thread_ids = list(checkpointer.storage.keys())
-
-        for thread_id in thread_ids:
-            metadata = get_thread_metadata(graph, thread_id)
-            if metadata:
-                threads.append(metadata)
-    else:
-        # Fallback: storage attribute not available
-        raise HTTPException(500, detail="Checkpointer가 thread 목록 조회를 지원하지 않습니다.")
+    try:
+        threads, next_cursor = await thread_index.list(limit=limit, cursor=cursor, sort=sort, order=order)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
-    return ThreadListResponse(threads=threads)
+    return ThreadListResponse(threads=threads, next_cursor=next_cursor)
 
 
 @router.get("/thread/{thread_id}", response_model=ThreadDetailResponse)
-async def get_thread_messages(thread_id: str, request: Request):
-    """Get all messages from a specific thread"""
+async def get_thread_messages(
+    thread_id: str,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+):
+    """
+    Thread의 메시지 조회 (offset/limit으로 일부만 조회 가능, limit 없으면 전체).
+    graph.aget_state 대신 checkpointer에서 최신 checkpoint만 읽고 (다음 노드/interrupt 계산 생략), 요청한 구간만 변환한다.
+    checkpoint는 저장 단위가 하나라서(sqlite backend는 channel 값 전체가 blob 하나) messages만 따로 읽을 수는 없지만,
+    대화 요약이 오래된 메시지를 삭제하므로 state의 메시지 수는 summary.keep_messages + 요약 전 새 메시지로 제한된다.
+    """
     graph = getattr(request.app.state, "graph", None)
 
     if graph is None:
         raise HTTPException(500, detail="그래프가 초기화되지 않았습니다.")
 
     try:
-        config = get_config(thread_id)
-        state = graph.get_state(config)
+        checkpoint = await graph.checkpointer.aget_tuple(get_config(thread_id))
+        values = checkpoint.checkpoint.get("channel_values") if checkpoint else None
 
-        if not state or not state.values:
+        if not values:
             raise HTTPException(404, detail=f"Thread {thread_id}를 찾을 수 없습니다.")
 
-        raw_messages = state.values.get("messages", [])
-        formatted_messages = format_messages(raw_messages)
+        visible = [message for message in values.get("messages", []) if _message_role(message)]
+        end = None if limit is None else offset + limit
 
         return ThreadDetailResponse(
             thread_id=thread_id,
-            messages=formatted_messages,
-            summarization=state.values.get("summarization"),
-            language=state.values.get("language")
+            messages=format_messages(visible[offset:end]),
+            total_messages=len(visible),
+            offset=offset,
+            summarization=values.get("summarization"),
+            language=values.get("language")
         )
     except HTTPException:
         raise
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.core.logger import get_logger
+from src.core.metrics import COALESCED_REQUESTS
+from src.agent.cache import normalize_query
+
+logger = get_logger(__name__)
+
+# follower thread에 복사하는 state 키 (메시지는 follower의 질문으로 새로 만듦)
+COPIED_FIELDS = (
+    "language",
+    "question_appropriate",
+    "question_reason",
+    "current_department",
+    "follow_up",
+    "follow_up_chain",
+    "documents",
+)
+
+
+class Flight:
+    """
+    실행 중인 그래프 1회의 이벤트 버퍼.
+    leader 실행이 이벤트를 쌓고, 구독자(leader 요청 포함)는 처음부터 다시 읽은 뒤 새 이벤트를 기다린다.
+    """
+
+    def __init__(self):
+        self.events: List[Tuple[str, Any]] = []
+        self.values: Optional[Dict] = None   # 실행이 끝난 뒤 leader thread의 최종 state
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.subscribers = 0
+        self.cancelling = False   # 구독자가 모두 떠나 실행을 취소하는 중
+        self.task: Optional[asyncio.Task] = None   # 그래프를 실행하는 백그라운드 task
+        self._waiter = asyncio.Event()
+
+    def _wake(self):
+        waiter, self._waiter = self._waiter, asyncio.Event()
+        waiter.set()
+
+    def publish(self, event: Tuple[str, Any]):
+        self.events.append(event)
+        self._wake()
+
+    def close(self, error: Optional[BaseException] = None):
+        self.error = error
+        self.done = True
+        self._wake()
+
+    async def subscribe(self) -> AsyncIterator[Tuple[str, Any]]:
+        index = 0
+        # 구독자 수는 생성기 본문에서 세야 시작되지 못하고 닫힌 구독이 flight를 붙잡지 않음
+        self.subscribers += 1
+        try:
+            while True:
+                if index < len(self.events):
+                    yield self.events[index]
+                    index += 1
+                    continue
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._waiter.wait()
+        finally:
+            self.subscribers -= 1
+            if not self.done and self.subscribers == 0 and self.task is not None:
+                # 받을 사람이 없으면 그래프 실행 취소 (취소된 턴의 state 정리가 끝날 때까지 대기)
+                self.cancelling = True
+                self.task.cancel()
+                await asyncio.wait({self.task})
+
+
+class Coalescer:
+    """
+    single-flight: 정규화된 질문이 같은 새 대화 요청이 동시에 들어오면 그래프를 한 번만 실행하고
+    나머지 요청(follower)은 같은 청크/출처 이벤트를 받는다. 실행이 끝나면 flight는 목록에서 빠진다.
+    (새 대화에는 이전 맥락이 없으므로 질문이 같으면 언어/학과/검색 결과도 같다)
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self._tasks = set()
+
+    @staticmethod
+    def key(question: str, bypass_cache: bool = False) -> str:
+        return f"{int(bypass_cache)}:{normalize_query(question)}"
+
+    def join(
+        self,
+        key: str,
+        produce: Callable[[], AsyncIterator[Tuple[str, Any]]],
+        finalize: Callable[[], Awaitable[Dict]],
+    ) -> Tuple[Flight, bool]:
+        """(flight, leader 여부). leader면 produce로 그래프를 백그라운드 실행 (leader 연결이 끊겨도 follower는 계속 받음)"""
+        if self.attachable(key):
+            flight = self._flights[key]
+            COALESCED_REQUESTS.labels("follower").inc()
+            logger.info(f"[coalesce] attached to in-flight question ({flight.subscribers + 1} subscribers)")
+            return flight, False
+
+        flight = self._flights[key] = Flight()
+        COALESCED_REQUESTS.labels("leader").inc()
+        task = flight.task = asyncio.get_running_loop().create_task(self._run(flight, produce, finalize))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # 시작 전에 취소되어 _run이 실행되지 않은 경우에도 목록에서 빠지도록 done callback에서 정리
+        task.add_done_callback(lambda _: self._forget(key, flight))
+        return flight, True
+
+    def attachable(self, key: str) -> bool:
+        """같은 질문으로 실행 중인 flight에 합류할 수 있는지 (구독자가 모두 떠나 취소 중인 flight에는 합류하지 않음)"""
+        flight = self._flights.get(key)
+        return flight is not None and not flight.cancelling
+
+    def _forget(self, key: str, flight: Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _run(self, flight: Flight, produce, finalize):
+        try:
+            async for event in produce():
+                flight.publish(event)
+            flight.values = await finalize()
+            flight.close()
+        except Exception as e:
+            logger.error(f"[coalesce] flight failed: {e}")
+            flight.close(e)
+        except asyncio.CancelledError:
+            logger.info("[coalesce] all subscribers disconnected, flight cancelled")
+            raise
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+
+async def write_follower_turn(graph, thread_id: str, question: str, values: Dict):
+    """leader 실행 결과를 follower thread의 checkpoint로 저장 (질문은 follower가 보낸 원문)"""
+    answer = values["messages"][-1].content
+    update = {field: values[field] for field in COPIED_FIELDS if field in values}
+    update["messages"] = [HumanMessage(content=question), AIMessage(content=answer)]
+    await graph.aupdate_state({"configurable": {"thread_id": thread_id}}, update, as_node="generate")
@@ -7,15 +7,24 @@ logging.basicConfig(
 )
 """
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
-from langgraph.checkpoint.memory import InMemorySaver
 
 from src.core.config import settings
-from src.api import chat
+from src.api import chat, metrics
+from src.api.coalesce import Coalescer
+from src.api.replay import ReplayRegistry
+from src.api.scheduler import TurnScheduler
+from src.api.threads import ThreadIndex
+from src.agent.checkpointer import create_checkpointer, sweep_checkpointer
 from src.agent.graph import build_graph
+from src.agent.summary import SummaryScheduler
+from src.agent.components import components
+from src.agent.utils import run_in_executor
 
 NAME = settings["app"]["name"]
 VERSION = settings["app"]["version"]
@@ -25,14 +34,48 @@ VERSION = settings["app"]["version"]
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Starting server initialization...")
-    checkpointer = InMemorySaver()
+    # LLM, 임베딩 모델(bge-m3), Chroma를 한 번만 만들고 더미 encode로 예열한 뒤 요청을 받는다
+    await run_in_executor(components.warmup)
 
-    graph = build_graph(checkpointer)
+    async with create_checkpointer() as checkpointer:
+        graph = build_graph(checkpointer)
 
-    app.state.checkpointer = checkpointer
-    app.state.graph = graph
-    yield
-    print("👋 Shutting down server...")
+        # thread 목록 인덱스 (sqlite backend면 같은 파일에 저장, memory backend면 메모리)
+        config = settings["checkpointer"]
+        thread_index = await ThreadIndex(
+            config["sqlite_path"] if config["backend"] == "sqlite" else ":memory:"
+        ).open()
+        checkpointer.on_evict.append(thread_index.schedule_delete)
+        if await thread_index.count() == 0:
+            await thread_index.backfill(graph, await checkpointer.alist_threads())
+
+        app.state.checkpointer = checkpointer
+        app.state.graph = graph
+        app.state.thread_index = thread_index
+        # 채팅 턴 동시 실행 제한 / thread별 순서 보장 / 과부하 시 429
+        scheduler = TurnScheduler.from_settings(settings["scheduler"])
+        app.state.scheduler = scheduler
+        app.state.summarizer = SummaryScheduler(
+            graph,
+            limiter=lambda: scheduler.model_slot(settings["llm"]["model"]),
+            on_summarized=lambda thread_id: thread_index.refresh(graph, thread_id),
+        )
+        # 같은 질문의 동시 요청은 그래프를 한 번만 실행 (새 대화의 첫 질문만)
+        app.state.coalescer = Coalescer() if settings["coalescing"]["enabled"] else None
+        # /chat/stream 재연결(Last-Event-ID)용 턴별 이벤트 버퍼
+        app.state.replay = ReplayRegistry.from_settings(settings["streaming"])
+
+        sweeper = asyncio.create_task(
+            sweep_checkpointer(checkpointer, settings["checkpointer"]["sweep_interval_seconds"])
+        )
+        yield
+        print("👋 Shutting down server...")
+        await app.state.replay.close()
+        await app.state.summarizer.drain()
+        sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sweeper
+        await thread_index.close()
 
 
 app = FastAPI(
@@ -54,8 +97,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 id (로그, SSE start 이벤트, X-Request-ID 응답 헤더)
+app.add_middleware(metrics.RequestIdMiddleware)
+
 # 라우터 등록
 app.include_router(chat.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -0,0 +1,72 @@
+import uuid
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from src.core.logger import request_id_var
+from src.agent.components import components
+from src.agent.retrieval import speculation_stats
+
+router = APIRouter(tags=["metrics"])
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestIdMiddleware:
+    """
+    요청마다 request id를 정해(X-Request-ID 헤더가 있으면 그 값) contextvar에 넣고 응답 헤더로 돌려줌.
+    스트리밍 응답 본문도 같은 context에서 만들어지므로 로그와 SSE start 이벤트에 같은 id가 찍힌다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(REQUEST_ID_HEADER.encode("latin-1"), b"").decode("latin-1")[:64] or uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+class CacheStatsCollector:
+    """답변/임베딩 캐시와 선행 검색 통계를 scrape 시점에 읽어 내보냄 (각 컴포넌트의 stats()가 원본)"""
+
+    def collect(self):
+        for name, stats in components.stats().items():
+            for field in ("hits", "misses"):
+                counter = CounterMetricFamily(f"chatbot_{name}_{field}", f"{name} {field}")
+                counter.add_metric([], stats[field])
+                yield counter
+            size = GaugeMetricFamily(f"chatbot_{name}_entries", f"{name} 항목 수")
+            size.add_metric([], stats["size"])
+            yield size
+
+        speculation = CounterMetricFamily(
+            "chatbot_speculative_retrieval", "선행 검색 결과 (hit | miss | discarded)", labels=["outcome"]
+        )
+        for outcome in speculation_stats.OUTCOMES:
+            speculation.add_metric([outcome], speculation_stats.counts[outcome])
+        yield speculation
+
+
+REGISTRY.register(CacheStatsCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text format"""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
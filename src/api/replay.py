@@ -0,0 +1,227 @@
+import asyncio
+import uuid
+from collections import deque
+from contextlib import aclosing
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from src.api.scheduler import Ticket
+from src.core.logger import get_logger
+from src.core.metrics import ABANDONED_STREAMS
+
+logger = get_logger(__name__)
+
+# 재연결을 지원하는 엔드포인트 (ABANDONED_STREAMS의 path label)
+STREAM_PATH = "/chat/stream"
+
+
+class ReplayExpired(Exception):
+    """요청한 이벤트가 이미 버려져서 이어받을 수 없음"""
+
+
+class ReplayBuffer:
+    """
+    스트리밍 턴 1회의 SSE 이벤트 버퍼.
+    이벤트마다 `id: <turn_id>:<seq>` 줄을 붙여 보관하고, 다시 연결한 클라이언트는 Last-Event-ID 다음 이벤트부터 받는다.
+    메모리에는 최근 max_events개만 두고 넘치는 이벤트는 spill_path 파일로 옮긴다 (spill_path가 없으면 버림).
+    구독자가 모두 떠난 뒤 grace_seconds 안에 아무도 다시 연결하지 않으면 답변 생성을 취소한다.
+    """
+
+    def __init__(
+        self,
+        turn_id: str,
+        thread_id: str,
+        max_events: int = 512,
+        spill_path: Optional[Path] = None,
+        grace_seconds: float = 30.0,
+    ):
+        self.turn_id = turn_id
+        self.thread_id = thread_id
+        self.max_events = max_events
+        self.spill_path = spill_path
+        self.grace_seconds = grace_seconds
+        self.next_seq = 0
+        self.done = False
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None   # 답변을 생성하는 백그라운드 task
+        self._memory: Deque[bytes] = deque()
+        self._memory_start = 0                     # _memory[0]의 seq
+        self._spill_offsets: List[int] = []        # spill 파일 안의 seq별 시작 위치
+        self._spill_size = 0
+        self._grace: Optional[asyncio.TimerHandle] = None
+        self._waiter = asyncio.Event()
+
+    @property
+    def first_available(self) -> int:
+        return 0 if self.spill_path is not None else self._memory_start
+
+    def can_resume(self, after: int) -> bool:
+        return self.first_available <= after + 1 <= self.next_seq
+
+    def _wake(self):
+        waiter, self._waiter = self._waiter, asyncio.Event()
+        waiter.set()
+
+    def append(self, data: bytes):
+        self._memory.append(f"id: {self.turn_id}:{self.next_seq}\n".encode("utf-8") + data)
+        self.next_seq += 1
+        if len(self._memory) > self.max_events:
+            oldest = self._memory.popleft()
+            if self.spill_path is not None:
+                with self.spill_path.open("ab") as f:
+                    f.write(oldest)
+                self._spill_offsets.append(self._spill_size)
+                self._spill_size += len(oldest)
+            self._memory_start += 1
+        self._wake()
+
+    def close(self):
+        self.done = True
+        self._cancel_grace()
+        self._wake()
+
+    def _read_spilled(self, seq: int) -> List[bytes]:
+        """spill 파일에서 seq부터 파일 끝까지의 이벤트"""
+        offsets = self._spill_offsets[seq:] + [self._spill_size]
+        with self.spill_path.open("rb") as f:
+            f.seek(offsets[0])
+            data = f.read(offsets[-1] - offsets[0])
+        base = offsets[0]
+        return [data[start - base:end - base] for start, end in zip(offsets, offsets[1:])]
+
+    async def subscribe(self, after: int = -1) -> AsyncIterator[bytes]:
+        """seq가 after보다 큰 이벤트를 차례로 전달하고 답변이 끝나면 종료"""
+        self.subscribers += 1
+        self._cancel_grace()
+        seq = after + 1
+        try:
+            while True:
+                if seq < self.first_available:
+                    raise ReplayExpired(f"{self.turn_id}:{seq}")
+                if seq < self._memory_start:
+                    for frame in self._read_spilled(seq):
+                        yield frame
+                        seq += 1
+                    continue
+                if seq < self.next_seq:
+                    yield self._memory[seq - self._memory_start]
+                    seq += 1
+                    continue
+                if self.done:
+                    return
+                await self._waiter.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                self._start_grace()
+
+    def _start_grace(self):
+        """마지막 구독자의 연결이 끊김: grace_seconds 동안 재연결을 기다린 뒤 답변 생성 취소"""
+        if self.task is None:
+            return
+        if self.grace_seconds <= 0:
+            self._abandon()
+            return
+        self._grace = asyncio.get_running_loop().call_later(self.grace_seconds, self._expire)
+
+    def _cancel_grace(self):
+        if self._grace is not None:
+            self._grace.cancel()
+            self._grace = None
+
+    def _expire(self):
+        self._grace = None
+        if self.subscribers == 0 and not self.done and self.task is not None:
+            logger.info(f"[replay] no reconnect within {self.grace_seconds}s, cancelling turn {self.turn_id}")
+            self._abandon()
+
+    def _abandon(self):
+        """재연결이 없어 답변 생성을 취소 (연결이 끊겼다가 다시 이어받은 턴은 abandoned로 세지 않음)"""
+        ABANDONED_STREAMS.labels(STREAM_PATH).inc()
+        self.task.cancel()
+
+
+class ReplayRegistry:
+    """
+    /chat/stream 턴의 ReplayBuffer 목록.
+    답변 생성은 응답과 분리된 백그라운드 task에서 실행하므로 연결이 끊겨도 계속 진행되고,
+    끝난 턴도 ttl_seconds 동안은 재연결에 대비해 보관한다.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 512,
+        spill_dir: Optional[str] = None,
+        grace_seconds: float = 30.0,
+        ttl_seconds: float = 120.0,
+    ):
+        self.max_events = max_events
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.grace_seconds = grace_seconds
+        self.ttl_seconds = ttl_seconds
+        self._buffers: Dict[str, ReplayBuffer] = {}
+        self._tasks = set()
+
+    @classmethod
+    def from_settings(cls, config: dict) -> "ReplayRegistry":
+        return cls(
+            max_events=config["replay_max_events"],
+            spill_dir=config.get("replay_spill_dir"),
+            grace_seconds=config["resume_grace_seconds"],
+            ttl_seconds=config["replay_ttl_seconds"],
+        )
+
+    def start(self, thread_id: str, content: AsyncIterator[bytes], ticket: Optional[Ticket] = None) -> ReplayBuffer:
+        """content(SSE 이벤트 생성기)를 백그라운드로 실행하며 버퍼에 쌓음. 실행 권한은 생성이 끝나면 반납"""
+        turn_id = uuid.uuid4().hex
+        spill_path = None
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            spill_path = self.spill_dir / f"{turn_id}.sse"
+        buffer = self._buffers[turn_id] = ReplayBuffer(
+            turn_id, thread_id, self.max_events, spill_path, self.grace_seconds
+        )
+        task = buffer.task = asyncio.get_running_loop().create_task(self._produce(buffer, content, ticket))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return buffer
+
+    async def _produce(self, buffer: ReplayBuffer, content: AsyncIterator[bytes], ticket: Optional[Ticket]):
+        try:
+            async with aclosing(content) as frames:
+                async for frame in frames:
+                    buffer.append(frame if isinstance(frame, bytes) else frame.encode("utf-8"))
+        except asyncio.CancelledError:
+            # 재연결이 없어 취소된 턴은 이어받을 것이 없으므로 바로 삭제
+            self._discard(buffer.turn_id)
+            raise
+        else:
+            asyncio.get_running_loop().call_later(self.ttl_seconds, self._discard, buffer.turn_id)
+        finally:
+            buffer.close()
+            if ticket is not None:
+                await ticket.release()
+
+    def find(self, last_event_id: str) -> Tuple[Optional[ReplayBuffer], int]:
+        """Last-Event-ID("<turn_id>:<seq>")의 버퍼와 seq. 모르는 id면 (None, -1)"""
+        turn_id, _, seq = last_event_id.strip().rpartition(":")
+        if not seq.isdigit():
+            return None, -1
+        return self._buffers.get(turn_id), int(seq)
+
+    def _discard(self, turn_id: str):
+        buffer = self._buffers.pop(turn_id, None)
+        if buffer is not None and buffer.spill_path is not None:
+            buffer.spill_path.unlink(missing_ok=True)
+
+    def active(self) -> int:
+        return len(self._buffers)
+
+    async def close(self):
+        """서버 종료: 진행 중인 답변 생성을 취소하고 spill 파일 삭제"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for turn_id in list(self._buffers):
+            self._discard(turn_id)
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict, Optional
+
+from src.core.logger import get_logger
+from src.core.metrics import (
+    SCHEDULER_ACTIVE,
+    SCHEDULER_QUEUE_DEPTH,
+    SCHEDULER_REJECTED,
+    SCHEDULER_WAIT_SECONDS,
+)
+
+logger = get_logger(__name__)
+
+
+class Overloaded(Exception):
+    """대기열이 가득 찼거나 max_wait_seconds 안에 실행 순서가 오지 않음 (HTTP 429)"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """실행 권한. 턴이 끝나면(스트리밍이면 응답 전송이 끝나면) release"""
+
+    def __init__(
+        self,
+        stack: AsyncExitStack,
+        scheduler: "TurnScheduler",
+        model_stack: Optional[AsyncExitStack] = None,
+        model: Optional[str] = None,
+    ):
+        self._stack = stack
+        self._scheduler = scheduler
+        self._model_stack = model_stack or AsyncExitStack()
+        self.model = model   # 모델 슬롯을 잡고 있으면 모델 이름
+        self._released = False
+
+    async def acquire_model(self, model: str):
+        """모델 슬롯 없이 받은 실행 권한에 모델 슬롯 추가 (대기열/429 없음)"""
+        await self._model_stack.enter_async_context(self._scheduler._model_semaphore(model))
+        self.model = model
+        if self._released:
+            # 기다리는 동안 턴이 끝남
+            await self.release_model()
+
+    async def release_model(self):
+        """LLM을 호출하지 않게 된 턴(실행 중인 같은 질문에 합류한 요청)의 모델 슬롯만 먼저 반납"""
+        if self.model is None:
+            return
+        self.model = None
+        await self._model_stack.aclose()
+
+    async def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._scheduler.active -= 1
+        SCHEDULER_ACTIVE.dec()
+        await self.release_model()
+        await self._stack.aclose()
+
+
+class _ThreadLock:
+    """thread별 FIFO 잠금 (asyncio.Lock은 대기 순서대로 깨움). 대기자가 없으면 목록에서 제거"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class TurnScheduler:
+    """
+    채팅 턴 실행 순서 제어.
+    - 같은 thread_id의 턴은 도착 순서대로 하나씩 (follow_up_chain / messages 갱신이 겹치지 않게)
+    - 전체 동시 실행 수(max_concurrent)와 LLM 모델별 동시 실행 수(model_limits) 제한
+    - 기다리는 요청이 max_queue를 넘거나 max_wait_seconds 동안 순서가 오지 않으면 Overloaded (429 + Retry-After)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        max_queue: int = 64,
+        max_wait_seconds: float = 30.0,
+        retry_after_seconds: int = 5,
+        model_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.model_limits = dict(model_limits or {})
+        self.active = 0
+        self.waiting = 0
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._models: Dict[str, asyncio.Semaphore] = {}
+        self._threads: Dict[str, _ThreadLock] = {}
+
+    @classmethod
+    def from_settings(cls, config: dict) -> "TurnScheduler":
+        return cls(
+            max_concurrent=config["max_concurrent"],
+            max_queue=config["max_queue"],
+            max_wait_seconds=config["max_wait_seconds"],
+            retry_after_seconds=config["retry_after_seconds"],
+            model_limits=config.get("model_limits") or {},
+        )
+
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._models:
+            self._models[model] = asyncio.Semaphore(self.model_limits.get(model, self.max_concurrent))
+        return self._models[model]
+
+    def _busy(self, thread_id: str, model: Optional[str]) -> bool:
+        thread = self._threads.get(thread_id)
+        return (
+            self._global.locked()
+            or (thread is not None and thread.lock.locked())
+            or (model is not None and self._model_semaphore(model).locked())
+        )
+
+    @asynccontextmanager
+    async def _thread_lock(self, thread_id: str):
+        thread = self._threads.setdefault(thread_id, _ThreadLock())
+        thread.users += 1
+        try:
+            async with thread.lock:
+                yield
+        finally:
+            thread.users -= 1
+            if thread.users == 0 and self._threads.get(thread_id) is thread:
+                del self._threads[thread_id]
+
+    @asynccontextmanager
+    async def model_slot(self, model: str):
+        """LLM을 쓰는 백그라운드 작업(대화 요약)용 모델별 동시 실행 제한 (대기열/429 없음)"""
+        async with self._model_semaphore(model):
+            yield
+
+    async def acquire(self, thread_id: str, model: Optional[str] = None) -> Ticket:
+        if self._busy(thread_id, model) and self.waiting >= self.max_queue:
+            SCHEDULER_REJECTED.labels("queue_full").inc()
+            raise Overloaded("대기 중인 요청이 너무 많습니다.", self.retry_after_seconds)
+
+        stack, model_stack = AsyncExitStack(), AsyncExitStack()
+        self.waiting += 1
+        SCHEDULER_QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._enter(stack, model_stack, thread_id, model), timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            SCHEDULER_REJECTED.labels("wait_timeout").inc()
+            raise Overloaded("요청이 많아 처리 순서를 기다리다 시간이 초과되었습니다.", self.retry_after_seconds)
+        finally:
+            self.waiting -= 1
+            SCHEDULER_QUEUE_DEPTH.dec()
+            SCHEDULER_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+        self.active += 1
+        SCHEDULER_ACTIVE.inc()
+        return Ticket(stack, self, model_stack, model)
+
+    async def _enter(self, stack: AsyncExitStack, model_stack: AsyncExitStack, thread_id: str, model: Optional[str]):
+        try:
+            # thread 순서를 먼저 잡아야 같은 thread의 뒤 요청이 전체 슬롯을 차지하고 기다리지 않음
+            await stack.enter_async_context(self._thread_lock(thread_id))
+            await stack.enter_async_context(self._global)
+            if model is not None:
+                # 모델 슬롯은 따로 반납할 수 있게 별도 stack에 (Ticket.release_model)
+                await model_stack.enter_async_context(self._model_semaphore(model))
+        except BaseException:
+            await model_stack.aclose()
+            await stack.aclose()
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        return {"active": self.active, "waiting": self.waiting, "threads": len(self._threads)}
+
@@ -7,11 +7,23 @@ class ChatRequest(BaseModel):
     thread_id: Optional[str] = None
     stream: bool = True
     prompt_variant: str = "user_focused"
+    bypass_cache: bool = False  # True면 답변 캐시를 조회/저장하지 않음
+    include_source_content: bool = False  # True면 출처에 문서 본문도 포함
+
+
+class Source(BaseModel):
+    """답변에 사용된 검색 문서 (LLM 출력과 별도로 서버가 전달)"""
+    file_name: Optional[str] = None
+    department: Optional[str] = None
+    date: Optional[str] = None
+    url: Optional[str] = None
+    content: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
     answer: str
     thread_id: str
+    sources: List[Source] = []
 
 
 class Message(BaseModel):
@@ -30,10 +42,13 @@ class ThreadSummary(BaseModel):
 
 class ThreadListResponse(BaseModel):
     threads: List[ThreadSummary]
+    next_cursor: Optional[str] = None  # 다음 페이지 조회 시 cursor로 전달 (마지막 페이지면 None)
 
 
 class ThreadDetailResponse(BaseModel):
     thread_id: str
     messages: List[Message]
+    total_messages: int = 0
+    offset: int = 0
     summarization: Optional[str] = None
     language: Optional[str] = None
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Optional
+
+from starlette.responses import StreamingResponse
+
+from src.api.scheduler import Ticket
+from src.core.logger import get_logger
+from src.core.metrics import ABANDONED_STREAMS
+
+logger = get_logger(__name__)
+
+# SSE 주석 줄: EventSource와 "data: " 줄만 읽는 클라이언트는 무시함
+HEARTBEAT = b": heartbeat\n\n"
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    채팅 SSE 응답.
+    - 클라이언트 연결이 끊기면(http.disconnect 수신 또는 전송 실패) 응답 생성기를 바로 취소/종료해서
+      실행 중인 그래프와 진행 중인 LLM 요청까지 멈춘다 (답변 생성 이후의 대화 요약도 예약되지 않음).
+      /chat/stream은 응답 생성기가 ReplayBuffer 구독이라 구독만 끝나고, 그래프는 재연결을 기다리며 계속 실행
+    - heartbeat_seconds 동안 보낸 것이 없으면 heartbeat 주석을 보내 프록시가 idle 연결을 끊지 않게 한다
+    - 끝나면(정상 종료, 연결 끊김 모두) 실행 권한(ticket)을 반납
+    - resumable(ReplayBuffer 구독)이면 연결이 끊겨도 abandoned로 세지 않음 (재연결 없이 취소될 때 ReplayBuffer가 집계)
+    """
+
+    def __init__(
+        self,
+        content,
+        ticket: Optional[Ticket] = None,
+        heartbeat_seconds: float = 0,
+        resumable: bool = False,
+        **kwargs,
+    ):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+        self.heartbeat_seconds = heartbeat_seconds
+        self.resumable = resumable
+        self.disconnected = False
+        self._last_sent = time.monotonic()
+
+    async def __call__(self, scope, receive, send):
+        # starlette 기본 구현과 달리 응답 생성기를 연결 감시와 별도 task에서 실행하고, 끊기면 그 task를 취소
+        stream = asyncio.create_task(self._stream(send))
+        watcher = asyncio.create_task(self._wait_disconnect(receive))
+        try:
+            done, _ = await asyncio.wait({stream, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if stream not in done:
+                self.disconnected = True
+        finally:
+            stream.cancel()
+            watcher.cancel()
+            # 취소된 턴의 state 정리가 끝난 뒤에 실행 권한 반납 (같은 thread의 다음 턴이 정리된 state를 읽도록)
+            await asyncio.gather(stream, watcher, return_exceptions=True)
+            if self.ticket is not None:
+                await self.ticket.release()
+
+        if self.disconnected:
+            if not self.resumable:
+                ABANDONED_STREAMS.labels(scope.get("path", "")).inc()
+            logger.info("[stream] client disconnected")
+        elif not stream.cancelled() and stream.exception() is not None:
+            raise stream.exception()
+        if self.background is not None:
+            await self.background()
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def _stream(self, send):
+        lock = asyncio.Lock()
+        heartbeat = None
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            self._last_sent = time.monotonic()
+            if self.heartbeat_seconds:
+                heartbeat = asyncio.create_task(self._heartbeat(send, lock))
+
+            async for chunk in self.body_iterator:
+                if not isinstance(chunk, (bytes, memoryview)):
+                    chunk = chunk.encode(self.charset)
+                async with lock:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                    self._last_sent = time.monotonic()
+
+            if heartbeat is not None:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        except OSError:
+            self.disconnected = True
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            # 중간에 멈췄으면 응답 생성기를 실행하던 이 task에서 닫아 그래프 실행을 정리
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _heartbeat(self, send, lock: asyncio.Lock):
+        while True:
+            idle = time.monotonic() - self._last_sent
+            if idle < self.heartbeat_seconds:
+                await asyncio.sleep(self.heartbeat_seconds - idle)
+                continue
+            async with lock:
+                try:
+                    await send({"type": "http.response.body", "body": HEARTBEAT, "more_body": True})
+                except OSError:
+                    return  # 연결 끊김은 본문 전송 / 연결 감시 쪽에서 처리
+                self._last_sent = time.monotonic()
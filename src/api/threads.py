@@ -0,0 +1,181 @@
+import asyncio
+import base64
+import json
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import aiosqlite
+
+from src.core.logger import get_logger
+from src.api.schema.chat import ThreadSummary
+
+logger = get_logger(__name__)
+
+SORT_FIELDS = ("updated_at", "created_at", "message_count")
+PREVIEW_LENGTH = 100
+
+
+def _preview(messages: List) -> Optional[str]:
+    if not messages:
+        return None
+    content = getattr(messages[-1], "content", None)
+    if isinstance(content, str) and len(content) > PREVIEW_LENGTH:
+        return content[:PREVIEW_LENGTH] + "..."
+    return content if isinstance(content, str) else None
+
+
+def encode_cursor(sort_value, thread_id: str) -> str:
+    raw = json.dumps([sort_value, thread_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    try:
+        sort_value, thread_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 cursor 입니다.")
+    return sort_value, thread_id
+
+
+class ThreadIndex:
+    """
+    thread 목록용 metadata 인덱스 (메시지 수, 마지막 메시지 미리보기, 생성/수정 시각).
+    매 턴이 끝날 때 갱신하고, /chat/threads 는 checkpointer를 훑지 않고 이 테이블을 keyset pagination으로 조회한다.
+    path가 ":memory:"이면 프로세스 메모리에만 유지 (checkpointer memory backend용).
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn: Optional[aiosqlite.Connection] = None
+        self._tasks = set()
+
+    async def open(self):
+        self.conn = await aiosqlite.connect(self.path)
+        await self.conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS thread_index (
+                thread_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                message_count INTEGER NOT NULL,
+                last_message TEXT
+            );
+            CREATE INDEX IF NOT EXISTS thread_index_updated_at ON thread_index (updated_at, thread_id);
+            CREATE INDEX IF NOT EXISTS thread_index_created_at ON thread_index (created_at, thread_id);
+            CREATE INDEX IF NOT EXISTS thread_index_message_count ON thread_index (message_count, thread_id);
+            """
+        )
+        await self.conn.commit()
+        return self
+
+    async def close(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+
+    async def record(self, thread_id: str, messages: List, updated_at: Optional[str] = None):
+        """턴이 끝난 뒤의 메시지 목록으로 thread metadata 갱신 (처음이면 생성)"""
+        now = updated_at or datetime.now(timezone.utc).isoformat()
+        await self.conn.execute(
+            """
+            INSERT INTO thread_index (thread_id, created_at, updated_at, message_count, last_message)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(thread_id) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                message_count = excluded.message_count,
+                last_message = excluded.last_message
+            """,
+            (thread_id, now, now, len(messages), _preview(messages)),
+        )
+        await self.conn.commit()
+
+    async def refresh(self, graph, thread_id: str):
+        """대화 요약으로 오래된 메시지가 삭제된 뒤 메시지 수/미리보기만 다시 계산 (새 턴이 아니므로 updated_at 유지)"""
+        state = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+        if not state or not state.values:
+            return
+        messages = state.values.get("messages", [])
+        await self.conn.execute(
+            "UPDATE thread_index SET message_count = ?, last_message = ? WHERE thread_id = ?",
+            (len(messages), _preview(messages), thread_id),
+        )
+        await self.conn.commit()
+
+    async def delete(self, thread_id: str):
+        await self.conn.execute("DELETE FROM thread_index WHERE thread_id = ?", (thread_id,))
+        await self.conn.commit()
+
+    def schedule_delete(self, thread_id: str):
+        """checkpointer의 on_evict(동기 callback)에서 호출"""
+        task = asyncio.get_running_loop().create_task(self.delete(thread_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def count(self) -> int:
+        async with self.conn.execute("SELECT COUNT(*) FROM thread_index") as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def get(self, thread_id: str) -> Optional[ThreadSummary]:
+        async with self.conn.execute(
+            "SELECT thread_id, message_count, last_message, created_at, updated_at FROM thread_index WHERE thread_id = ?",
+            (thread_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return self._summary(row) if row else None
+
+    async def list(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        sort: str = "updated_at",
+        order: str = "desc",
+    ) -> Tuple[List[ThreadSummary], Optional[str]]:
+        """(sort, thread_id) keyset pagination. 반환: (thread 목록, 다음 페이지 cursor 또는 None)"""
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort는 {', '.join(SORT_FIELDS)} 중 하나여야 합니다.")
+        direction, comparison = ("DESC", "<") if order == "desc" else ("ASC", ">")
+
+        query = "SELECT thread_id, message_count, last_message, created_at, updated_at FROM thread_index"
+        params: list = []
+        if cursor:
+            params.extend(decode_cursor(cursor))
+            query += f" WHERE ({sort}, thread_id) {comparison} (?, ?)"
+        query += f" ORDER BY {sort} {direction}, thread_id {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        async with self.conn.execute(query, params) as result:
+            rows = await result.fetchall()
+
+        threads = [self._summary(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = threads[-1]
+            next_cursor = encode_cursor(getattr(last, sort), last.thread_id)
+        return threads, next_cursor
+
+    async def backfill(self, graph, thread_ids: List[str]) -> int:
+        """인덱스가 비어 있을 때 기존 checkpointer의 thread로 한 번 채움 (예전 버전에서 만든 sqlite 파일 대응)"""
+        filled = 0
+        for thread_id in thread_ids:
+            state = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+            if not state or not state.values:
+                continue
+            await self.record(thread_id, state.values.get("messages", []), updated_at=state.created_at)
+            filled += 1
+        if filled:
+            logger.info(f"[threads] backfilled {filled} threads into the thread index")
+        return filled
+
+    @staticmethod
+    def _summary(row) -> ThreadSummary:
+        thread_id, message_count, last_message, created_at, updated_at = row
+        return ThreadSummary(
+            thread_id=thread_id,
+            message_count=message_count,
+            last_message=last_message,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
@@ -0,0 +1,36 @@
+"""
+Chroma collection으로 BM25 인덱스를 만들어 벡터DB 폴더에 저장.
+
+    python -m src.cli.build_lexical_index [--persist-directory DIR]
+
+임베딩 모델 없이 collection의 본문/metadata만 읽으므로 빠르다. 벡터DB가 바뀔 때마다 다시 실행.
+"""
+import argparse
+
+import chromadb
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.agent.components import lexical_index_path, read_corpus_version
+from src.agent.lexical import LexicalIndex
+
+logger = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 인덱스 생성")
+    parser.add_argument("--persist-directory", default=settings["vectorstore"]["persist_directory"])
+    args = parser.parse_args()
+    settings["vectorstore"]["persist_directory"] = args.persist_directory
+
+    client = chromadb.PersistentClient(path=args.persist_directory)
+    collection = client.get_collection(settings["vectorstore"]["collection"])
+
+    index = LexicalIndex.from_collection(collection, version=read_corpus_version(collection))
+    path = lexical_index_path()
+    index.save(path)
+    logger.info(f"Saved BM25 index ({len(index.ids)} documents, version {index.version}) to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+시나리오 질문으로 그래프를 실행하고 RAGAS로 채점 (evaluation/evaluate.ipynb 대체).
+
+    python -m src.cli.evaluate [FILES ...] [--workers 8] [--mode question|scenario] [--no-score]
+
+- question 모드(기본): 질문마다 새 thread로 실행 (이전 질문의 follow-up으로 처리되지 않음)
+- scenario 모드: 시나리오 파일 하나를 한 thread의 연속 대화로 실행 (시나리오끼리는 동시에)
+그래프 출력은 --cache-dir 에 작업 단위로 저장해 두고, 다시 실행하면 저장된 결과를 재사용한다 (중단 후 재개).
+결과는 evaluation/results/<시각>.csv 에 질문별 지연 시간, LLM 호출 수, 토큰 수 컬럼과 함께 저장한다.
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import time
+import uuid
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.core.metrics import MetricsCallbackHandler
+from src.agent.components import components
+from src.agent.graph import build_graph
+from src.agent.summary import summarize_thread
+
+logger = get_logger(__name__)
+
+SCENARIO_GLOB = "evaluation/data/scenario_*.jsonl"
+METRICS = ("faithfulness", "answer_relevancy", "context_precision", "context_recall")
+COLUMNS = (
+    "id", "scenario", "user_input", "retrieved_contexts", "response", "reference",
+    "latency_s", "llm_calls", "prompt_tokens", "completion_tokens", "cached_tokens",
+    "follow_up", "department",
+)
+
+
+def load_items(paths: List[Path]) -> List[Dict]:
+    items = []
+    for path in paths:
+        with Path(path).open("r", encoding="utf-8") as f:
+            items.extend(json.loads(line) for line in f if line.strip())
+    logger.info(f"Loaded {len(items)} questions from {len(paths)} files")
+    return items
+
+
+def make_tasks(items: List[Dict], mode: str) -> List[List[Dict]]:
+    """실행 단위: question 모드는 질문 1개, scenario 모드는 같은 시나리오의 질문 목록 (파일 순서 유지)"""
+    if mode == "question":
+        return [[item] for item in items]
+    return [list(group) for _, group in groupby(items, key=lambda item: item["scenario"])]
+
+
+def task_key(task: List[Dict], mode: str) -> str:
+    """질문, 실행 모드, 모델, 코퍼스 버전이 같으면 같은 키 (하나라도 바뀌면 다시 실행)"""
+    payload = {
+        "mode": mode,
+        "questions": [(item.get("id"), item["question"]) for item in task],
+        "model": settings["llm"]["model"],
+        "corpus": components.corpus_version,
+        # scenario 모드는 턴 사이 요약 설정에 따라 대화 맥락이 달라짐
+        "summary": settings["summary"] if mode == "scenario" else None,
+    }
+    digest = hashlib.sha1(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{task[0].get('id', 'task')}-{digest[:12]}"
+
+
+async def run_turn(graph, item: Dict, thread_id: str) -> Dict:
+    handler = MetricsCallbackHandler()
+    config = {
+        "configurable": {"thread_id": thread_id, "bypass_cache": True},
+        "callbacks": [handler],
+    }
+    start = time.perf_counter()
+    result = await graph.ainvoke({"messages": [{"role": "user", "content": item["question"]}]}, config=config)
+    latency = time.perf_counter() - start
+
+    return {
+        "id": item.get("id"),
+        "scenario": item.get("scenario"),
+        "user_input": item["question"],
+        "retrieved_contexts": [d["content"] for d in result.get("documents") or []],
+        "response": result["messages"][-1].content,
+        "reference": item.get("ground_truth"),
+        "latency_s": round(latency, 3),
+        "llm_calls": handler.llm_calls,
+        "prompt_tokens": handler.tokens["prompt"],
+        "completion_tokens": handler.tokens["completion"],
+        "cached_tokens": handler.tokens["cached"],
+        "follow_up": bool(result.get("follow_up")),
+        "department": result.get("current_department"),
+    }
+
+
+async def run_scenario(graph, task: List[Dict], thread_id: str) -> List[Dict]:
+    """
+    한 thread에서 질문을 순서대로 실행.
+    운영에서는 응답 후 SummaryScheduler가 요약과 메시지 정리(RemoveMessage)를 하므로 턴 사이에 같은 요약을 실행
+    """
+    rows = []
+    for i, item in enumerate(task):
+        if i:
+            await summarize_thread(graph, thread_id)
+        rows.append(await run_turn(graph, item, thread_id))
+    return rows
+
+
+async def run_tasks(graph, tasks: List[List[Dict]], mode: str, workers: int, cache_dir: Path) -> List[Dict]:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(workers)
+    done = 0
+
+    async def run_task(task: List[Dict]) -> List[Dict]:
+        nonlocal done
+        path = cache_dir / f"{task_key(task, mode)}.json"
+        if path.exists():
+            rows = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            async with semaphore:
+                thread_id = str(uuid.uuid4())
+                # scenario 모드는 같은 thread에서 순서대로 (앞 질문이 뒤 질문의 대화 맥락)
+                rows = await run_scenario(graph, task, thread_id)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        done += 1
+        logger.info(f"[{done}/{len(tasks)}] {task[0].get('id')} ({sum(r['latency_s'] for r in rows):.1f}s)")
+        return rows
+
+    results = await asyncio.gather(*(run_task(task) for task in tasks), return_exceptions=True)
+    rows = []
+    for task, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            # 실패한 작업은 캐시에 남지 않으므로 다시 실행하면 그 작업만 재시도
+            logger.error(f"{task[0].get('id')} failed: {result!r}")
+            continue
+        rows.extend(result)
+    return rows
+
+
+def score(rows: List[Dict]) -> List[Dict]:
+    """RAGAS 지표를 행마다 추가하고 지표별 평균을 로그로 출력"""
+    from ragas import EvaluationDataset, evaluate
+    from ragas.metrics import answer_relevancy, context_precision, context_recall, faithfulness
+
+    dataset = EvaluationDataset.from_list([
+        {
+            "user_input": row["user_input"],
+            "retrieved_contexts": row["retrieved_contexts"],
+            "response": row["response"],
+            "reference": row["reference"],
+        }
+        for row in rows
+    ])
+    result = evaluate(dataset, metrics=[faithfulness, answer_relevancy, context_precision, context_recall])
+    for row, scores in zip(rows, result.scores):
+        row.update({metric: scores.get(metric) for metric in METRICS})
+    for metric in METRICS:
+        values = [row[metric] for row in rows if isinstance(row.get(metric), (int, float))]
+        if values:
+            logger.info(f"{metric}: {sum(values) / len(values):.4f}")
+    return rows
+
+
+def write_csv(rows: List[Dict], path: Path, scored: bool):
+    columns = list(COLUMNS) + (list(METRICS) if scored else [])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "retrieved_contexts": json.dumps(row["retrieved_contexts"], ensure_ascii=False)})
+
+
+async def run(args):
+    items = load_items(args.files or sorted(Path(".").glob(SCENARIO_GLOB)))
+    tasks = make_tasks(items, args.mode)
+    graph = build_graph(InMemorySaver())
+
+    start = time.perf_counter()
+    rows = await run_tasks(graph, tasks, args.mode, args.workers, args.cache_dir)
+    latencies = sorted(row["latency_s"] for row in rows)
+    if latencies:
+        logger.info(
+            f"Ran {len(rows)}/{len(items)} questions in {time.perf_counter() - start:.1f}s "
+            f"(p50 {latencies[len(latencies) // 2]:.2f}s, "
+            f"tokens {sum(r['prompt_tokens'] + r['completion_tokens'] for r in rows)})"
+        )
+
+    if not args.no_score and rows:
+        rows = score(rows)
+    output = args.output_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    write_csv(rows, output, scored=not args.no_score)
+    logger.info(f"Results saved to: {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시나리오 질문 동시 실행 + RAGAS 채점")
+    parser.add_argument("files", nargs="*", type=Path, help=f"기본값: {SCENARIO_GLOB}")
+    parser.add_argument("--workers", type=int, default=8, help="동시에 실행할 질문(또는 시나리오) 수")
+    parser.add_argument("--mode", choices=["question", "scenario"], default="question")
+    parser.add_argument("--cache-dir", type=Path, default=Path("evaluation/cache"), help="그래프 출력 캐시 (재개용)")
+    parser.add_argument("--output-dir", type=Path, default=Path("evaluation/results"))
+    parser.add_argument("--no-score", action="store_true", help="RAGAS 채점 없이 답변/지연/토큰만 저장")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+JSONL 코퍼스를 벡터DB에 증분 색인 (evaluation/ingest_corpus.ipynb 대체).
+
+    python -m src.cli.ingest CORPUS.jsonl [--persist-directory DIR] [--batch-size N] [--dry-run]
+
+문서마다 content hash를 metadata에 저장해 두고, 새 문서/바뀐 문서만 청크로 나눠 임베딩한다.
+코퍼스에서 사라진 문서는 삭제하고, manifest.json(코퍼스 버전)과 BM25 인덱스를 갱신한다.
+vectorstore.layout이 partitioned면 학과별 collection도 전체 collection과 같게 맞춘다 (임베딩은 복사).
+"""
+import argparse
+from pathlib import Path
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.agent.components import components, create_partition_stores, lexical_index_path
+from src.agent.ingestion import Ingestor, iter_records, sync_partitions, write_manifest
+from src.agent.lexical import LexicalIndex
+
+logger = get_logger(__name__)
+
+
+def main():
+    config = settings["ingestion"]
+    parser = argparse.ArgumentParser(description="JSONL 코퍼스 증분 색인")
+    parser.add_argument("corpus", type=Path)
+    parser.add_argument("--persist-directory", default=settings["vectorstore"]["persist_directory"])
+    parser.add_argument("--batch-size", type=int, default=config["batch_size"])
+    parser.add_argument("--chunk-size", type=int, default=config["chunk_size"])
+    parser.add_argument("--chunk-overlap", type=int, default=config["chunk_overlap"])
+    parser.add_argument("--dry-run", action="store_true", help="변경 내역만 출력하고 벡터DB는 수정하지 않음")
+    args = parser.parse_args()
+    settings["vectorstore"]["persist_directory"] = args.persist_directory
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    collection = components.store._collection
+    ingestor = Ingestor(collection, components.encoder, splitter, batch_size=args.batch_size, dry_run=args.dry_run)
+
+    report = ingestor.run(iter_records(args.corpus))
+    logger.info(
+        f"added={report.added} updated={report.updated} unchanged={report.unchanged} "
+        f"deleted={report.deleted} skipped={report.skipped} "
+        f"chunks embedded={report.chunks_embedded} deleted={report.chunks_deleted} version={report.version}"
+    )
+
+    partitions = create_partition_stores(components.embeddings)
+    if partitions:
+        synced = sync_partitions(
+            collection,
+            {department: store._collection for department, store in partitions.items()},
+            dry_run=args.dry_run,
+        )
+        logger.info(f"partitions: {len(partitions)} collections, copied={synced['copied']} deleted={synced['deleted']}")
+    if args.dry_run:
+        return
+
+    manifest_path = Path(args.persist_directory) / "manifest.json"
+    write_manifest(
+        manifest_path,
+        report,
+        source=str(args.corpus),
+        chunks=collection.count(),
+        embedding_model=settings["embedding"]["model"],
+        layout=settings["vectorstore"].get("layout", "single"),
+    )
+    logger.info(f"Wrote {manifest_path}")
+
+    index_path = lexical_index_path()
+    if report.changed or not index_path.exists():
+        index = LexicalIndex.from_collection(collection, version=report.version)
+        index.save(index_path)
+        logger.info(f"Saved BM25 index ({len(index.ids)} documents) to {index_path}")
+
+
+if __name__ == "__main__":
+    main()
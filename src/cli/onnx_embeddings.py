@@ -0,0 +1,147 @@
+"""
+bge-m3 임베딩 모델을 ONNX(fp32 + dynamic int8)로 변환하고, torch 모델과의 검색 결과 일치도를 확인.
+
+    python -m src.cli.onnx_embeddings export [--output DIR]
+    python -m src.cli.onnx_embeddings parity [--backends onnx onnx-int8] [--k 5]
+
+export는 최초 1회만 실행하면 되고(torch, transformers 필요), 서비스는 embedding.backend 를
+onnx / onnx-int8 로 바꾸면 onnx_dir 의 모델을 읽는다.
+parity는 evaluation/data/scenario_*.jsonl 질문으로 backend별 top-k 문서 일치율, 쿼리 벡터 cosine,
+인코딩 지연, 모델 로드 후 RSS 증가량을 torch(fp32) 기준으로 출력한다.
+"""
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.agent.components import _create_embeddings
+from src.agent.embeddings import ONNX_INT8_MODEL_FILE, ONNX_MODEL_FILE
+from src.agent.utils import current_rss_bytes
+
+logger = get_logger(__name__)
+
+SCENARIO_GLOB = "evaluation/data/scenario_*.jsonl"
+
+
+def export(output_dir: str, model_name: str, opset: int = 17):
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    class _Encoder(torch.nn.Module):
+        # pooling은 런타임에서 하므로 last_hidden_state만 내보냄
+        def __init__(self, base):
+            super().__init__()
+            self.base = base
+
+        def forward(self, input_ids, attention_mask):
+            return self.base(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    sample = tokenizer(["샘플 문장입니다."], return_tensors="pt")
+    fp32_path = output / ONNX_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(model),
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset,
+            dynamo=False,
+        )
+    tokenizer.save_pretrained(output)
+    logger.info(f"Exported fp32 ONNX model to {fp32_path}")
+
+    int8_path = output / ONNX_INT8_MODEL_FILE
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info(f"Quantized int8 ONNX model to {int8_path}")
+
+
+def load_questions(pattern: str = SCENARIO_GLOB) -> list:
+    questions = []
+    for path in sorted(Path(".").glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            questions.extend(json.loads(line)["question"] for line in f if line.strip())
+    return questions
+
+
+def _measure(backend: str, questions: list, collection, k: int) -> dict:
+    settings["embedding"]["backend"] = backend
+    rss_before = current_rss_bytes()
+    embeddings = _create_embeddings()
+    rss_delta = current_rss_bytes() - rss_before
+
+    vectors, latencies = [], []
+    for question in questions:
+        start = time.perf_counter()
+        vectors.append(embeddings.embed_query(question))
+        latencies.append(time.perf_counter() - start)
+
+    result = collection.query(query_embeddings=vectors, n_results=k, include=[])
+    return {
+        "vectors": np.asarray(vectors),
+        "top_k": [set(ids) for ids in result["ids"]],
+        "latency_ms": 1000 * statistics.median(latencies),
+        "rss_mb": rss_delta / 2**20,
+    }
+
+
+def parity(backends: list, k: int):
+    questions = load_questions()
+    client = chromadb.PersistentClient(path=settings["vectorstore"]["persist_directory"])
+    collection = client.get_collection(settings["vectorstore"]["collection"])
+
+    baseline = _measure("torch", questions, collection, k)
+    print(f"{'backend':<10} {'top-k overlap':>14} {'cosine(min)':>12} {'cosine(mean)':>13} {'p50 ms':>8} {'RSS MB':>8}")
+    print(f"{'torch':<10} {1.0:>14.3f} {1.0:>12.4f} {1.0:>13.4f} {baseline['latency_ms']:>8.1f} {baseline['rss_mb']:>8.0f}")
+
+    for backend in backends:
+        measured = _measure(backend, questions, collection, k)
+        overlap = statistics.mean(len(a & b) / k for a, b in zip(baseline["top_k"], measured["top_k"]))
+        # 두 backend 모두 정규화된 벡터이므로 내적이 곧 cosine
+        cosine = np.sum(baseline["vectors"] * measured["vectors"], axis=1)
+        print(
+            f"{backend:<10} {overlap:>14.3f} {cosine.min():>12.4f} {cosine.mean():>13.4f} "
+            f"{measured['latency_ms']:>8.1f} {measured['rss_mb']:>8.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bge-m3 ONNX 변환 / 검색 일치도 확인")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="fp32 / int8 ONNX 모델 생성")
+    export_parser.add_argument("--output", default=settings["embedding"]["onnx_dir"])
+    export_parser.add_argument("--model", default=settings["embedding"]["model"])
+    export_parser.add_argument("--opset", type=int, default=17)
+
+    parity_parser = subparsers.add_parser("parity", help="torch 대비 top-k 일치율, 지연, 메모리 비교")
+    parity_parser.add_argument("--backends", nargs="+", default=["onnx", "onnx-int8"])
+    parity_parser.add_argument("--k", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args.output, args.model, args.opset)
+    else:
+        parity(args.backends, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
+from contextvars import ContextVar
 from loguru import logger
 import sys
 
 from .config import settings
 
+# 요청마다 부여하는 id (src.api.metrics.RequestIdMiddleware가 설정, 로그와 SSE start 이벤트에 포함)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
 # 기존 핸들러 제거
 logger.remove()
+logger.configure(patcher=lambda record: record["extra"].setdefault("request_id", request_id_var.get()))
 
 logger.add(
     sys.stdout,
@@ -14,6 +19,7 @@ logger.add(
         "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
         "<level>{level}</level> | "
         "<cyan>{module}.py: line {line}</cyan> | "
+        "<magenta>{extra[request_id]}</magenta> | "
         "{message}"
     ),
     enqueue=True,
@@ -0,0 +1,145 @@
+"""
+Prometheus 지표 정의와 LangGraph 실행 계측용 callback.
+/metrics 엔드포인트는 src.api.metrics 에서 노출한다.
+"""
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import Counter, Gauge, Histogram
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# LLM/검색 지연 분포에 맞춘 bucket (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+NODE_SECONDS = Histogram(
+    "chatbot_node_duration_seconds", "그래프 노드별 실행 시간", ["node"], buckets=LATENCY_BUCKETS
+)
+TURN_SECONDS = Histogram(
+    "chatbot_turn_duration_seconds", "한 턴(그래프 실행 전체) 시간", buckets=LATENCY_BUCKETS
+)
+LLM_CALLS = Counter("chatbot_llm_calls_total", "노드별 LLM 호출 수", ["node"])
+LLM_CALLS_PER_TURN = Histogram(
+    "chatbot_llm_calls_per_turn", "턴당 LLM 호출 수", buckets=(0, 1, 2, 3, 4, 6, 8)
+)
+LLM_TOKENS = Counter(
+    "chatbot_llm_tokens_total", "노드별 LLM 토큰 수 (kind: prompt | completion | cached)", ["node", "kind"]
+)
+EMBEDDING_SECONDS = Histogram(
+    "chatbot_embedding_encode_seconds", "임베딩 encode 시간 (mode: query | batch)", ["mode"], buckets=LATENCY_BUCKETS
+)
+SEARCH_SECONDS = Histogram(
+    "chatbot_search_duration_seconds", "문서 검색 시간 (kind: dense | bm25)", ["kind"], buckets=LATENCY_BUCKETS
+)
+SCHEDULER_QUEUE_DEPTH = Gauge("chatbot_scheduler_queue_depth", "실행 순서를 기다리는 채팅 요청 수")
+SCHEDULER_ACTIVE = Gauge("chatbot_scheduler_active", "실행 중인 채팅 턴 수")
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "chatbot_scheduler_wait_seconds", "채팅 요청이 실행 순서를 기다린 시간", buckets=LATENCY_BUCKETS
+)
+SCHEDULER_REJECTED = Counter(
+    "chatbot_scheduler_rejected_total", "429로 거절한 요청 수 (reason: queue_full | wait_timeout)", ["reason"]
+)
+COALESCED_REQUESTS = Counter(
+    "chatbot_coalesced_requests_total", "같은 질문 동시 요청 합치기 (role: leader | follower)", ["role"]
+)
+ABANDONED_STREAMS = Counter(
+    "chatbot_abandoned_streams_total",
+    "답변 도중 클라이언트 연결이 끊긴 스트리밍 응답 수 (/chat/stream은 재연결 대기 후 취소)",
+    ["path"],
+)
+STREAM_RESUMES = Counter(
+    "chatbot_stream_resumes_total", "Last-Event-ID 재연결 (result: resumed | expired)", ["result"]
+)
+CONTEXT_SAVED_TOKENS = Counter(
+    "chatbot_context_saved_tokens_total", "답변 프롬프트 컨텍스트에서 중복 제거/토큰 예산으로 줄인 토큰 수"
+)
+FIRST_CHUNK_SECONDS = Histogram(
+    "chatbot_time_to_first_chunk_seconds", "스트리밍 시작부터 첫 답변 청크까지 시간", buckets=LATENCY_BUCKETS
+)
+
+
+def _token_usage(response) -> Dict[str, int]:
+    """LLMResult에서 prompt/completion/cached 토큰 수 추출 (usage_metadata 우선, 없으면 llm_output)"""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {
+                    "prompt": usage.get("input_tokens", 0),
+                    "completion": usage.get("output_tokens", 0),
+                    "cached": (usage.get("input_token_details") or {}).get("cache_read", 0),
+                }
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return {
+        "prompt": usage.get("prompt_tokens", 0),
+        "completion": usage.get("completion_tokens", 0),
+        "cached": (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0),
+    }
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    한 턴의 그래프 실행에 붙이는 callback (get_config에서 턴마다 생성).
+    노드 실행 시간, 노드별 LLM 호출/토큰 수, 턴당 LLM 호출 수를 기록하고 노드 종료 로그를 남긴다.
+    이번 턴의 LLM 호출 수와 토큰 합계는 llm_calls / tokens 로도 남김 (평가 결과 컬럼용)
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._nodes: Dict[UUID, tuple] = {}
+        self._llm_nodes: Dict[UUID, str] = {}
+        self._root: Optional[UUID] = None
+        self._root_started = 0.0
+        self.llm_calls = 0
+        self.tokens = {"prompt": 0, "completion": 0, "cached": 0}
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        if parent_run_id is None and self._root is None:
+            self._root, self._root_started = run_id, time.perf_counter()
+            return
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 안의 하위 chain(프롬프트, 파서 등)이 아닌 노드 자체만 측정
+        if node and kwargs.get("name") == node:
+            self._nodes[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id: UUID):
+        if run_id == self._root:
+            TURN_SECONDS.observe(time.perf_counter() - self._root_started)
+            LLM_CALLS_PER_TURN.observe(self.llm_calls)
+            self._root = None
+            return
+        started = self._nodes.pop(run_id, None)
+        if started is not None:
+            node, start = started
+            elapsed = time.perf_counter() - start
+            NODE_SECONDS.labels(node).observe(elapsed)
+            logger.info(f"<<< [NODE] {node} END ({elapsed * 1000:.0f}ms)")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID,
+                            metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        self._llm_nodes[run_id] = node
+        self.llm_calls += 1
+        LLM_CALLS.labels(node).inc()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        node = self._llm_nodes.pop(run_id, "unknown")
+        for kind, count in _token_usage(response).items():
+            self.tokens[kind] += count
+            if count:
+                LLM_TOKENS.labels(node, kind).inc(count)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._llm_nodes.pop(run_id, None)
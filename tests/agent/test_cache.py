@@ -0,0 +1,108 @@
+from src.agent.cache import AnswerCache, normalize_query
+
+SCOPE = ("공주대학교", "ko", "v1")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_query_ignores_spacing_punctuation_and_request_phrases():
+    assert normalize_query("수강 신청 기간 알려주세요?") == normalize_query("수강신청기간 알려줘")
+    assert normalize_query("ＴＯＰＣＩＴ 일정 좀 알려줘!") == "topcit일정"
+
+
+def test_exact_key_hit_reuses_answer_and_documents():
+    cache = AnswerCache()
+    assert cache.lookup("순환버스 시간 알려줘", [1, 0], SCOPE) is None
+    assert cache.put("순환버스 시간 알려줘", SCOPE, "08:30 출발", [{"content": "doc"}])
+
+    entry = cache.lookup("순환버스 시간 알려주세요", [0, 1], SCOPE)
+    assert entry.answer == "08:30 출발"
+    assert entry.documents == [{"content": "doc"}]
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_semantic_hit_respects_threshold():
+    cache = AnswerCache(threshold=0.95)
+    cache.lookup("컴퓨터공학과 사무실 전화번호", [1, 0], SCOPE)
+    cache.put("컴퓨터공학과 사무실 전화번호", SCOPE, "041-000-0000")
+
+    assert cache.lookup("컴공 과사 번호", [0.99, 0.05], SCOPE) is not None
+    assert cache.lookup("컴공 졸업 요건", [0.5, 0.5], SCOPE) is None
+
+
+def test_scope_separates_departments_and_corpus_versions():
+    cache = AnswerCache()
+    cache.lookup("교수님 이메일", [1, 0], SCOPE)
+    cache.put("교수님 이메일", SCOPE, "a@kongju.ac.kr")
+
+    assert cache.lookup("교수님 이메일", [1, 0], ("소프트웨어학과", "ko", "v1")) is None
+    assert cache.lookup("교수님 이메일", [1, 0], ("공주대학교", "ko", "v2")) is None
+
+
+def test_put_without_lookup_vector_is_skipped():
+    cache = AnswerCache()
+    assert not cache.put("처음 보는 질문", SCOPE, "답변")
+    assert cache.stats()["size"] == 0
+
+
+def test_ttl_and_lru_eviction():
+    clock = _Clock()
+    cache = AnswerCache(max_entries=2, ttl_seconds=10, clock=clock)
+    for i, question in enumerate(["질문a", "질문b", "질문c"]):
+        cache.put(question, SCOPE, f"답변{i}", vector=[i, 1])
+    # 가장 오래 사용되지 않은 항목이 제거됨
+    assert cache.stats()["size"] == 2
+    assert cache.lookup("질문a", [-1, 0], SCOPE) is None
+
+    clock.now = 11
+    assert cache.lookup("질문c", [2, 1], SCOPE) is None
+
+
+def test_answers_shaped_by_a_conversation_are_not_shared_across_threads(monkeypatch):
+    import asyncio
+
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from src.agent import nodes
+    from src.agent.components import components
+    from src.agent.context import ContextBuilder
+    from src.agent.nodes import generation_node
+
+    monkeypatch.setattr(nodes.ContextBuilder, "from_settings", lambda: ContextBuilder(max_tokens=1000, count_tokens=len))
+    cache = AnswerCache()
+    answers = iter([AIMessage(content="홍길동 학생은 2월 10일부터 신청하면 됩니다"), AIMessage(content="2월 10일부터입니다")])
+    components.override(model=GenericFakeChatModel(messages=answers), answer_cache=cache, corpus_version="v1")
+    scope = ("공주대학교", "ko", "v1")
+    question = "수강신청 기간 알려줘"
+
+    def turn(**state):
+        state = {
+            "messages": [HumanMessage(content=question)],
+            "follow_up_chain": [question],
+            "documents": [],
+            "language": "ko",
+            "current_department": "공주대학교",
+            **state,
+        }
+        return asyncio.run(generation_node(state, {"configurable": {}}))
+
+    try:
+        # 요약(이전 대화)이 있는 thread의 답변은 저장하지 않음
+        assert cache.lookup(question, [1, 0], scope) is None
+        turn(summarization="사용자는 컴퓨터공학과 3학년 홍길동")
+        assert cache.lookup(question, [1, 0], scope) is None
+
+        # 대화 맥락이 없는 턴의 답변만 다른 thread에서 재사용
+        turn(summarization="")
+        entry = cache.lookup(question, [1, 0], scope)
+    finally:
+        components.reset()
+
+    assert entry is not None and entry.answer == "2월 10일부터입니다"
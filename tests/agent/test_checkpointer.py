@@ -0,0 +1,97 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import StateGraph, MessagesState, START, END
+
+from src.agent.checkpointer import BoundedInMemorySaver, create_checkpointer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _graph(checkpointer):
+    def answer(state):
+        return {"messages": [AIMessage(content=f"답변 {len(state['messages'])}")]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("answer", answer)
+    builder.add_edge(START, "answer")
+    builder.add_edge("answer", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+async def _turn(graph, thread_id, question="질문"):
+    config = {"configurable": {"thread_id": thread_id}}
+    await graph.ainvoke({"messages": [{"role": "user", "content": question}]}, config=config)
+    return (await graph.aget_state(config)).values["messages"]
+
+
+def test_memory_saver_keeps_last_checkpoints_and_state():
+    saver = BoundedInMemorySaver(keep_last=2)
+    graph = _graph(saver)
+
+    async def run():
+        for _ in range(5):
+            messages = await _turn(graph, "t-1")
+        return messages
+
+    messages = asyncio.run(run())
+    assert len(messages) == 10
+    assert len(saver.storage["t-1"][""]) == 2
+    # 남은 checkpoint가 참조하는 blob만 유지
+    assert len(saver.blobs) <= 2 * 4
+
+
+def test_memory_saver_evicts_lru_and_expired_threads():
+    clock = FakeClock()
+    saver = BoundedInMemorySaver(keep_last=2, max_threads=2, ttl_seconds=100, clock=clock)
+    evicted = []
+    saver.on_evict.append(evicted.append)
+    graph = _graph(saver)
+
+    async def run():
+        await _turn(graph, "a")
+        clock.now = 10
+        await _turn(graph, "b")
+        clock.now = 20
+        await _turn(graph, "c")
+        assert evicted == ["a"]
+        assert set(await saver.alist_threads()) == {"b", "c"}
+
+        clock.now = 115
+        assert await saver.aevict_expired() == 1
+        assert await saver.alist_threads() == ["c"]
+
+    asyncio.run(run())
+    assert saver.footprint()["threads"] == 1
+
+
+def test_sqlite_saver_persists_prunes_and_expires(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"backend": "sqlite", "sqlite_path": path, "keep_last": 2, "ttl_seconds": 0}
+
+    async def run():
+        async with create_checkpointer(config) as saver:
+            graph = _graph(saver)
+            for _ in range(3):
+                await _turn(graph, "t-1")
+            footprint = await saver.afootprint()
+
+        # 재시작 후에도 대화가 남아 있어야 함
+        async with create_checkpointer(config) as saver:
+            messages = await _turn(_graph(saver), "t-1")
+            saver.ttl_seconds = 1
+            saver.clock = lambda: 1e12
+            expired = await saver.aevict_expired()
+            threads = await saver.alist_threads()
+        return footprint, messages, expired, threads
+
+    footprint, messages, expired, threads = asyncio.run(run())
+    assert footprint["checkpoints"] == 2 and footprint["disk_bytes"] > 0
+    assert len(messages) == 8
+    assert expired == 1 and threads == []
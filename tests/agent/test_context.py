@@ -0,0 +1,86 @@
+from src.agent.context import ContextBuilder, jaccard, shingles
+
+
+def _doc(content, name="공지"):
+    return {"content": content, "metadata": {"file_name": name, "department": "소프트웨어학과", "url": "https://a", "date": "2025-10-01"}}
+
+
+NOTICE = "2025학년도 2학기 수강신청은 8월 11일부터 8월 14일까지 진행됩니다. 수강정정은 9월 첫째 주입니다."
+
+
+def test_near_duplicate_recrawled_notice_is_dropped():
+    recrawled = NOTICE.replace("진행됩니다", "진행 됩니다") + " "
+    assert jaccard(shingles(NOTICE), shingles(recrawled)) > 0.8
+
+    result = ContextBuilder(max_tokens=10_000, count_tokens=len).build(
+        [_doc(NOTICE, "공지1"), _doc(recrawled, "공지1(재수집)"), _doc("졸업요건은 130학점 이상입니다.", "졸업")]
+    )
+    assert [d["metadata"]["file_name"] for d in result.documents] == ["공지1", "졸업"]
+    assert result.duplicates == 1
+    assert "[검색된 문서 2]" in result.text and "[검색된 문서 3]" not in result.text
+    assert result.saved_tokens > 0
+
+
+def test_budget_keeps_relevance_order_and_truncates_last_document():
+    documents = [_doc("가" * 300, "1순위"), _doc("나" * 300, "2순위"), _doc("다" * 300, "3순위")]
+    result = ContextBuilder(max_tokens=700, min_document_tokens=50, count_tokens=len).build(documents)
+
+    assert result.tokens <= 700
+    assert [d["metadata"]["file_name"] for d in result.documents] == ["1순위", "2순위"]
+    assert result.truncated == 1 and result.dropped == 1
+    assert result.documents[0]["content"] == "가" * 300
+    assert result.documents[1]["content"].endswith("…")
+    # 출처용 원본은 잘리지 않음
+    assert [d["content"] for d in result.sources] == ["가" * 300, "나" * 300]
+    assert result.original_tokens - result.tokens == result.saved_tokens
+
+
+def test_small_remaining_budget_drops_instead_of_truncating():
+    documents = [_doc("가" * 300, "1순위"), _doc("나" * 300, "2순위")]
+    result = ContextBuilder(max_tokens=420, min_document_tokens=200, count_tokens=len).build(documents)
+    assert [d["metadata"]["file_name"] for d in result.documents] == ["1순위"]
+    assert result.dropped == 1 and result.truncated == 0
+
+
+def test_generation_uses_truncated_text_but_returns_original_sources(monkeypatch):
+    import asyncio
+
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from src.agent import nodes
+    from src.agent.cache import AnswerCache
+    from src.agent.components import components
+    from src.core.metrics import CONTEXT_SAVED_TOKENS
+
+    prompts = []
+
+    class Model(GenericFakeChatModel):
+        async def ainvoke(self, messages, *args, **kwargs):
+            prompts.append(messages[0].content)
+            return await super().ainvoke(messages, *args, **kwargs)
+
+    monkeypatch.setattr(
+        nodes.ContextBuilder, "from_settings",
+        lambda: ContextBuilder(max_tokens=700, min_document_tokens=50, count_tokens=len),
+    )
+    cache = AnswerCache()
+    components.override(model=Model(messages=iter([AIMessage(content="답변")])), answer_cache=cache, corpus_version="v1")
+    documents = [_doc("가" * 300, "1순위"), _doc("나" * 300, "2순위")]
+    saved = CONTEXT_SAVED_TOKENS._value.get()
+    state = {
+        "messages": [HumanMessage(content="질문")],
+        "follow_up_chain": ["질문"],
+        "documents": documents,
+        "current_department": "소프트웨어학과",
+    }
+    try:
+        cache.lookup("질문", [1, 0], ("소프트웨어학과", "ko", "v1"))
+        update = asyncio.run(nodes.generation_node(state, {"configurable": {}}))
+        entry = cache.lookup("질문", [1, 0], ("소프트웨어학과", "ko", "v1"))
+    finally:
+        components.reset()
+
+    assert "나" * 300 not in prompts[0] and " …" in prompts[0]
+    assert update["documents"] == documents and entry.documents == documents
+    assert CONTEXT_SAVED_TOKENS._value.get() > saved
@@ -0,0 +1,99 @@
+import numpy as np
+
+from src.agent.departments import DepartmentClassifier, canonical_department, department_filter, partition_collection
+
+
+class _Collection:
+    def __init__(self, embeddings, metadatas):
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.metadatas = metadatas
+
+    def get(self, include=None, limit=None, offset=0):
+        end = offset + limit
+        return {"embeddings": self.embeddings[offset:end], "metadatas": self.metadatas[offset:end]}
+
+
+def test_department_filter_expands_aliases():
+    assert department_filter("SW중심대학사업단") == {
+        "department": {"$in": ["공주대학교 SW중심대학사업단", "SW중심대학사업단"]}
+    }
+    assert department_filter("소프트웨어학과") == {"department": {"$in": ["소프트웨어학과"]}}
+    # 목록에 없는 학과면 필터 없이 검색
+    assert department_filter("경영학과") is None
+
+
+def test_alias_group_shares_one_centroid():
+    assert canonical_department("SW중심대학사업단") == canonical_department("공주대학교 SW중심대학사업단")
+
+
+def test_alias_group_shares_one_partition():
+    assert partition_collection("langchain", "SW중심대학사업단") == "langchain-sw-center"
+    assert partition_collection("langchain", "공주대학교 SW중심대학사업단") == "langchain-sw-center"
+    assert partition_collection("langchain", "경영학과") is None
+
+
+def test_department_search_uses_partition_without_filter():
+    import asyncio
+
+    from langchain_core.documents import Document
+
+    from benchmarks.fakes import FakeEmbeddings, FakeVectorStore
+    from src.agent.components import components
+    from src.agent.retrieval import search_documents
+
+    embeddings = FakeEmbeddings(encode_time=0)
+    partition = FakeVectorStore(embeddings, [
+        Document(page_content="졸업요건 안내", metadata={"department": "SW중심대학사업단"}),
+    ])
+    global_store = FakeVectorStore(embeddings)
+    components.override(store=global_store, partitions={"공주대학교 SW중심대학사업단": partition}, lexical_index=None)
+    try:
+        vector = embeddings.embed_query("졸업요건")
+        routed = asyncio.run(search_documents("졸업요건", vector, "SW중심대학사업단", k=3))
+        unrouted = asyncio.run(search_documents("졸업요건", vector, None, k=3))
+    finally:
+        components.reset()
+
+    assert [d.page_content for d in routed] == ["졸업요건 안내"]
+    assert len(unrouted) == 3 and "졸업요건 안내" not in [d.page_content for d in unrouted]
+
+
+def test_from_collection_averages_vectors_per_department():
+    collection = _Collection(
+        [[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0, 0, 1]],
+        [
+            {"department": "소프트웨어학과"},
+            {"department": "소프트웨어학과"},
+            {"department": "SW중심대학사업단"},
+            {"department": "경영학과"},  # 목록에 없는 학과는 무시
+        ],
+    )
+    classifier = DepartmentClassifier.from_collection(collection, batch_size=2)
+    assert sorted(classifier.labels) == ["공주대학교 SW중심대학사업단", "소프트웨어학과"]
+
+
+def test_predict_is_confident_for_clear_query():
+    classifier = DepartmentClassifier({"소프트웨어학과": [1, 0], "컴퓨터공학과": [0, 1]})
+    prediction = classifier.predict([0.95, 0.05])
+    assert prediction.department == "소프트웨어학과"
+    assert prediction.confident
+
+
+def test_predict_escalates_when_ambiguous():
+    classifier = DepartmentClassifier({"소프트웨어학과": [1, 0], "컴퓨터공학과": [0, 1]}, min_margin=0.05)
+    prediction = classifier.predict([1, 1])
+    assert not prediction.confident
+
+
+def test_empty_collection_is_never_confident():
+    classifier = DepartmentClassifier.from_collection(_Collection(np.zeros((0, 3)), []))
+    prediction = classifier.predict([1.0, 0.0, 0.0])
+    assert prediction.department is None and not prediction.confident
+
+
+def test_corpus_without_departments_is_never_confident():
+    # evaluation/data/corpus.jsonl처럼 department metadata가 없는 청크만 있는 경우
+    collection = _Collection([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], [{"doc_id": "1"}, None])
+    classifier = DepartmentClassifier.from_collection(collection)
+    assert classifier.centroids.shape == (0, 3)
+    assert not classifier.predict([1.0, 0.0, 0.0]).confident
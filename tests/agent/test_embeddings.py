@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.agent.embeddings import CachedEmbeddings, normalize_text
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("encode failed")
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  수강신청　 기간 ") == "수강신청 기간"
+
+
+def test_embed_query_is_cached_by_normalized_text():
+    base = _CountingEmbeddings()
+    embeddings = CachedEmbeddings(base)
+    first = embeddings.embed_query("순환버스 시간")
+    second = embeddings.embed_query(" 순환버스  시간 ")
+    assert first == second
+    assert len(base.calls) == 1
+    assert embeddings.stats()["hits"] == 1
+
+
+def test_concurrent_queries_are_encoded_in_one_batch():
+    base = _CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, batch_window_ms=20)
+
+    async def run():
+        return await asyncio.gather(
+            embeddings.aembed_query("수강신청"),
+            embeddings.aembed_query("장학금"),
+            embeddings.aembed_query("수강신청"),
+        )
+
+    vectors = asyncio.run(run())
+    assert vectors[0] == vectors[2]
+    # 중복 질문은 한 번만, 나머지는 하나의 batch로 encode
+    assert base.calls == [["수강신청", "장학금"]]
+
+
+def test_batch_flushes_when_full():
+    base = _CountingEmbeddings()
+    embeddings = CachedEmbeddings(base, batch_window_ms=1000, max_batch_size=2)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(embeddings.aembed_query("a"), embeddings.aembed_query("b")), timeout=0.5
+        )
+
+    assert len(asyncio.run(run())) == 2
+    # 끝난 batch task는 참조 목록에서 빠짐
+    assert not embeddings.batcher._tasks
+
+
+def test_encode_errors_propagate_to_all_waiters():
+    embeddings = CachedEmbeddings(_CountingEmbeddings(fail=True))
+
+    async def run():
+        return await asyncio.gather(embeddings.aembed_query("a"), embeddings.aembed_query("b"))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
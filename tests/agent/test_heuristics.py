@@ -0,0 +1,112 @@
+import asyncio
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fakes import FakeEmbeddings
+from src.agent import heuristics
+from src.agent.heuristics import detect_language, follow_up_hint, lexical_follow_up, script_counts
+
+
+def test_single_script_questions_skip_tiktoken(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("tiktoken 경로를 타면 안 됨")
+
+    monkeypatch.setattr(heuristics.utils, "detect_language", fail)
+    assert script_counts("수강신청 abc") == (4, 3)
+    assert detect_language("수강신청 기간이 언제인가요?") == "ko"
+    assert detect_language("When does course registration start?") == "en"
+    # 한글도 라틴 문자도 없으면 utils.detect_language와 같이 en
+    assert detect_language("2025-03-01?") == "en"
+
+
+def test_mixed_script_falls_back_to_token_ratio(monkeypatch):
+    calls = []
+    monkeypatch.setattr(heuristics.utils, "detect_language", lambda text, threshold: calls.append(text) or "ko")
+    assert detect_language("TOPCIT 시험은 언제인가요?") == "ko"
+    assert calls == ["TOPCIT 시험은 언제인가요?"]
+
+
+def test_lexical_markers():
+    assert lexical_follow_up("그럼 정정 기간은요?")
+    assert lexical_follow_up("  \"그거 몇 학점이야?")
+    assert lexical_follow_up("What about the spring semester?")
+    assert not lexical_follow_up("그래픽스 과목은 몇 학년에 듣나요?")
+    assert not lexical_follow_up("졸업요건 알려줘")
+
+
+def test_follow_up_hint_rules():
+    embeddings = FakeEmbeddings(encode_time=0)
+
+    def hint(question, previous):
+        return asyncio.run(follow_up_hint(question, previous, embeddings))
+
+    assert hint("그럼 정정 기간은?", []).is_follow_up is False
+    assert hint("그럼 정정 기간은?", ["수강신청 기간 알려줘"]).rule == "marker"
+
+    similar = hint("수강신청 기간 알려줘요", ["수강신청 기간 알려줘"])
+    assert similar.is_follow_up is True and similar.rule == "similar"
+
+    unrelated = hint("TOPCIT 시험은 언제 실시되나요?", ["졸업논문 작성은 어떻게 해야돼?"])
+    assert unrelated.is_follow_up is False and unrelated.rule == "dissimilar"
+
+    # 애매한 경우는 라우터 LLM에 맡김
+    ambiguous = hint("수강신청 정정 기간 알려줘", ["수강신청 기간 알려줘"])
+    assert ambiguous.is_follow_up is None and ambiguous.rule == "ambiguous"
+
+
+def test_chained_marker_follow_ups_keep_query_bounded():
+    from src.agent.components import components
+    from src.agent.nodes import route_question_node
+
+    class FailRouter:
+        async def ainvoke(self, messages):
+            raise AssertionError("분명한 follow-up은 라우터 LLM을 호출하면 안 됨")
+
+    components.override(embeddings=FakeEmbeddings(encode_time=0), router=FailRouter())
+    state = {
+        "follow_up_chain": ["수강신청 기간 알려줘"],
+        "question_appropriate": True,
+        "current_department": "컴퓨터공학과",
+    }
+    try:
+        for question in ("그럼 정정 기간은?", "그럼 취소 기간은?", "그럼 휴학 신청은?"):
+            state["messages"] = [HumanMessage(content=question)]
+            state.update(asyncio.run(route_question_node(state)))
+    finally:
+        components.reset()
+
+    assert state["follow_up_chain"] == [
+        "수강신청 기간 알려줘",
+        "수강신청 기간 알려줘 그럼 정정 기간은?",
+        "수강신청 기간 알려줘 그럼 취소 기간은?",
+        "수강신청 기간 알려줘 그럼 휴학 신청은?",
+    ]
+    assert state["follow_up"] is True and state["current_department"] == "컴퓨터공학과"
+
+
+def test_marker_follow_up_of_inappropriate_question_goes_to_router():
+    from src.agent.components import components
+    from src.agent.nodes import route_question_node
+    from src.agent.state import RouteDecision
+
+    calls = []
+
+    class Router:
+        async def ainvoke(self, messages):
+            calls.append(messages)
+            return RouteDecision(
+                is_follow_up=True, search_query="", question_appropriate=False, reason="범위 밖", department="공주대학교"
+            )
+
+    components.override(embeddings=FakeEmbeddings(encode_time=0), router=Router())
+    state = {
+        "messages": [HumanMessage(content="그럼 내일 날씨는?")],
+        "follow_up_chain": ["오늘 점심 메뉴 추천해줘"],
+        "question_appropriate": False,
+    }
+    try:
+        result = asyncio.run(route_question_node(state))
+    finally:
+        components.reset()
+
+    assert len(calls) == 1 and result["follow_up"] is True
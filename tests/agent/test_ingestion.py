@@ -0,0 +1,97 @@
+import uuid
+
+import chromadb
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from benchmarks.fakes import FakeEmbeddings
+from src.agent.ingestion import Ingestor, record_to_document
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    def __init__(self):
+        super().__init__(dim=32, encode_time=0)
+        self.encoded = []
+
+    def embed_documents(self, texts):
+        self.encoded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def _collection():
+    client = chromadb.EphemeralClient()
+    return client.create_collection(f"test-{uuid.uuid4().hex}", embedding_function=None)
+
+
+def _ingest(collection, records, embeddings):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=40, chunk_overlap=0)
+    return Ingestor(collection, embeddings, splitter, batch_size=2).run(iter(records))
+
+
+CORPUS = [
+    {"doc_id": "1", "url": "https://a", "captured_at": "2025-10-03", "text": "학위청구논문 작성요령 안내입니다. " * 3},
+    {"file_name": "공지.pdf", "department": "컴퓨터공학과", "url": "https://b", "date": "2025-10-04", "text": "수강신청 기간 안내"},
+]
+
+
+def test_record_schemas_are_mapped_to_service_metadata():
+    key, _, metadata = record_to_document(CORPUS[0])
+    assert key == "1" and metadata["date"] == "2025-10-03" and "department" not in metadata
+    key, _, metadata = record_to_document(CORPUS[1])
+    assert key == "공지.pdf" and metadata["department"] == "컴퓨터공학과"
+
+
+def test_second_run_only_embeds_the_diff():
+    collection, embeddings = _collection(), CountingEmbeddings()
+    first = _ingest(collection, CORPUS, embeddings)
+    assert first.added == 2 and collection.count() == first.chunks_embedded
+
+    embeddings.encoded.clear()
+    unchanged = _ingest(collection, CORPUS, embeddings)
+    assert unchanged.unchanged == 2 and not unchanged.changed
+    assert embeddings.encoded == []
+    assert unchanged.version == first.version
+
+    changed = [CORPUS[0], {**CORPUS[1], "text": "수강신청 기간 변경 안내"}]
+    report = _ingest(collection, changed, embeddings)
+    assert (report.updated, report.unchanged) == (1, 1)
+    assert embeddings.encoded == ["수강신청 기간 변경 안내"]
+    assert report.version != first.version
+
+
+def test_disappeared_documents_are_deleted():
+    collection, embeddings = _collection(), CountingEmbeddings()
+    _ingest(collection, CORPUS, embeddings)
+    report = _ingest(collection, CORPUS[1:], embeddings)
+
+    assert report.deleted == 1
+    remaining = collection.get(include=["metadatas"])["metadatas"]
+    assert {m["doc_key"] for m in remaining} == {"공지.pdf"}
+
+
+def test_partitions_follow_the_global_collection():
+    from src.agent.ingestion import sync_partitions
+
+    collection, embeddings = _collection(), CountingEmbeddings()
+    partitions = {"컴퓨터공학과": _collection(), "공주대학교 SW중심대학사업단": _collection()}
+    corpus = CORPUS + [
+        {"file_name": "사업단.pdf", "department": "SW중심대학사업단", "url": "https://c", "text": "SW 캠프 모집"},
+    ]
+    _ingest(collection, corpus, embeddings)
+    encoded = len(embeddings.encoded)
+
+    assert sync_partitions(collection, partitions) == {"copied": 2, "deleted": 0}
+    # alias 그룹은 대표 학과 collection 하나에, 학과 없는 문서는 전체 collection에만
+    assert partitions["컴퓨터공학과"].get()["documents"] == ["수강신청 기간 안내"]
+    assert partitions["공주대학교 SW중심대학사업단"].get()["documents"] == ["SW 캠프 모집"]
+    # 임베딩은 다시 계산하지 않고 전체 collection에서 복사
+    assert len(embeddings.encoded) == encoded
+    copied = partitions["컴퓨터공학과"].get(include=["embeddings"])["embeddings"][0]
+    original = collection.get(ids=["공지.pdf:0"], include=["embeddings"])["embeddings"][0]
+    assert list(copied) == list(original)
+
+    # 학과가 바뀐 문서는 예전 학과 collection에서 빠지고, 바뀌지 않았으면 아무것도 하지 않음
+    moved = [CORPUS[0], {**CORPUS[1], "department": "SW중심대학사업단"}, corpus[2]]
+    _ingest(collection, moved, embeddings)
+    assert sync_partitions(collection, partitions) == {"copied": 1, "deleted": 1}
+    assert partitions["컴퓨터공학과"].count() == 0 and partitions["공주대학교 SW중심대학사업단"].count() == 2
+    assert sync_partitions(collection, partitions) == {"copied": 0, "deleted": 0}
@@ -0,0 +1,58 @@
+from langchain_core.documents import Document
+
+from src.agent.lexical import LexicalIndex, tokenize_korean
+from src.agent.retrieval import reciprocal_rank_fusion
+
+
+def _index():
+    return LexicalIndex(
+        ids=["1", "2", "3"],
+        contents=[
+            "TOPCIT 정기평가는 6월에 시행됩니다. 문의 041-850-8707",
+            "소프트웨어학과 수강신청 기간은 2월 10일부터입니다.",
+            "컴퓨터공학과 교수님 이메일 목록입니다.",
+        ],
+        metadatas=[
+            {"department": "SW중심대학사업단"},
+            {"department": "소프트웨어학과"},
+            {"department": "컴퓨터공학과"},
+        ],
+        version="v1",
+    )
+
+
+def test_tokenizer_strips_josa_and_keeps_exact_codes():
+    tokens = tokenize_korean("TOPCIT은 041-850-8707으로 문의")
+    assert "topcit" in tokens
+    assert "041-850-8707" in tokens and "8707" in tokens
+    assert "문의" in tokens
+
+
+def test_tokenizer_matches_regardless_of_spacing():
+    assert set(tokenize_korean("수강 신청")) <= set(tokenize_korean("수강신청"))
+
+
+def test_search_finds_exact_tokens():
+    results = _index().search("topcit 시행 일정", k=2)
+    assert results[0].id == "1"
+
+
+def test_search_honors_department_alias_filter():
+    index = _index()
+    aliases = {"department": {"$in": ["공주대학교 SW중심대학사업단", "SW중심대학사업단"]}}
+    assert [d.id for d in index.search("수강신청 topcit", k=3, filter=aliases)] == ["1"]
+    assert index.search("topcit", k=3, filter={"department": {"$in": ["컴퓨터공학과"]}}) == []
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = tmp_path / "bm25.pkl"
+    _index().save(path)
+    loaded = LexicalIndex.load(path)
+    assert loaded.version == "v1"
+    assert loaded.search("교수님 이메일", k=1)[0].id == "3"
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    a, b, c = (Document(id=i, page_content=i) for i in "abc")
+    fused = reciprocal_rank_fusion([[a, b], [b, c]])
+    assert [d.id for d in fused] == ["b", "a", "c"]
@@ -0,0 +1,99 @@
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.agent.cache import AnswerCache
+from src.agent.components import components
+from src.agent.graph import build_graph
+from src.agent.nodes import adopt_speculation_node, route_after_speculation_node
+from src.agent.retrieval import SpeculationStats
+
+DOCS = [{"content": "수강신청은 2월 10일부터", "metadata": {"file_name": "공지"}}]
+
+
+def _speculation(query="수강신청 언제야?", department="소프트웨어학과", classified="소프트웨어학과"):
+    return {
+        "query": query,
+        "classified_department": classified,
+        "documents": DOCS,
+        "current_department": department,
+        "cached_answer": None,
+    }
+
+
+def _state(**kwargs):
+    state = {
+        "follow_up": False,
+        "question_appropriate": True,
+        "follow_up_chain": ["수강신청 언제야?"],
+        "current_department": "소프트웨어학과",
+        "speculation": _speculation(),
+    }
+    state.update(kwargs)
+    return state
+
+
+def test_new_topic_adopts_speculative_documents():
+    update = adopt_speculation_node(_state())
+    assert update["documents"] == DOCS
+    assert route_after_speculation_node({**_state(), **update}) == "generate"
+
+
+def test_rewritten_follow_up_query_retrieves_again():
+    state = _state(follow_up=True, follow_up_chain=["수강신청 언제야?", "수강신청 정정 기간은 언제야?"])
+    update = adopt_speculation_node(state)
+    assert "documents" not in update
+    assert route_after_speculation_node({**state, **update}) == "retrieve"
+
+
+def test_department_mismatch_retrieves_again():
+    # 임베딩 분류가 애매해서 이전 학과로 추측했는데 라우터가 다른 학과를 고른 경우
+    state = _state(current_department="인공지능학부", speculation=_speculation(classified=None))
+    update = adopt_speculation_node(state)
+    assert route_after_speculation_node({**state, **update}) == "retrieve"
+
+
+def test_inappropriate_question_discards_speculation():
+    state = _state(question_appropriate=False)
+    update = adopt_speculation_node(state)
+    assert route_after_speculation_node({**state, **update}) == "rewrite_question"
+
+
+def test_answer_cache_counts_each_turn_once():
+    cache = AnswerCache()
+    components.override(answer_cache=cache)
+    scope = ("소프트웨어학과", "ko", "v1")
+
+    def speculate(query, vector):
+        # speculative_retrieve_node의 조회: 통계에 넣지 않고 결과와 scope를 넘김
+        entry = cache.lookup(query, vector, scope, count=False)
+        return {**_speculation(query), "cache_scope": scope, "cached_answer": entry and entry.answer}
+
+    try:
+        # 1턴: 선행 검색 채택, 캐시 miss → 답변 저장
+        adopt_speculation_node(_state(speculation=speculate("수강신청 언제야?", [1, 0])))
+        assert cache.put("수강신청 언제야?", scope, "2월 10일부터", DOCS)
+
+        # 2턴: 같은 질문, 선행 검색 채택, 캐시 hit
+        update = adopt_speculation_node(_state(speculation=speculate("수강신청 언제야?", [1, 0])))
+        assert update["cached_answer"] == "2월 10일부터"
+
+        # 3턴: 재작성된 follow-up이라 선행 검색은 버리고 retrieve에서 다시 조회
+        state = _state(follow_up=True, follow_up_chain=["수강신청 언제야?", "수강신청 정정 기간은 언제야?"])
+        adopt_speculation_node({**state, "speculation": speculate("정정 기간은?", [0, 1])})
+        assert cache.lookup("수강신청 정정 기간은 언제야?", [0.6, 0.8], scope) is None
+    finally:
+        components.reset()
+
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+    assert list(cache._pending) == [(scope, "수강신청정정기간은언제야")]
+
+
+def test_stats_report_waste_rate():
+    stats = SpeculationStats()
+    for outcome in ("hit", "hit", "miss", "discarded"):
+        stats.record(outcome)
+    assert stats.stats() == {"hit": 2, "miss": 1, "discarded": 1, "waste_rate": 0.5}
+
+
+def test_graph_shape_follows_flag():
+    assert "speculative_retrieve" in build_graph(InMemorySaver(), speculative=True).get_graph().nodes
+    assert "speculative_retrieve" not in build_graph(InMemorySaver(), speculative=False).get_graph().nodes
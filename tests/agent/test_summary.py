@@ -0,0 +1,112 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, START, END
+
+from src.agent.components import components
+from src.agent.state import CustomState
+from src.agent.summary import SummaryScheduler, pending_messages, summarize_thread
+from src.core.metrics import LLM_CALLS
+
+
+def _graph():
+    def generate(state):
+        return {"messages": [AIMessage(content=f"답변입니다 {len(state['messages'])}")]}
+
+    builder = StateGraph(CustomState)
+    builder.add_node("generate", generate)
+    builder.add_edge(START, "generate")
+    builder.add_edge("generate", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+async def _turns(graph, count, thread_id="t-1"):
+    for i in range(count):
+        await graph.ainvoke(
+            {"messages": [{"role": "user", "content": f"질문 {i}"}]},
+            config={"configurable": {"thread_id": thread_id}},
+        )
+
+
+def _summarize(graph, summaries):
+    components.override(model=GenericFakeChatModel(messages=iter(AIMessage(content=s) for s in summaries)))
+    return summarize_thread(graph, "t-1", trigger_tokens=40, keep_messages=2, count_tokens=len)
+
+
+def test_summary_waits_for_budget_then_folds_only_new_messages():
+    graph = _graph()
+    config = {"configurable": {"thread_id": "t-1"}}
+
+    async def run():
+        await _turns(graph, 1)
+        assert not await _summarize(graph, [])   # 예산 이하면 LLM 호출 없음
+
+        await _turns(graph, 3)
+        assert await _summarize(graph, ["첫 요약"])
+        state = (await graph.aget_state(config)).values
+        assert state["summarization"] == "첫 요약"
+        assert len(state["messages"]) == 2
+        assert pending_messages(state["messages"], state["summary_cursor"]) == []
+
+        await _turns(graph, 1)
+        state = (await graph.aget_state(config)).values
+        return pending_messages(state["messages"], state["summary_cursor"])
+
+    new_messages = asyncio.run(run())
+    components.reset()
+    # 남겨 둔 2개 + 새 질문 1개를 보고 만든 답변
+    assert [m.content for m in new_messages] == ["질문 0", "답변입니다 3"]
+
+
+def test_scheduler_runs_in_background_and_wait_blocks_next_turn():
+    graph = _graph()
+    llm_calls = LLM_CALLS.labels("summarize")._value.get()
+    components.override(model=GenericFakeChatModel(messages=iter([AIMessage(content="요약")])))
+    summarized = []
+
+    async def on_summarized(thread_id):
+        summarized.append(thread_id)
+
+    scheduler = SummaryScheduler(
+        graph, on_summarized=on_summarized, trigger_tokens=10, keep_messages=2, count_tokens=len
+    )
+
+    async def run():
+        await _turns(graph, 3)
+        scheduler.schedule("t-1")
+        await scheduler.wait("t-1")
+        return (await graph.aget_state({"configurable": {"thread_id": "t-1"}})).values
+
+    state = asyncio.run(run())
+    assert state["summarization"] == "요약"
+    assert summarized == ["t-1"]
+    # 그래프 밖의 요약 LLM 호출도 summarize 노드로 집계
+    assert LLM_CALLS.labels("summarize")._value.get() == llm_calls + 1
+    assert scheduler._tasks == {}
+    components.reset()
+
+
+def test_evaluation_scenario_summarizes_between_turns(monkeypatch):
+    from functools import partial
+
+    from src.cli import evaluate
+
+    graph = _graph()
+    components.override(model=GenericFakeChatModel(messages=iter([AIMessage(content="요약")] * 3)))
+    monkeypatch.setattr(
+        evaluate, "summarize_thread", partial(summarize_thread, trigger_tokens=20, keep_messages=2, count_tokens=len)
+    )
+    items = [{"id": f"s-{i}", "scenario": "s", "question": f"질문 {i}"} for i in range(4)]
+
+    async def run():
+        rows = await evaluate.run_scenario(graph, items, "t-1")
+        return rows, (await graph.aget_state({"configurable": {"thread_id": "t-1"}})).values
+
+    rows, state = asyncio.run(run())
+    components.reset()
+    assert len(rows) == 4
+    # 운영과 같이 턴 사이에 요약되고 오래된 메시지는 삭제됨 (남긴 2개 + 마지막 턴)
+    assert state["summarization"] == "요약"
+    assert len(state["messages"]) == 4
@@ -0,0 +1,131 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, SystemMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, MessagesState, START, END
+
+from src.api.chat import _start_turn, _turn_events, get_config
+from src.api.coalesce import Coalescer
+from src.api.scheduler import TurnScheduler
+from src.api.schema.chat import ChatRequest
+from src.core.config import settings
+
+
+class State(MessagesState):
+    documents: List[dict]
+
+
+def _build_graph():
+    # 답변이 하나뿐인 모델: 그래프가 두 번 실행되면 StopIteration으로 실패
+    answer_model = GenericFakeChatModel(messages=iter([AIMessage(content="수강신청은 2월 10일부터입니다")]))
+
+    async def retrieve(state):
+        await asyncio.sleep(0.05)
+        return {"documents": [{"content": "본문", "metadata": {"file_name": "공지"}}]}
+
+    async def generate(state):
+        return {"messages": [await answer_model.ainvoke([SystemMessage(content="answer")])]}
+
+    builder = StateGraph(State)
+    builder.add_node("retrieve", retrieve)
+    builder.add_node("generate", generate)
+    builder.add_edge(START, "retrieve")
+    builder.add_edge("retrieve", "generate")
+    builder.add_edge("generate", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+def test_identical_new_thread_questions_share_one_execution():
+    graph = _build_graph()
+    app_state = SimpleNamespace(coalescer=Coalescer())
+    questions = {"t-1": "수강신청 언제야?", "t-2": "수강 신청 언제야", "t-3": "수강신청 언제야?!"}
+
+    async def one(thread_id, question):
+        key = app_state.coalescer.key(question)
+        return [e async for e in _turn_events(graph, question, get_config(thread_id), thread_id, app_state, key)]
+
+    async def run():
+        results = await asyncio.gather(*(one(t, q) for t, q in questions.items()))
+        states = {t: (await graph.aget_state(get_config(t))).values for t in questions}
+        return results, states
+
+    results, states = asyncio.run(run())
+    assert results[0] == results[1] == results[2]
+    assert "".join(v for k, v in results[0] if k == "chunk") == "수강신청은 2월 10일부터입니다"
+    assert app_state.coalescer.in_flight() == 0
+
+    # thread마다 자기 질문으로 checkpoint가 따로 저장됨
+    for thread_id, question in questions.items():
+        messages = states[thread_id]["messages"]
+        assert [m.content for m in messages] == [question, "수강신청은 2월 10일부터입니다"]
+        assert states[thread_id]["documents"][0]["metadata"]["file_name"] == "공지"
+
+
+def test_followers_do_not_hold_model_slots():
+    graph = _build_graph()
+    scheduler = TurnScheduler(max_concurrent=8, model_limits={"gpt": 2})
+    app_state = SimpleNamespace(coalescer=Coalescer(), scheduler=scheduler)
+    question = "수강신청 언제야?"
+    key = app_state.coalescer.key(question)
+
+    async def one(thread_id, ticket):
+        events = [e async for e in _turn_events(graph, question, get_config(thread_id), thread_id, app_state, key, ticket)]
+        await ticket.release()
+        return events
+
+    async def run():
+        leader_ticket = await scheduler.acquire("t-1", "gpt")
+        # 합류 직전에 모델 슬롯을 받은 요청도 합류하면 바로 반납
+        follower_ticket = await scheduler.acquire("t-2", "gpt")
+        turns = [asyncio.create_task(one("t-1", leader_ticket)), asyncio.create_task(one("t-2", follower_ticket))]
+        await asyncio.sleep(0.01)
+
+        # 실행 중인 flight에 합류할 새 대화는 모델 슬롯 없이 실행 권한을 받음
+        with patch.dict(settings["llm"], {"model": "gpt"}):
+            late_ticket, _ = await _start_turn(graph, app_state, ChatRequest(question=question), "t-3")
+        # 다른 질문은 모델 슬롯(2개 중 leader가 1개 사용)을 기다리지 않음
+        other = await asyncio.wait_for(scheduler.acquire("t-4", "gpt"), timeout=0.02)
+        slots = follower_ticket.model, late_ticket.model
+        await other.release()
+        await late_ticket.release()
+        await asyncio.gather(*turns)
+        return slots
+
+    assert asyncio.run(run()) == (None, None)
+    assert scheduler.stats()["active"] == 0
+
+
+def test_subscription_that_never_starts_does_not_keep_flight_alive():
+    cancelled = asyncio.Event()
+
+    async def produce():
+        yield "chunk", "수강신청은"
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def finalize():
+        return {}
+
+    async def run():
+        coalescer = Coalescer()
+        flight, _ = coalescer.join("k", produce, finalize)
+        leader = flight.subscribe()
+        await leader.__anext__()
+
+        # 합류했지만 응답 생성기가 시작되기 전에 클라이언트가 떠난 follower
+        follower_flight, leader_role = coalescer.join("k", produce, finalize)
+        await follower_flight.subscribe().aclose()
+
+        await leader.aclose()
+        return leader_role, cancelled.is_set(), coalescer.in_flight()
+
+    leader_role, flight_cancelled, in_flight = asyncio.run(run())
+    assert leader_role is False
+    assert flight_cancelled and in_flight == 0
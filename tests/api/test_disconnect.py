@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, MessagesState, START, END
+
+from src.api.chat import _generate_streaming_answer, _turn_events, get_config
+from src.api.coalesce import Coalescer
+from src.api.scheduler import TurnScheduler
+from src.api.streaming import HEARTBEAT, EventStreamResponse
+from src.api.threads import ThreadIndex
+from src.core.metrics import ABANDONED_STREAMS
+
+
+class State(MessagesState):
+    documents: List[dict]
+
+
+def _build_graph(cancelled: asyncio.Event):
+    """generate가 끝나지 않는 그래프 (LLM 응답을 기다리는 중에 연결이 끊기는 상황)"""
+
+    async def retrieve(state):
+        return {"documents": [{"content": "본문", "metadata": {"file_name": "공지"}}]}
+
+    async def generate(state):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {}
+
+    builder = StateGraph(State)
+    builder.add_node("retrieve", retrieve)
+    builder.add_node("generate", generate)
+    builder.add_edge(START, "retrieve")
+    builder.add_edge("retrieve", "generate")
+    builder.add_edge("generate", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+async def _serve(response, disconnect_after=None):
+    """ASGI로 응답을 보내고 전송된 body 목록 반환 (disconnect_after초 뒤 클라이언트 연결 끊김)"""
+    bodies = []
+
+    async def receive():
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    await response({"type": "http", "path": "/chat/stream"}, receive, send)
+    return bodies
+
+
+def test_disconnect_cancels_graph_and_records_abandoned_turn():
+    abandoned = ABANDONED_STREAMS.labels("/chat/stream")._value.get()
+
+    async def run():
+        cancelled = asyncio.Event()
+        graph = _build_graph(cancelled)
+        scheduler = TurnScheduler(max_concurrent=1)
+        thread_index = await ThreadIndex().open()
+        ticket = await scheduler.acquire("t-1")
+        response = EventStreamResponse(
+            _generate_streaming_answer(
+                graph, "수강신청 언제야?", get_config("t-1"), "t-1", SimpleNamespace(thread_index=thread_index)
+            ),
+            ticket=ticket,
+            media_type="text/event-stream",
+        )
+        bodies = await _serve(response, disconnect_after=0.1)
+        state = await graph.aget_state(get_config("t-1"))
+        indexed = await thread_index.get("t-1")
+        await thread_index.close()
+        return cancelled.is_set(), response.disconnected, scheduler.stats(), bodies, state.values["messages"], indexed
+
+    cancelled, disconnected, stats, bodies, messages, indexed = asyncio.run(run())
+    assert cancelled and disconnected
+    assert stats["active"] == 0
+    assert ABANDONED_STREAMS.labels("/chat/stream")._value.get() == abandoned + 1
+    assert b'"type": "start"' in bodies[0] and not any(b'"type": "end"' in body for body in bodies)
+
+    # 질문 뒤에 abandoned 표시된 답변이 저장되어 다음 턴의 대화 순서가 유지됨
+    assert [m.type for m in messages] == ["human", "ai"]
+    assert messages[-1].response_metadata.get("abandoned") is True
+    assert indexed.message_count == 2
+
+
+def test_heartbeat_is_sent_while_idle():
+    async def slow_answer():
+        yield "data: start\n\n"
+        await asyncio.sleep(0.25)
+        yield "data: end\n\n"
+
+    bodies = asyncio.run(_serve(EventStreamResponse(slow_answer(), heartbeat_seconds=0.05)))
+    assert bodies[0] == b"data: start\n\n" and bodies[-2:] == [b"data: end\n\n", b""]
+    assert bodies.count(HEARTBEAT) >= 2
+
+
+def test_flight_is_cancelled_only_after_every_subscriber_leaves():
+    async def run():
+        cancelled = asyncio.Event()
+        graph = _build_graph(cancelled)
+        app_state = SimpleNamespace(coalescer=Coalescer())
+        key = app_state.coalescer.key("수강신청 언제야?")
+
+        streams = [
+            _turn_events(graph, "수강신청 언제야?", get_config(t), t, app_state, key) for t in ("t-1", "t-2")
+        ]
+        # retrieve 이후의 sources 이벤트는 generate가 끝나야 나오므로 구독자는 대기 상태
+        waiting = [asyncio.create_task(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0.1)
+
+        waiting[0].cancel()
+        await asyncio.gather(waiting[0], return_exceptions=True)
+        after_first = cancelled.is_set()
+
+        waiting[1].cancel()
+        await asyncio.gather(waiting[1], return_exceptions=True)
+        return after_first, cancelled.is_set(), app_state.coalescer.in_flight()
+
+    after_first, after_all, in_flight = asyncio.run(run())
+    assert not after_first
+    assert after_all and in_flight == 0
@@ -0,0 +1,79 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langgraph.graph import StateGraph, MessagesState, START, END
+from prometheus_client import REGISTRY
+
+from src.api import metrics
+from src.core.logger import request_id_var
+from src.core.metrics import MetricsCallbackHandler, _token_usage
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_callback_records_node_latency_and_llm_calls():
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="라우팅"), AIMessage(content="답변")]))
+
+    async def route(state):
+        await model.ainvoke([SystemMessage(content="route")])
+        return {}
+
+    async def generate(state):
+        return {"messages": [await model.ainvoke([SystemMessage(content="answer")])]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("route_question", route)
+    builder.add_node("generate", generate)
+    builder.add_edge(START, "route_question")
+    builder.add_edge("route_question", "generate")
+    builder.add_edge("generate", END)
+    graph = builder.compile()
+
+    before_nodes = _sample("chatbot_node_duration_seconds_count", {"node": "generate"})
+    before_calls = _sample("chatbot_llm_calls_total", {"node": "route_question"})
+    handler = MetricsCallbackHandler()
+    asyncio.run(graph.ainvoke({"messages": [("user", "질문")]}, config={"callbacks": [handler]}))
+
+    assert handler.llm_calls == 2
+    assert _sample("chatbot_node_duration_seconds_count", {"node": "generate"}) == before_nodes + 1
+    assert _sample("chatbot_llm_calls_total", {"node": "route_question"}) == before_calls + 1
+
+
+def test_token_usage_reads_cached_tokens():
+    message = AIMessage(
+        content="답변",
+        usage_metadata={
+            "input_tokens": 1200,
+            "output_tokens": 80,
+            "total_tokens": 1280,
+            "input_token_details": {"cache_read": 1024},
+        },
+    )
+    usage = _token_usage(LLMResult(generations=[[ChatGeneration(message=message)]]))
+    assert usage == {"prompt": 1200, "completion": 80, "cached": 1024}
+
+
+def test_request_id_header_and_metrics_endpoint():
+    app = FastAPI()
+    app.add_middleware(metrics.RequestIdMiddleware)
+    app.include_router(metrics.router)
+
+    @app.get("/echo")
+    async def echo():
+        return {"request_id": request_id_var.get()}
+
+    client = TestClient(app)
+    response = client.get("/echo", headers={"X-Request-ID": "req-123"})
+    assert response.json() == {"request_id": "req-123"}
+    assert response.headers["x-request-id"] == "req-123"
+    assert len(client.get("/echo").headers["x-request-id"]) == 32
+
+    body = client.get("/metrics").text
+    assert "chatbot_node_duration_seconds" in body
+    assert 'chatbot_speculative_retrieval_total{outcome="hit"}' in body
@@ -0,0 +1,111 @@
+import asyncio
+
+from src.api.replay import ReplayBuffer, ReplayRegistry
+from src.api.scheduler import TurnScheduler
+from src.api.streaming import EventStreamResponse
+from src.core.metrics import ABANDONED_STREAMS
+
+
+def _abandoned():
+    return ABANDONED_STREAMS.labels("/chat/stream")._value.get()
+
+
+def _frames(*contents):
+    return [f"data: {c}\n\n".encode("utf-8") for c in contents]
+
+
+def test_buffer_spills_old_events_and_resumes_after_last_event_id(tmp_path):
+    async def run():
+        spilled = ReplayBuffer("turn", "t-1", max_events=2, spill_path=tmp_path / "turn.sse")
+        dropped = ReplayBuffer("turn", "t-1", max_events=2)
+        for frame in _frames("a", "b", "c", "d", "e"):
+            spilled.append(frame)
+            dropped.append(frame)
+        spilled.close()
+        return spilled, dropped, [frame async for frame in spilled.subscribe(after=0)]
+
+    spilled, dropped, frames = asyncio.run(run())
+    assert frames == [
+        b"id: turn:1\ndata: b\n\n",
+        b"id: turn:2\ndata: c\n\n",
+        b"id: turn:3\ndata: d\n\n",
+        b"id: turn:4\ndata: e\n\n",
+    ]
+    assert spilled.can_resume(0)
+    # spill 파일이 없으면 메모리에서 밀려난 이벤트 이후로는 이어받을 수 없음
+    assert not dropped.can_resume(0) and dropped.can_resume(2)
+
+
+def test_generation_continues_after_disconnect_and_resumes_without_rerun():
+    runs = []
+    abandoned = _abandoned()
+
+    async def answer():
+        runs.append(1)
+        for frame in _frames("start", "수강신청은", "2월 10일부터", "end"):
+            yield frame
+            await asyncio.sleep(0.02)
+
+    async def run():
+        scheduler = TurnScheduler(max_concurrent=1)
+        replay = ReplayRegistry(grace_seconds=1, ttl_seconds=1)
+        buffer = replay.start("t-1", answer(), await scheduler.acquire("t-1"))
+
+        # 첫 이벤트만 받고 연결이 끊김
+        received = []
+
+        async def receive():
+            while not received:
+                await asyncio.sleep(0.005)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message["body"]:
+                received.append(message["body"])
+
+        response = EventStreamResponse(buffer.subscribe(), resumable=True)
+        await response({"type": "http", "path": "/chat/stream"}, receive, send)
+        last_event_id = received[-1].decode("utf-8").split("\n")[0][len("id: "):]
+
+        # Last-Event-ID로 재연결: 다음 이벤트부터 끝까지
+        resumed, after = replay.find(last_event_id)
+        received += [frame async for frame in resumed.subscribe(after)]
+        return received, scheduler.stats()
+
+    received, stats = asyncio.run(run())
+    assert len(runs) == 1
+    # 다시 이어받았으므로 abandoned가 아님
+    assert _abandoned() == abandoned
+    assert [frame.split(b"\n")[1] for frame in received] == [
+        b"data: start", "data: 수강신청은".encode(), "data: 2월 10일부터".encode(), b"data: end",
+    ]
+    assert stats["active"] == 0
+
+
+def test_turn_is_cancelled_when_nobody_reconnects():
+    cancelled = asyncio.Event()
+    abandoned = _abandoned()
+
+    async def answer():
+        yield b"data: start\n\n"
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        replay = ReplayRegistry(grace_seconds=0.05)
+        buffer = replay.start("t-1", answer())
+        stream = buffer.subscribe()
+        await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        before_grace = cancelled.is_set()
+        await asyncio.sleep(0.1)
+        return before_grace, cancelled.is_set(), replay.active()
+
+    before_grace, after_grace, active = asyncio.run(run())
+    assert not before_grace
+    assert after_grace and active == 0
+    assert _abandoned() == abandoned + 1
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.api.scheduler import Overloaded, TurnScheduler
+
+
+def test_same_thread_turns_run_in_arrival_order():
+    scheduler = TurnScheduler(max_concurrent=4)
+    order = []
+
+    async def turn(name, hold):
+        ticket = await scheduler.acquire("thread-1")
+        order.append(f"{name}:start")
+        await asyncio.sleep(hold)
+        order.append(f"{name}:end")
+        await ticket.release()
+
+    async def run():
+        first = asyncio.create_task(turn("a", 0.05))
+        await asyncio.sleep(0)
+        await asyncio.gather(first, turn("b", 0), turn("c", 0))
+
+    asyncio.run(run())
+    assert order == ["a:start", "a:end", "b:start", "b:end", "c:start", "c:end"]
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    scheduler = TurnScheduler(max_concurrent=1, max_queue=1, retry_after_seconds=7)
+
+    async def run():
+        running = await scheduler.acquire("t-1")
+        queued = asyncio.create_task(scheduler.acquire("t-2"))
+        await asyncio.sleep(0.01)
+        assert scheduler.stats() == {"active": 1, "waiting": 1, "threads": 2}
+        with pytest.raises(Overloaded) as rejected:
+            await scheduler.acquire("t-3")
+        await running.release()
+        await (await queued).release()
+        return rejected.value
+
+    assert asyncio.run(run()).retry_after == 7
+
+
+def test_wait_timeout_and_model_limit():
+    scheduler = TurnScheduler(max_concurrent=4, max_wait_seconds=0.05, model_limits={"gpt": 1})
+
+    async def run():
+        running = await scheduler.acquire("t-1", "gpt")
+        # 다른 모델은 영향 없음
+        other = await scheduler.acquire("t-2", "other")
+        with pytest.raises(Overloaded):
+            await scheduler.acquire("t-3", "gpt")
+        await other.release()
+        await running.release()
+        # 한도가 풀리면 바로 실행, 대기하다 취소된 요청이 슬롯을 잡고 있지 않음
+        ticket = await scheduler.acquire("t-3", "gpt")
+        await ticket.release()
+        return scheduler.stats()
+
+    assert asyncio.run(run()) == {"active": 0, "waiting": 0, "threads": 0}
@@ -0,0 +1,100 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, SystemMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, MessagesState, START, END
+
+from src.api.chat import _stream_answer, get_config
+
+
+def _build_graph():
+    router_model = GenericFakeChatModel(messages=iter([AIMessage(content="yes 내부 판단")]))
+    answer_model = GenericFakeChatModel(messages=iter([AIMessage(content="순환버스는 08:30 출발합니다")]))
+    summary_model = GenericFakeChatModel(messages=iter([AIMessage(content="요약 내용")]))
+
+    def route(state):
+        router_model.invoke([SystemMessage(content="follow-up?")])
+        return {}
+
+    def generate(state):
+        return {"messages": [answer_model.invoke([SystemMessage(content="answer")])]}
+
+    def summarize(state):
+        summary_model.invoke([SystemMessage(content="summary")])
+        return {}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("route_question", route)
+    builder.add_node("generate", generate)
+    builder.add_node("summarize", summarize)
+    builder.add_edge(START, "route_question")
+    builder.add_edge("route_question", "generate")
+    builder.add_edge("generate", "summarize")
+    builder.add_edge("summarize", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+def _collect(graph, question):
+    async def run():
+        return [part async for part in _stream_answer(graph, question, get_config("t-1"))]
+
+    return asyncio.run(run())
+
+
+def test_stream_answer_yields_generation_tokens_incrementally():
+    parts = _collect(_build_graph(), "순환버스 시간 알려줘")
+    # 답변이 여러 토큰 청크로 나뉘어 전달되어야 함
+    assert len(parts) > 1
+    assert "".join(parts) == "순환버스는 08:30 출발합니다"
+
+
+def test_stream_answer_filters_internal_llm_calls():
+    joined = "".join(_collect(_build_graph(), "순환버스 시간 알려줘"))
+    assert "내부 판단" not in joined
+    assert "요약" not in joined
+
+
+def test_streaming_answer_emits_sources_after_chunks():
+    import json
+    from typing import List
+
+    from src.api.chat import _generate_streaming_answer
+
+    class State(MessagesState):
+        documents: List[dict]
+
+    answer_model = GenericFakeChatModel(messages=iter([AIMessage(content="수강신청은 2월 10일부터입니다")]))
+
+    def retrieve(state):
+        return {"documents": [
+            {"content": "본문 1", "metadata": {"file_name": "공지1", "department": "소프트웨어학과", "url": "https://a", "date": None}},
+            {"content": "본문 2", "metadata": {"file_name": "공지2", "department": "소프트웨어학과", "url": "https://b", "date": "2025-02-01"}},
+        ]}
+
+    def generate(state):
+        return {"messages": [answer_model.invoke([SystemMessage(content="answer")])]}
+
+    builder = StateGraph(State)
+    builder.add_node("retrieve", retrieve)
+    builder.add_node("generate", generate)
+    builder.add_edge(START, "retrieve")
+    builder.add_edge("retrieve", "generate")
+    builder.add_edge("generate", END)
+    graph = builder.compile(checkpointer=InMemorySaver())
+
+    async def run():
+        return [
+            json.loads(raw.decode("utf-8")[len("data: "):])
+            async for raw in _generate_streaming_answer(graph, "수강신청 언제?", get_config("t-2"), "t-2")
+        ]
+
+    events = asyncio.run(run())
+    types = [e["type"] for e in events]
+    assert types[0] == "start" and types[-1] == "end"
+    assert types.index("source") > max(i for i, t in enumerate(types) if t == "chunk")
+
+    sources = [e for e in events if e["type"] == "source"]
+    assert [s["file_name"] for s in sources] == ["공지1", "공지2"]
+    assert "content" not in sources[0] and "date" not in sources[0]
+    assert "본문" not in "".join(e["content"] for e in events if e["type"] == "chunk")
@@ -0,0 +1,69 @@
+import asyncio
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.api.threads import ThreadIndex
+
+
+def _messages(count):
+    return [HumanMessage(content="질문"), AIMessage(content="답변 " * 60)][:count]
+
+
+async def _filled_index():
+    index = await ThreadIndex().open()
+    for i in range(5):
+        await index.record(f"t-{i}", _messages(1 + i % 2), updated_at=f"2025-10-0{i + 1}T00:00:00+00:00")
+    return index
+
+
+def test_threads_are_paginated_by_cursor_without_duplicates():
+    async def run():
+        index = await _filled_index()
+        pages, cursor = [], None
+        while True:
+            threads, cursor = await index.list(limit=2, cursor=cursor)
+            pages.append([t.thread_id for t in threads])
+            if cursor is None:
+                break
+        await index.close()
+        return pages
+
+    assert asyncio.run(run()) == [["t-4", "t-3"], ["t-2", "t-1"], ["t-0"]]
+
+
+def test_record_updates_existing_thread_and_sorts_by_message_count():
+    async def run():
+        index = await _filled_index()
+        await index.record("t-0", _messages(2), updated_at="2025-10-09T00:00:00+00:00")
+        updated = await index.get("t-0")
+        by_count, _ = await index.list(limit=10, sort="message_count", order="asc")
+        await index.delete("t-1")
+        remaining = await index.count()
+        await index.close()
+        return updated, by_count, remaining
+
+    updated, by_count, remaining = asyncio.run(run())
+    assert updated.created_at.startswith("2025-10-01") and updated.updated_at.startswith("2025-10-09")
+    assert updated.message_count == 2 and updated.last_message.endswith("...")
+    assert [t.message_count for t in by_count] == [1, 1, 2, 2, 2]
+    assert remaining == 4
+
+
+def test_refresh_after_summary_keeps_updated_at():
+    class Graph:
+        # 요약으로 앞의 메시지가 삭제된 state
+        async def aget_state(self, config):
+            return SimpleNamespace(values={"messages": _messages(2)})
+
+    async def run():
+        index = await ThreadIndex().open()
+        await index.record("t-0", _messages(2) * 3, updated_at="2025-10-01T00:00:00+00:00")
+        await index.refresh(Graph(), "t-0")
+        refreshed = await index.get("t-0")
+        await index.close()
+        return refreshed
+
+    refreshed = asyncio.run(run())
+    assert refreshed.message_count == 2
+    assert refreshed.updated_at.startswith("2025-10-01")